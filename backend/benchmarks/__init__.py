@@ -0,0 +1,6 @@
+"""Performance benchmarks for DPV.
+
+Run from the backend/ directory, e.g.:
+
+    python -m benchmarks.bench_parallel_parse
+"""
@@ -0,0 +1,28 @@
+"""Small helpers shared by the benchmark scripts."""
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def write_flat_project(root: Path, modules: int, imports_per_module: int = 10, body_lines: int = 200) -> Path:
+    """Write a simple flat package of `modules` files that import each other."""
+    pkg = root / "pkg"
+    pkg.mkdir(parents=True, exist_ok=True)
+    (pkg / "__init__.py").write_text("")
+    for i in range(modules):
+        lines = [f"from pkg import mod_{(i + k + 1) % modules}" for k in range(imports_per_module)]
+        lines += [f"def func_{j}(x):\n    return [x * {j} for _ in range({j})]" for j in range(body_lines // 2)]
+        (pkg / f"mod_{i}.py").write_text("\n".join(lines) + "\n")
+    return root
+
+
+@contextmanager
+def timed(label: str, results: dict = None):
+    """Print (and optionally record) the wall time of a block."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    if results is not None:
+        results[label] = elapsed
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms")
@@ -0,0 +1,60 @@
+"""Report size and load time: JSON vs. the binary format, full and per-section."""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_report_writer import synthetic_graph
+from dpv.analyzer import analyze_graph
+from dpv.binreport import BinaryReport
+from dpv.output import report_stream, write_binary_report, write_json_stream
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--nodes", type=int, default=50_000)
+    ap.add_argument("--edges", type=int, default=500_000)
+    args = ap.parse_args()
+
+    graph = synthetic_graph(args.nodes, args.edges).freeze()
+    analysis = analyze_graph(graph)
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        json_path = Path(tmp) / "report.json"
+        write_json_stream(json_path, report_stream(graph, analysis, None, 0, 0), compact=True)
+        paths = {"json (compact)": json_path}
+        for compression in ("none", "gzip", "lzma"):
+            paths[f"binary/{compression}"] = Path(tmp) / f"report-{compression}.dpvb"
+            write_binary_report(paths[f"binary/{compression}"], graph, analysis, None, 0, 0, compression)
+
+        rows = []
+        for label, path in paths.items():
+            size = os.path.getsize(path)
+            start = time.perf_counter()
+            if path.suffix == ".json":
+                # JSON has to be parsed whole even for one section
+                with path.open() as f:
+                    json.load(f)
+                full_time = dead_time = time.perf_counter() - start
+            else:
+                with BinaryReport(path) as report:
+                    report.to_dict()
+                full_time = time.perf_counter() - start
+                start = time.perf_counter()
+                with BinaryReport(path) as report:
+                    report.dead_modules()
+                dead_time = time.perf_counter() - start
+            rows.append((label, size, full_time, dead_time))
+
+    print(f"{'format':<16} {'size MiB':>9} {'full load ms':>13} {'dead_modules ms':>16}")
+    for label, size, full_time, dead_time in rows:
+        print(f"{label:<16} {size / 2**20:9.2f} {full_time * 1000:13.1f} {dead_time * 1000:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Memory and traversal speed: DependencyGraph (dict of sets) vs. CSRGraph.
+
+find_cyclic_components() always runs on the CSR form, so the dict-of-sets
+row times the same iterative Tarjan pass written against adj directly,
+and a separate row times freezing a DependencyGraph plus the CSR pass.
+"""
+
+import argparse
+import random
+import tracemalloc
+from typing import List
+
+from benchmarks._util import timed
+from dpv.analyzer import find_cyclic_components, find_dead_modules
+from dpv.graph import DependencyGraph
+
+
+def synthetic_graph(nodes: int, edges: int, seed: int = 0) -> DependencyGraph:
+    rng = random.Random(seed)
+    names = [f"pkg{i % 100}.module_{i}" for i in range(nodes)]
+    g = DependencyGraph()
+    for name in names:
+        g.add_node(name)
+    for _ in range(edges):
+        g.add_edge(names[rng.randrange(nodes)], names[rng.randrange(nodes)])
+    return g
+
+
+def dict_cyclic_components(graph: DependencyGraph) -> List[List[str]]:
+    """Iterative Tarjan over the dict of sets, with the cyclic filter of find_cyclic_components()."""
+    adj = graph.adj
+    index, low, on_stack = {}, {}, set()
+    scc_stack: List[str] = []
+    components: List[List[str]] = []
+    for root in sorted(adj):
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        scc_stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(sorted(adj[root])))]
+        while work:
+            node, it = work[-1]
+            for n in it:
+                if n not in index:
+                    index[n] = low[n] = len(index)
+                    scc_stack.append(n)
+                    on_stack.add(n)
+                    work.append((n, iter(sorted(adj[n]))))
+                    break
+                if n in on_stack and index[n] < low[node]:
+                    low[node] = index[n]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+    return sorted(c for c in components if len(c) > 1 or c[0] in adj[c[0]])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--nodes", type=int, default=100_000)
+    ap.add_argument("--edges", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    tracemalloc.start()
+    graph = synthetic_graph(args.nodes, args.edges)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    frozen = graph.freeze()
+    csr_bytes = tracemalloc.get_traced_memory()[0] - dict_bytes
+    tracemalloc.stop()
+
+    # Names are shared between both forms; count them only once
+    name_bytes = sum(len(n) + 49 for n in frozen.names)
+    print(f"dict-of-sets: {(dict_bytes - name_bytes) / 2**20:8.1f} MiB (excluding names)")
+    print(f"CSR:          {csr_bytes / 2**20:8.1f} MiB (ids dict + arrays)")
+    print(f"edges: {frozen.edge_count()}")
+
+    with timed("freeze()"):
+        graph.freeze()
+
+    for label, g in (("dict-of-sets", graph), ("CSR", frozen)):
+        with timed(f"{label}: full neighbor traversal"):
+            for n in g.nodes():
+                g.neighbors(n)
+        with timed(f"{label}: to_adjacency_dict"):
+            g.to_adjacency_dict()
+        with timed(f"{label}: find_dead_modules"):
+            find_dead_modules(g)
+
+    with timed("dict-of-sets: Tarjan SCC"):
+        expected = dict_cyclic_components(graph)
+    with timed("dict-of-sets: freeze + CSR SCC"):
+        result = find_cyclic_components(graph)
+    with timed("CSR: find_cyclic_components"):
+        find_cyclic_components(frozen)
+    assert result == expected
+
+
+if __name__ == "__main__":
+    main()
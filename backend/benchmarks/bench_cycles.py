@@ -0,0 +1,49 @@
+"""Cycle/SCC detection on large synthetic graphs (no recursion limit involved)."""
+
+import argparse
+import random
+
+from benchmarks._util import timed
+from dpv.analyzer import find_cycles, find_cyclic_components
+from dpv.graph import DependencyGraph
+
+
+def chain_graph(nodes: int) -> DependencyGraph:
+    """One long import chain closed into a single cycle."""
+    g = DependencyGraph()
+    for i in range(nodes - 1):
+        g.add_edge(f"m{i}", f"m{i + 1}")
+    g.add_edge(f"m{nodes - 1}", "m0")
+    return g
+
+
+def random_graph(nodes: int, edges: int, seed: int = 0) -> DependencyGraph:
+    rng = random.Random(seed)
+    g = DependencyGraph()
+    for i in range(nodes):
+        g.add_node(f"m{i}")
+    for _ in range(edges):
+        g.add_edge(f"m{rng.randrange(nodes)}", f"m{rng.randrange(nodes)}")
+    return g
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--nodes", type=int, default=100_000)
+    args = ap.parse_args()
+
+    g = chain_graph(args.nodes)
+    with timed(f"chain of {args.nodes}: find_cyclic_components"):
+        comps = find_cyclic_components(g)
+    with timed(f"chain of {args.nodes}: find_cycles"):
+        cycles = find_cycles(g)
+    assert len(comps) == 1 and len(cycles) == 1
+
+    g = random_graph(args.nodes, args.nodes)
+    with timed(f"random {args.nodes}n/{args.nodes}e: find_cyclic_components"):
+        comps = find_cyclic_components(g)
+    print(f"{'':<40} {len(comps)} cyclic components")
+
+
+if __name__ == "__main__":
+    main()
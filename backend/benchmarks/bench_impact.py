@@ -0,0 +1,73 @@
+"""Impact queries: ImpactIndex bitset closures vs. a BFS per query."""
+
+import argparse
+import random
+import time
+
+from dpv.graph import DependencyGraph
+from dpv.impact import ImpactIndex
+
+
+def layered_graph(nodes: int, fanout: int, window: int, seed: int = 0) -> DependencyGraph:
+    """Modules import mostly nearby lower-numbered modules, like layered packages."""
+    rng = random.Random(seed)
+    names = [f"pkg{i // 500}.module_{i}" for i in range(nodes)]
+    g = DependencyGraph()
+    for i, name in enumerate(names):
+        g.add_node(name)
+        for _ in range(fanout if i else 0):
+            j = rng.randrange(max(0, i - window), i) if rng.random() < 0.9 else rng.randrange(i)
+            g.add_edge(name, names[j])
+    return g
+
+
+def bfs_dependents(radj: dict, start: str) -> set:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for pred in radj.get(stack.pop(), ()):
+            if pred not in seen:
+                seen.add(pred)
+                stack.append(pred)
+    seen.discard(start)
+    return seen
+
+
+def per_query(label: str, fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    per = (time.perf_counter() - start) / len(queries)
+    print(f"{label:<36} {per * 1e6:12.1f} us/query")
+    return per
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--nodes", type=int, default=50_000)
+    ap.add_argument("--fanout", type=int, default=5)
+    ap.add_argument("--window", type=int, default=2_000)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+
+    graph = layered_graph(args.nodes, args.fanout, args.window)
+    rng = random.Random(1)
+    queries = [rng.choice(graph.nodes()) for _ in range(args.queries)]
+    print(f"{args.nodes:,} modules, {sum(graph.out_degree(n) for n in graph.nodes()):,} edges\n")
+
+    start = time.perf_counter()
+    index = ImpactIndex(graph)
+    print(f"{'index build':<36} {time.perf_counter() - start:12.2f} s  ({index.nbytes() / 2**20:.0f} MiB of bitsets)")
+
+    for q in queries[:20]:
+        assert set(index.dependents(q)) == bfs_dependents(graph.radj, q)
+
+    bfs = per_query("BFS dependents (count)", lambda q: len(bfs_dependents(graph.radj, q)), queries)
+    count = per_query("index count_dependents", index.count_dependents, queries)
+    per_query("index depends_on", lambda q: index.depends_on(q, queries[0]), queries)
+    listing = per_query("index dependents (full list)", index.dependents, queries)
+    print(f"\ncount: x{bfs / count:,.0f} faster than BFS, full list: x{bfs / listing:,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Memory of 1M import records: plain dataclass vs. slotted records vs. ImportTable.
+
+The "dict dataclass" row reproduces the previous ImportRecord layout: a
+per-instance __dict__, a fresh names list and a separate module string per
+record, as records arrive from the parser.
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List
+
+from dpv.models import ImportRecord, ImportTable
+
+
+@dataclass
+class _DictRecord:
+    typ: str
+    module: str
+    names: List[str]
+    lineno: int
+    file: str
+
+
+def _rows(files: int, per_file: int, distinct_modules: int, seed: int = 0):
+    """Yield (file, [(typ, module parts, names, lineno), ...]) for a synthetic scan."""
+    rng = random.Random(seed)
+    for f in range(files):
+        file_str = f"/srv/project/pkg{f % 50}/sub{f % 7}/module_{f}.py"
+        rows = []
+        for k in range(per_file):
+            m = rng.randrange(distinct_modules)
+            typ = "from" if k % 3 else "import"
+            names = [f"name_{m % 40}", f"name_{(m + 1) % 40}"] if typ == "from" else [f"pkg{m % 50}"]
+            rows.append((typ, m, names, k + 1))
+        yield file_str, rows
+
+
+def _module(m: int) -> str:
+    # A new string object per record, like strings taken from separate AST nodes
+    return f"pkg{m % 50}.sub{m % 7}.module_{m}"
+
+
+def build_dict(files, per_file, distinct):
+    return {
+        f: [_DictRecord(t, _module(m), list(n), ln, f) for t, m, n, ln in rows]
+        for f, rows in _rows(files, per_file, distinct)
+    }
+
+
+def build_slotted(files, per_file, distinct):
+    return {
+        f: [ImportRecord(t, _module(m), tuple(n), ln, f) for t, m, n, ln in rows]
+        for f, rows in _rows(files, per_file, distinct)
+    }
+
+
+def build_table(files, per_file, distinct):
+    table = ImportTable()
+    views = {
+        f: table.add_file(f, [(t, _module(m), n, ln) for t, m, n, ln in rows])
+        for f, rows in _rows(files, per_file, distinct)
+    }
+    return table, views
+
+
+def measure(label, fn, *args):
+    # Build time is taken without tracemalloc, which slows allocation down
+    gc.collect()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = fn(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<20} {current / 2**20:10.1f} MiB {elapsed:10.2f} s")
+    return current
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--records", type=int, default=1_000_000)
+    ap.add_argument("--per-file", type=int, default=40)
+    ap.add_argument("--distinct-modules", type=int, default=20_000)
+    args = ap.parse_args()
+    files = args.records // args.per_file
+
+    print(f"{files * args.per_file:,} records in {files:,} files\n")
+    print(f"{'storage':<20} {'retained':>14} {'build':>12}")
+    base = measure("dict dataclass", build_dict, files, args.per_file, args.distinct_modules)
+    slotted = measure("slotted records", build_slotted, files, args.per_file, args.distinct_modules)
+    table = measure("ImportTable", build_table, files, args.per_file, args.distinct_modules)
+    print(f"\nslotted: {base / slotted:.1f}x smaller, table: {base / table:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
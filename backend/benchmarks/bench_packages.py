@@ -0,0 +1,90 @@
+"""Package aggregation: time of aggregate_packages(), and a check that file nodes never become packages.
+
+The check scans a synthetic project where every package also has a
+same-named module next to it (pkg.py beside pkg/__init__.py), once as a
+single root and once split into two roots that shadow each other's
+modules. In both, the module map keeps only one file per name; every
+other file must still be named as a module, not split on "." as a path.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synth import SynthSpec, generate_project
+from dpv.analyzer import UNMAPPED_PACKAGE, aggregate_packages
+from dpv.cli import run_scan
+from dpv.graph import build_graph
+from dpv.ingest import ingest_files
+from dpv.resolver import build_module_map
+from dpv.scanner import iter_py_files
+
+
+def add_colliding_modules(root: Path):
+    """Write pkg.py next to every pkg/__init__.py."""
+    for init in list(root.rglob("__init__.py")):
+        init.parent.with_suffix(".py").write_text("import os\n")
+
+
+def scan_packages(folders) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.json"
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_scan(folders, str(report), jobs=1, use_cache=False)
+        return json.loads(report.read_text())["packages"]
+
+
+def path_like_keys(packages: dict) -> list:
+    keys = set(packages)
+    for entry in packages.values():
+        keys.update(entry["children"])
+    return sorted(k for k in keys if os.sep in k or k.startswith(UNMAPPED_PACKAGE))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=5000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = generate_project(Path(tmp) / "one", SynthSpec(modules=args.modules, depth=2))
+        add_colliding_modules(root)
+
+        files = list(iter_py_files(root))
+        module_map = build_module_map(root, files)
+        graph = build_graph({k: m.imports for k, m in ingest_files(files, root, jobs=1).items()}, module_map)
+        graph = graph.freeze()
+        names = {str(path): name for name, path in module_map.items()}
+        start = time.perf_counter()
+        packages = aggregate_packages(graph, names)
+        print(f"{len(graph.nodes()):,} nodes -> {len(packages):,} packages "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"{len(files) - len(module_map):,} files share a module name with another file")
+
+        failed = []
+        bad = path_like_keys(scan_packages(str(root)))
+        if bad:
+            failed.append(f"single root: file paths as packages: {bad[:3]}")
+
+        # Two roots, the second shadowing the first's top-level packages
+        second = Path(tmp) / "two"
+        shutil.copytree(root, second)
+        bad = path_like_keys(scan_packages([str(root), str(second)]))
+        if bad:
+            failed.append(f"shadowed roots: file paths as packages: {bad[:3]}")
+
+    for message in failed:
+        print(f"❌ {message}")
+    if failed:
+        raise SystemExit(1)
+    print("✔ every file node is named as a module")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Scaling benchmark for ingest_files() from 1 to N worker processes."""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks._util import timed, write_flat_project
+from dpv.ingest import ingest_files
+from dpv.scanner import iter_py_files
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=4000)
+    ap.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_flat_project(Path(tmp), args.modules)
+        files = list(iter_py_files(root))
+        print(f"{len(files)} files")
+
+        timings = {}
+        baseline = None
+        jobs = 1
+        while True:
+            with timed(f"jobs={jobs}", timings):
+                modules = ingest_files(files, root, jobs=jobs)
+            result = {k: m.imports for k, m in modules.items()}
+            if baseline is None:
+                baseline = result
+            assert result == baseline, "parallel result differs from serial"
+            print(f"{'':<40} speedup x{timings['jobs=1'] / timings[f'jobs={jobs}']:.2f}")
+            if jobs >= args.max_jobs:
+                break
+            jobs = min(jobs * 2, args.max_jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Cold vs. warm rescan timings for the persistent parse cache."""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks._util import timed, write_flat_project
+from dpv.cache import ingest_files_cached
+from dpv.ingest import ingest_files
+from dpv.scanner import iter_py_files
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=2000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_flat_project(Path(tmp) / "src", args.modules)
+        cache_dir = Path(tmp) / "cache"
+        files = list(iter_py_files(root))
+        print(f"{len(files)} files")
+
+        with timed("no cache (serial)"):
+            expected = {k: m.imports for k, m in ingest_files(files, root, jobs=1).items()}
+        with timed("cold cache"):
+            ingest_files_cached(files, root, cache_dir, jobs=1)
+        with timed("warm cache, no changes"):
+            result = {k: m.imports for k, m in ingest_files_cached(files, root, cache_dir, jobs=1).items()}
+        assert result == expected
+
+        for f in files[:10]:
+            f.touch()
+        with timed("warm cache, 10 files touched"):
+            ingest_files_cached(files, root, cache_dir, jobs=1)
+
+        files[0].write_text(files[0].read_text() + "\nimport os\n")
+        with timed("warm cache, 1 file edited"):
+            ingest_files_cached(files, root, cache_dir, jobs=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Import extraction throughput (ms per MB of source): full ast.walk vs. fast path.
+
+Defaults to the standard library sources of the running interpreter.
+"""
+
+import argparse
+import os
+import time
+import warnings
+from pathlib import Path
+
+from dpv.parser import _extract_records
+from dpv.scanner import iter_py_files
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("folder", nargs="?", default=os.path.dirname(os.__file__))
+    args = ap.parse_args()
+    warnings.simplefilter("ignore")
+
+    sources = []
+    for path in iter_py_files(Path(args.folder)):
+        try:
+            sources.append((str(path), path.read_text(encoding="utf-8")))
+        except (OSError, UnicodeDecodeError):
+            continue
+    mb = sum(len(src) for _, src in sources) / 2**20
+    print(f"{len(sources)} files, {mb:.1f} MB")
+
+    timings = {}
+    results = {}
+    for label, fast in (("full ast.walk", False), ("fast path", True)):
+        start = time.perf_counter()
+        results[label] = [_extract_records(src, name, fast=fast) for name, src in sources]
+        timings[label] = time.perf_counter() - start
+        print(f"{label:<20} {timings[label] * 1000 / mb:8.1f} ms/MB")
+
+    assert results["full ast.walk"] == results["fast path"], "fast path output differs"
+    print(f"speedup x{timings['full ast.walk'] / timings['fast path']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Longest-prefix import resolution: ModuleTrie vs. a scan over every module, at 250k-1M imports.
+
+The naive scan is O(modules) per import, so it is timed on a sample of
+each workload and scaled up to the full import count.
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from dpv.resolver import ModuleResolver
+
+
+def naive_resolve(module_name: str, module_map: Dict[str, Path]) -> Optional[str]:
+    """Check every module for being module_name or a dotted prefix of it; keep the longest."""
+    best = None
+    for name in module_map:
+        if module_name == name or module_name.startswith(name + "."):
+            if best is None or len(name) > len(best):
+                best = name
+    return best
+
+
+def synthetic_modules(count: int, seed: int = 0) -> Dict[str, Path]:
+    rng = random.Random(seed)
+    modules = {}
+    while len(modules) < count:
+        parts = [f"pkg{rng.randrange(50)}"] + [f"sub{rng.randrange(8)}" for _ in range(rng.randrange(4))]
+        parts.append(f"mod{rng.randrange(count // 20 + 1)}")
+        name = ".".join(parts)
+        modules[name] = Path("/src", *parts).with_suffix(".py")
+    return modules
+
+
+def synthetic_imports(modules: Dict[str, Path], count: int, distinct: int, seed: int = 1):
+    """
+    count imports drawn from `distinct` import strings: modules, attributes
+    below them (pkg.mod.Class.attr) and modules that are not in the project.
+    """
+    rng = random.Random(seed)
+    names = list(modules)
+    pool = []
+    for _ in range(distinct):
+        name = rng.choice(names)
+        k = rng.random()
+        if k < 0.4:
+            name += "".join(f".attr{rng.randrange(100)}" for _ in range(rng.randint(1, 3)))
+        elif k < 0.5:
+            name = f"thirdparty{rng.randrange(1000)}.{name}"
+        pool.append(name)
+    # Fresh strings, as the parser would produce them
+    return ["%s" % ".".join(rng.choice(pool).split(".")) for _ in range(count)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=20_000)
+    ap.add_argument("--imports", type=int, nargs="+", default=[250_000, 500_000, 1_000_000])
+    ap.add_argument("--distinct", type=int, default=100_000, help="Distinct import strings in the workload")
+    ap.add_argument("--naive-sample", type=int, default=500, help="Imports the naive scan is timed on")
+    args = ap.parse_args()
+
+    module_map = synthetic_modules(args.modules)
+    print(f"{len(module_map):,} modules\n")
+    print(f"{'imports':>10} {'naive scan (est.)':>18} {'trie prefix':>12} {'resolver (memo)':>16} {'ns/import':>10}")
+    for count in args.imports:
+        imports = synthetic_imports(module_map, count, args.distinct)
+        sample = imports[:args.naive_sample]
+
+        start = time.perf_counter()
+        expected = [naive_resolve(name, module_map) for name in sample]
+        naive = (time.perf_counter() - start) / len(sample) * count
+
+        resolver = ModuleResolver(module_map)
+        start = time.perf_counter()
+        longest = resolver.trie.longest_prefix
+        cold = [longest(name) for name in imports]
+        trie = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = [resolver.resolve(name, "") for name in imports]
+        memo = time.perf_counter() - start
+        assert result == cold
+        assert cold[:len(sample)] == expected
+
+        print(f"{count:>10,} {naive:>17.0f}s {trie:>11.2f}s {memo:>15.2f}s {memo / count * 1e9:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Ingest with simulated per-read latency (as on NFS): serial read-then-parse vs. read-ahead.
+
+Latency is injected by shadowing open() inside dpv.ingest with a version
+that sleeps first; sleeping releases the GIL like a blocked network read.
+"""
+
+import argparse
+import builtins
+import tempfile
+import time
+from pathlib import Path
+
+import dpv.ingest
+from benchmarks._util import write_flat_project
+from dpv.ingest import ingest_files
+from dpv.scanner import iter_py_files
+
+
+def slow_open(latency: float):
+    def _open(*args, **kwargs):
+        time.sleep(latency)
+        return builtins.open(*args, **kwargs)
+    return _open
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=1000)
+    ap.add_argument("--latency-ms", type=float, nargs="+", default=[0.0, 1.0, 5.0])
+    ap.add_argument("--depth", type=int, nargs="+", default=[4, 16, 64], help="Read-ahead queue depths to try")
+    ap.add_argument("--budget-mib", type=int, default=64)
+    ap.add_argument("--jobs", "-j", type=int, default=1)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_flat_project(Path(tmp), args.modules)
+        files = list(iter_py_files(root))
+        print(f"{len(files):,} files, jobs={args.jobs}\n")
+        print(f"{'latency':>10} {'read-ahead':>11} {'files/s':>10} {'speedup':>8}")
+
+        try:
+            for latency in args.latency_ms:
+                dpv.ingest.open = slow_open(latency / 1000)
+                base = None
+                for depth in [0] + args.depth:
+                    start = time.perf_counter()
+                    ingest_files(files, root, jobs=args.jobs, read_ahead=depth, read_budget=args.budget_mib << 20)
+                    rate = len(files) / (time.perf_counter() - start)
+                    base = base or rate
+                    label = "off" if depth == 0 else str(depth)
+                    print(f"{latency:>8.1f}ms {label:>11} {rate:>10,.0f} {rate / base:>7.1f}x")
+        finally:
+            del dpv.ingest.open
+
+
+if __name__ == "__main__":
+    main()
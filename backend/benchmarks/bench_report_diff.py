@@ -0,0 +1,68 @@
+"""Report diff: streaming sorted merge (dpv.diff) vs. loading both reports with json.load."""
+
+import argparse
+import json
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks._util import timed
+from dpv.diff import iter_report_delta
+from dpv.output import JsonArrayStream, JsonObjectStream, write_json_stream
+
+
+def graph_entries(nodes: int, fanout: int, changed: float, seed: int):
+    """Sorted (module, imports) pairs; `changed` of the modules get different imports per seed."""
+    names = sorted(f"pkg{i % 100}.module_{i}" for i in range(nodes))
+    for i, name in enumerate(names):
+        rng = random.Random(i * 1_000_003 + (seed if random.Random(i).random() < changed else 0))
+        yield name, sorted({names[rng.randrange(nodes)] for _ in range(fanout)})
+
+
+def write_report(path: Path, nodes: int, fanout: int, changed: float, seed: int):
+    write_json_stream(path, JsonObjectStream(iter([
+        ("graph", JsonObjectStream(graph_entries(nodes, fanout, changed, seed))),
+        ("cycles", []),
+        ("dead_modules", JsonArrayStream(n for n, _ in graph_entries(nodes, 0, 0, 0) if n.endswith("7"))),
+    ])), compact=True)
+
+
+def load_both(old: Path, new: Path) -> int:
+    a = json.loads(old.read_text(encoding="utf-8"))
+    b = json.loads(new.read_text(encoding="utf-8"))
+    ea = {(u, v) for u, deps in a["graph"].items() for v in deps}
+    eb = {(u, v) for u, deps in b["graph"].items() for v in deps}
+    return len(ea ^ eb)
+
+
+def streamed(old: Path, new: Path) -> int:
+    return sum(1 for r in iter_report_delta(old, new) if r["type"] == "edge")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--nodes", type=int, default=200_000)
+    ap.add_argument("--fanout", type=int, default=8)
+    ap.add_argument("--changed", type=float, default=0.01, help="Fraction of modules whose imports change")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old, new = Path(tmp) / "old.json", Path(tmp) / "new.json"
+        write_report(old, args.nodes, args.fanout, args.changed, seed=0)
+        write_report(new, args.nodes, args.fanout, args.changed, seed=1)
+        print(f"reports: {old.stat().st_size / 2**20:.0f} MiB each, ~{args.nodes * args.fanout:,} edges\n")
+
+        results = {}
+        for label, fn in (("json.load both + set difference", load_both), ("streaming sorted merge", streamed)):
+            with timed(label, results):
+                count = fn(old, new)
+            tracemalloc.start()
+            fn(old, new)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{'':<40} {peak / 2**20:10.1f} MiB peak, {count:,} changed edges")
+
+
+if __name__ == "__main__":
+    main()
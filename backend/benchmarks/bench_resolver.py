@@ -0,0 +1,79 @@
+"""Relative-import resolution benchmark: linear scan vs. ModuleResolver."""
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from benchmarks._util import timed
+from dpv.graph import build_graph
+from dpv.ingest import ingest_files
+from dpv.resolver import ModuleResolver, build_module_map
+from dpv.scanner import iter_py_files
+
+
+def linear_resolve(module_name: str, from_path: Path, module_map: Dict[str, Path]) -> Optional[str]:
+    """The original resolve_import(): scans module_map for every relative import."""
+    if not module_name.startswith('.'):
+        return module_name if module_name in module_map else None
+    dots = len(module_name) - len(module_name.lstrip('.'))
+    from_path = Path(from_path).resolve()
+    current_module = None
+    for mod_name, mod_path in module_map.items():
+        if Path(mod_path).resolve() == from_path:
+            current_module = mod_name
+            break
+    if current_module is None:
+        return None
+    base_name = module_name[dots:]
+    parts = current_module.split('.')
+    if dots > len(parts):
+        return None
+    parent_parts = parts[:-dots]
+    if base_name:
+        resolved = '.'.join(parent_parts + [base_name]) if parent_parts else base_name
+    else:
+        resolved = '.'.join(parent_parts) if parent_parts else None
+    return resolved if resolved and resolved in module_map else None
+
+
+def write_relative_package(root: Path, subpackages: int, modules: int, imports: int):
+    for p in range(subpackages):
+        pkg = root / "app" / f"sub_{p}"
+        pkg.mkdir(parents=True, exist_ok=True)
+        (pkg / "__init__.py").write_text("")
+        for m in range(modules):
+            lines = [f"from .mod_{(m + k + 1) % modules} import x" for k in range(imports)]
+            lines.append(f"from ..sub_{(p + 1) % subpackages} import mod_0")
+            (pkg / f"mod_{m}.py").write_text("\n".join(lines) + "\n")
+    (root / "app" / "__init__.py").write_text("")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--subpackages", type=int, default=10)
+    ap.add_argument("--modules", type=int, default=30)
+    ap.add_argument("--imports", type=int, default=6)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        write_relative_package(root, args.subpackages, args.modules, args.imports)
+        files = list(iter_py_files(root))
+        module_map = build_module_map(root, files)
+        records = {k: m.imports for k, m in ingest_files(files, root, jobs=1).items()}
+        flat = [r for recs in records.values() for r in recs]
+        print(f"{len(module_map)} modules, {len(flat)} relative imports")
+
+        with timed("linear scan per import"):
+            expected = [linear_resolve(r.module, Path(r.file), module_map) for r in flat]
+        with timed("ModuleResolver (index + memo)"):
+            resolver = ModuleResolver(module_map)
+            result = [resolver.resolve(r.module, r.file) for r in flat]
+        assert result == expected
+        with timed("build_graph"):
+            build_graph(records, module_map)
+
+
+if __name__ == "__main__":
+    main()
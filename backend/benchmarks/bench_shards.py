@@ -0,0 +1,87 @@
+"""Multi-root scans: one combined in-process scan vs. per-root shards merged afterwards.
+
+A synthetic project is generated once and each top-level package is moved
+into its own source root, so module names (and the cross-root imports)
+stay the same and the merged graph must equal a single-root scan.
+"""
+
+import argparse
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks._util import timed
+from benchmarks.synth import SynthSpec, generate_project
+from dpv.graph import build_graph
+from dpv.ingest import ingest_files
+from dpv.resolver import build_module_map
+from dpv.scanner import iter_py_files
+from dpv.shards import merge_shards, scan_shards
+
+
+def split_roots(project: Path, mono: Path) -> list:
+    roots = []
+    for pkg in sorted(project.iterdir()):
+        root = mono / f"root_{pkg.name}"
+        root.mkdir(parents=True)
+        shutil.copytree(pkg, root / pkg.name)
+        roots.append(root)
+    return roots
+
+
+def single_scan(root: Path, jobs: int):
+    files = list(iter_py_files(root))
+    modules = ingest_files(files, root, jobs=jobs)
+    return build_graph({k: m.imports for k, m in modules.items()}, build_module_map(root, files)).freeze()
+
+
+def sharded_scan(roots: list, jobs: int):
+    graph, _, _ = merge_shards(scan_shards(roots, [None] * len(roots), jobs=jobs))
+    return graph.freeze()
+
+
+def edges(graph, prefix: Path, skip: int) -> set:
+    # File nodes differ only by the folders they live under; compare relative paths
+    def rel(node):
+        if not node.startswith(str(prefix)):
+            return node
+        return Path(*Path(node).relative_to(prefix).parts[skip:]).as_posix()
+    return {(rel(u), v) for u in graph.nodes() for v in graph.neighbors(u)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=20_000)
+    ap.add_argument("--roots", type=int, default=8, help="Top-level packages, one source root each")
+    ap.add_argument("--jobs", "-j", type=int, default=None)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        project = generate_project(tmp / "single", SynthSpec(modules=args.modules, depth=2,
+                                                             packages_per_level=args.roots))
+        roots = split_roots(project, tmp / "mono")
+        print(f"{args.modules:,} modules in {len(roots)} roots\n")
+
+        results = {}
+        runs = (
+            ("single root, in-process", lambda: single_scan(project, args.jobs), project, 0),
+            ("sharded, merged", lambda: sharded_scan(roots, args.jobs), tmp / "mono", 1),
+        )
+        for label, run, prefix, skip in runs:
+            with timed(label, results):
+                graph = run()
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{'':<40} {peak / 2**20:10.1f} MiB peak in the main process")
+            results[label + " edges"] = edges(graph, prefix, skip)
+
+        same = results["single root, in-process edges"] == results["sharded, merged edges"]
+        print(f"\nmerged graph matches the single-root scan: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Per-stage timings of a scan on synthetic projects of several sizes.
+
+    python -m benchmarks.bench_stages --sizes 1000 5000 --output before.json
+    python -m benchmarks.bench_stages --sizes 1000 5000 --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+
+from benchmarks.synth import SynthSpec, generate_project
+from dpv.analyzer import compute_module_metrics, find_cycles, find_dead_modules
+from dpv.graph import build_graph
+from dpv.output import report_stream, write_json_stream
+from dpv.ingest import ingest_files, line_counts
+from dpv.resolver import build_module_map
+from dpv.scanner import iter_py_files
+
+STAGES = (
+    "walk",
+    "build_module_map",
+    "ingest",
+    "build_graph",
+    "find_cycles",
+    "find_dead_modules",
+    "compute_module_metrics",
+    "json_write",
+)
+
+
+def run_stages(root: Path, out_dir: Path) -> dict:
+    """Run the run_scan pipeline stage by stage and return seconds per stage."""
+    t = {}
+
+    def stage(name, fn):
+        start = time.perf_counter()
+        result = fn()
+        t[name] = time.perf_counter() - start
+        return result
+
+    files = stage("walk", lambda: list(iter_py_files(root)))
+    module_map = stage("build_module_map", lambda: build_module_map(root, files))
+    modules = stage("ingest", lambda: ingest_files(files, root, jobs=1))
+    records = {k: m.imports for k, m in modules.items()}
+    lines = line_counts(modules, module_map)
+    graph = stage("build_graph", lambda: build_graph(records, module_map).freeze())
+    cycles = stage("find_cycles", lambda: find_cycles(graph))
+    dead = stage("find_dead_modules", lambda: find_dead_modules(graph))
+    stage("compute_module_metrics", lambda: compute_module_metrics(graph, line_counts=lines))
+
+    analysis = {"cycles": cycles, "cyclic_components": [], "dead_modules": dead}
+    imports_found = sum(len(v) for v in records.values())
+    with contextlib.redirect_stdout(io.StringIO()):
+        stage("json_write", lambda: write_json_stream(
+            out_dir / "report.json",
+            report_stream(graph, analysis, lines, len(files), imports_found),
+        ))
+    return t
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per size; the fastest is kept")
+    ap.add_argument("--depth", type=int, default=SynthSpec.depth)
+    ap.add_argument("--fanout", type=int, default=SynthSpec.fanout)
+    ap.add_argument("--relative-ratio", type=float, default=SynthSpec.relative_ratio)
+    ap.add_argument("--dynamic-ratio", type=float, default=SynthSpec.dynamic_ratio)
+    ap.add_argument("--cycle-density", type=float, default=SynthSpec.cycle_density)
+    ap.add_argument("--output", help="Write results as JSON to this file")
+    ap.add_argument("--compare", help="Previous results JSON to compare against")
+    args = ap.parse_args()
+
+    base_spec = SynthSpec(
+        depth=args.depth,
+        fanout=args.fanout,
+        relative_ratio=args.relative_ratio,
+        dynamic_ratio=args.dynamic_ratio,
+        cycle_density=args.cycle_density,
+    )
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {str(r["spec"]["modules"]): r["stages"] for r in json.load(f)["runs"]}
+
+    runs = []
+    for size in args.sizes:
+        spec = replace(base_spec, modules=size)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = generate_project(Path(tmp) / "project", spec)
+            best = None
+            for _ in range(args.repeat):
+                timings = run_stages(root, Path(tmp))
+                best = timings if best is None else {k: min(best[k], timings[k]) for k in best}
+        runs.append({"spec": asdict(spec), "stages": best})
+
+        print(f"\n{size} modules")
+        old = baseline.get(str(size), {})
+        for name in STAGES:
+            line = f"  {name:<24} {best[name] * 1000:10.1f} ms"
+            if name in old:
+                line += f"   x{old[name] / best[name]:.2f} vs baseline"
+            print(line)
+
+    if args.output:
+        result = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "runs": runs,
+        }
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""CLI startup: import time of `dpv --help` and `dpv report` under `python -X importtime`, against a budget.
+
+Exits with status 1 if a command's imports (beyond what a bare interpreter
+imports) take longer than the budget, or if it loads a module that only
+scanning needs.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Modules that only a scan needs; `--help` and `report` must not import them
+HEAVY = ["dpv.ingest", "dpv.parser", "dpv.graph", "dpv.analyzer", "dpv.models",
+         "concurrent.futures", "multiprocessing", "dataclasses", "ast"]
+
+
+def import_times(args: List[str]) -> Dict[str, int]:
+    """Run python -X importtime with args; top-level module -> cumulative import time in us."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = times.get(name.strip(), 0) + int(cumulative)
+    return times
+
+
+def all_imported(args: List[str]) -> List[str]:
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True)
+    return [line.split("|")[2].strip() for line in proc.stderr.splitlines()
+            if line.startswith("import time:") and "cumulative" not in line]
+
+
+def wall_time(args: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--budget-ms", type=float, default=60.0,
+                    help="Maximum import time per command beyond a bare interpreter (default: 60)")
+    ap.add_argument("--runs", type=int, default=5, help="Runs per command; the median is checked")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.json"
+        report.write_text('{"graph": {}, "cycles": [], "dead_modules": [], "files_scanned": 0, "imports_found": 0}')
+        commands = {
+            "dpv --help": ["-m", "dpv.cli", "--help"],
+            "dpv report": ["-m", "dpv.cli", "report", str(report), "--section", "dead_modules"],
+        }
+        baseline = set(import_times(["-c", "pass"]))
+
+        print(f"{'command':<14} {'imports':>10} {'wall':>10} {'python -c pass':>15}  slowest imports")
+        failed = []
+        for label, cmd in commands.items():
+            runs = [import_times(cmd) for _ in range(args.runs)]
+            own = [{m: t for m, t in r.items() if m not in baseline} for r in runs]
+            total = statistics.median(sum(r.values()) for r in own) / 1000
+            wall = statistics.median(wall_time(cmd) for _ in range(args.runs)) * 1000
+            bare = statistics.median(wall_time(["-c", "pass"]) for _ in range(args.runs)) * 1000
+            slowest = sorted(own[-1].items(), key=lambda kv: -kv[1])[:4]
+            print(f"{label:<14} {total:>8.1f}ms {wall:>8.1f}ms {bare:>13.1f}ms  "
+                  + ", ".join(f"{m} {t / 1000:.1f}ms" for m, t in slowest))
+
+            heavy = sorted(set(all_imported(cmd)) & set(HEAVY))
+            if heavy:
+                failed.append(f"{label} imports {', '.join(heavy)}")
+            if total > args.budget_ms:
+                failed.append(f"{label} spends {total:.1f} ms importing (budget {args.budget_ms:.0f} ms)")
+
+    for message in failed:
+        print(f"❌ {message}")
+    if failed:
+        sys.exit(1)
+    print(f"\n✔ Within the {args.budget_ms:.0f} ms import budget")
+
+
+if __name__ == "__main__":
+    main()
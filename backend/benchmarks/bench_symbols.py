@@ -0,0 +1,73 @@
+"""Symbol index: memory and lookup time of SymbolIndex vs. a dict of lists of tuples."""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from dpv.symbols import SymbolIndex
+
+
+def synthetic_uses(modules: int, names_per_module: int, uses: int, seed: int = 0):
+    """(importer, module, name, lineno) rows; strings are built per row, as a parser would."""
+    rng = random.Random(seed)
+    for _ in range(uses):
+        f = rng.randrange(modules)
+        m = rng.randrange(modules)
+        yield (f"/src/pkg{f % 100}/module_{f}.py", f"pkg{m % 100}.module_{m}",
+               f"name_{rng.randrange(names_per_module)}", rng.randrange(1, 500))
+
+
+def measure(build):
+    """Build once for the time, and again under tracemalloc (which slows allocation) for the size."""
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=20_000)
+    ap.add_argument("--names", type=int, default=10, help="Distinct names imported per module")
+    ap.add_argument("--uses", type=int, default=2_000_000)
+    ap.add_argument("--queries", type=int, default=100_000)
+    args = ap.parse_args()
+
+    def build_dict():
+        table = {}
+        for importer, module, name, lineno in synthetic_uses(args.modules, args.names, args.uses):
+            table.setdefault((module, name), []).append((importer, lineno))
+        return table
+
+    def build_index():
+        index = SymbolIndex()
+        for importer, module, name, lineno in synthetic_uses(args.modules, args.names, args.uses):
+            index.add(importer, module, (name,), lineno)
+        index.lookup(module, name)  # the first query groups the uses
+        return index
+
+    table, dict_bytes, dict_time = measure(build_dict)
+    keys = list(table)
+    del table
+    index, index_bytes, index_time = measure(build_index)
+    print(f"{args.uses:,} uses of {len(index):,} (module, name) keys\n")
+    print(f"{'dict of lists of tuples':<28} {dict_bytes / 2**20:8.1f} MiB  built in {dict_time:5.1f} s")
+    print(f"{'SymbolIndex':<28} {index_bytes / 2**20:8.1f} MiB  built in {index_time:5.1f} s")
+
+    rng = random.Random(1)
+    queries = [rng.choice(keys) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for module, name in queries:
+        index.lookup(module, name)
+    per = (time.perf_counter() - start) / len(queries)
+    avg = index.use_count() / len(index)
+    print(f"\nlookup: {per * 1e6:.2f} us/query (about {avg:.0f} uses returned per query)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Directory walk benchmark on a tree containing a large ignored directory.
+
+Compares the pruning os.scandir walker against the previous rglob-then-filter
+approach, and the single shared walk against walking once per consumer.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks._util import timed, write_flat_project
+from dpv.resolver import build_module_map
+from dpv.scanner import iter_py_files
+
+
+def rglob_walk(root: Path):
+    """The original iter_py_files(): filter after descending everywhere."""
+    skip_segments = {'venv', '.venv', '.git', '__pycache__'}
+    for py_file in root.rglob("*.py"):
+        if any(part in skip_segments for part in py_file.parts):
+            continue
+        rel_path = py_file.relative_to(root)
+        if rel_path.parts and rel_path.parts[0].startswith('.'):
+            continue
+        yield py_file
+
+
+def write_ignored_tree(root: Path, dirs: int, files_per_dir: int):
+    for d in range(dirs):
+        pkg = root / ".venv" / "lib" / "site-packages" / f"dist_{d}" / "sub"
+        pkg.mkdir(parents=True, exist_ok=True)
+        for f in range(files_per_dir):
+            (pkg / f"m{f}.py").write_text("")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--modules", type=int, default=500)
+    ap.add_argument("--ignored-dirs", type=int, default=2000)
+    ap.add_argument("--ignored-files-per-dir", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        write_flat_project(root, args.modules, body_lines=0)
+        write_ignored_tree(root, args.ignored_dirs, args.ignored_files_per_dir)
+        print(f"ignored files: {args.ignored_dirs * args.ignored_files_per_dir}")
+
+        with timed("rglob + filter"):
+            old = sorted(rglob_walk(root))
+        with timed("scandir with pruning"):
+            new = sorted(iter_py_files(root))
+        assert old == new
+
+        with timed("walk + build_module_map (two walks)"):
+            files = list(iter_py_files(root))
+            build_module_map(root)
+        with timed("walk + build_module_map (shared)"):
+            files = list(iter_py_files(root))
+            build_module_map(root, files)
+
+
+if __name__ == "__main__":
+    main()
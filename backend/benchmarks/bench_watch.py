@@ -0,0 +1,72 @@
+"""
+Single-file update latency of `dpv watch` at several repo sizes.
+
+For an edit that changes an import and one that only changes a function
+body, this times IncrementalScan.apply() alone and the whole refresh
+(apply, analysis, report rewrite). Only apply() is independent of repo
+size: an import change reruns the SCC and package passes over the whole
+graph, the report is rewritten in full after every change, and the poll
+backend stats every file on each poll (also timed here).
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._util import write_flat_project
+from dpv.cli import _watch_analysis, _write_report
+from dpv.watch import IncrementalScan, PollWatcher
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[250, 1000, 4000])
+    ap.add_argument("--edits", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"{'modules':>8} {'edit':<7} {'apply':>10} {'+analysis':>10} {'+report':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = write_flat_project(Path(tmp), size, body_lines=20)
+            report = Path(tmp) / "report.json"
+            scan = IncrementalScan(root, jobs=1)
+            state = _watch_analysis(scan)
+            target = root / "pkg" / "mod_0.py"
+            original = target.read_text()
+
+            edits = {
+                "import": lambda i: original + f"\nimport pkg.mod_{(i * 7) % (size - 1) + 1}\n",
+                "body": lambda i: original + f"\nVALUE = {i}\n",
+            }
+            for kind, content in edits.items():
+                applied = analyzed = written = 0.0
+                for i in range(args.edits):
+                    target.write_text(content(i))
+                    start = time.perf_counter()
+                    scan.apply([target])
+                    t1 = time.perf_counter()
+                    state = _watch_analysis(scan, state)
+                    t2 = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        _write_report(report, state[1], state[2], scan.line_counts,
+                                      scan.files_scanned, scan.imports_found)
+                    t3 = time.perf_counter()
+                    applied += t1 - start
+                    analyzed += t2 - start
+                    written += t3 - start
+                n = args.edits / 1000
+                print(f"{size:>8} {kind:<7} {applied / n:8.2f}ms {analyzed / n:8.2f}ms {written / n:8.2f}ms")
+
+            watcher = PollWatcher(root)
+            start = time.perf_counter()
+            for _ in range(args.edits):
+                watcher._snapshot()
+            print(f"{size:>8} {'poll':<7} {(time.perf_counter() - start) / args.edits * 1000:8.2f}ms "
+                  f"per PollWatcher snapshot")
+
+
+if __name__ == "__main__":
+    main()
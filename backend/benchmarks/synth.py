@@ -0,0 +1,115 @@
+"""Deterministic synthetic project generator for benchmarks.
+
+    python -m benchmarks.synth /tmp/synth --modules 5000 --depth 3
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+
+@dataclass
+class SynthSpec:
+    """Shape of a generated project.
+
+    Attributes:
+        modules: Number of non-package modules
+        depth: Package nesting depth (0 = all modules at the root)
+        packages_per_level: Sub-packages under each package
+        fanout: Imports per module
+        relative_ratio: Fraction of imports written as relative imports
+            (only possible for targets in the same package)
+        dynamic_ratio: Fraction of imports written as importlib.import_module()
+        cycle_density: Fraction of imports pointing "forward", which creates cycles
+        body_lines: Filler lines per module, to give the parser realistic work
+        seed: Random seed; the same spec always yields the same files
+    """
+    modules: int = 1000
+    depth: int = 2
+    packages_per_level: int = 4
+    fanout: int = 5
+    relative_ratio: float = 0.2
+    dynamic_ratio: float = 0.02
+    cycle_density: float = 0.01
+    body_lines: int = 40
+    seed: int = 0
+
+
+def _package_paths(spec: SynthSpec) -> List[tuple]:
+    """All package name tuples at the deepest level (root is ())."""
+    paths = [()]
+    for level in range(spec.depth):
+        paths = [p + (f"pkg{level}_{i}",) for p in paths for i in range(spec.packages_per_level)]
+    return paths
+
+
+def generate_project(root: str | Path, spec: SynthSpec) -> Path:
+    """Write the project described by spec under root and return root."""
+    rng = random.Random(spec.seed)
+    root = Path(root)
+    packages = _package_paths(spec)
+
+    # Package __init__ files, including intermediate levels
+    for pkg in packages:
+        for i in range(1, len(pkg) + 1):
+            init = root.joinpath(*pkg[:i], "__init__.py")
+            if not init.exists():
+                init.parent.mkdir(parents=True, exist_ok=True)
+                init.write_text("")
+    root.mkdir(parents=True, exist_ok=True)
+
+    # Module i lives in package i % len(packages); imports mostly point to
+    # lower indices (a DAG) unless cycle_density sends them forward.
+    homes = [packages[i % len(packages)] for i in range(spec.modules)]
+    by_package = {}
+    for i, pkg in enumerate(homes):
+        by_package.setdefault(pkg, []).append(i)
+
+    for i, pkg in enumerate(homes):
+        lines = []
+        for _ in range(spec.fanout if i else 0):
+            if rng.random() < spec.cycle_density:
+                target = rng.randrange(spec.modules)
+            else:
+                target = rng.randrange(i)
+            r = rng.random()
+            if r < spec.relative_ratio:
+                siblings = [j for j in by_package[pkg] if j != i]
+                if siblings:
+                    lines.append(f"from .mod_{rng.choice(siblings)} import VALUE")
+                    continue
+            dotted = ".".join(homes[target] + (f"mod_{target}",))
+            if r > 1 - spec.dynamic_ratio:
+                lines.append(f"importlib.import_module({dotted!r})")
+            elif rng.random() < 0.5:
+                lines.append(f"import {dotted}")
+            else:
+                parent = ".".join(homes[target])
+                lines.append(f"from {parent} import mod_{target}" if parent else f"import mod_{target}")
+
+        if any(line.startswith("importlib") for line in lines):
+            lines.insert(0, "import importlib")
+        lines.append(f"VALUE = {i}")
+        for j in range(spec.body_lines // 4):
+            lines.append(f"\n\ndef func_{j}(x, y={j}):\n    return [x * y + k for k in range({j})]")
+
+        root.joinpath(*pkg, f"mod_{i}.py").write_text("\n".join(lines) + "\n")
+
+    return root
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate a synthetic Python project")
+    ap.add_argument("root")
+    for name, value in vars(SynthSpec()).items():
+        ap.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = ap.parse_args()
+    spec = SynthSpec(**{k: getattr(args, k) for k in vars(SynthSpec())})
+    generate_project(args.root, spec)
+    print(f"Generated {spec.modules} modules under {args.root}")
+
+
+if __name__ == "__main__":
+    main()
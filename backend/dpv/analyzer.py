@@ -2,104 +2,292 @@
 Graph analysis utilities for dependency graphs.
 """
 
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from dpv.graph import DependencyGraph
+from dpv.graph import AnyGraph, CSRGraph
 
+# Top-level package that aggregate_packages() puts file nodes without a module name under
+UNMAPPED_PACKAGE = "(unmapped)"
 
-def find_cycles(graph: DependencyGraph) -> List[List[str]]:
-    """Detect cycles in dependency graph using DFS."""
-    cycles = []
-    visited = set()
-    rec_stack = set()
-    path = []
 
-    def dfs(node: str):
-        if node in rec_stack:
-            idx = path.index(node)
-            cycle = path[idx:] + [node]
+def _scan_components(graph: AnyGraph, collect_cycles: bool = True) -> Tuple[List[List[str]], List[List[str]]]:
+    """Iterative Tarjan SCC pass over the graph.
 
-            cycle_nodes = cycle[:-1]
-            if cycle_nodes:
-                min_idx = min(range(len(cycle_nodes)), key=lambda i: cycle_nodes[i])
-                normalized = cycle_nodes[min_idx:] + cycle_nodes[:min_idx] + [cycle_nodes[min_idx]]
-                cycles.append(normalized)
-            return
+    Runs on the CSR form (a DependencyGraph is frozen first), so nodes and
+    their pre-sorted neighbors are plain integer IDs and array slices. Each
+    node and edge is visited once and the traversal never recurses. With
+    collect_cycles, back edges onto the current DFS path are recorded along
+    the way; they are the cycles the original recursive DFS reported.
 
-        if node in visited:
-            return
+    Returns:
+        (strongly connected components, raw back-edge cycles)
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    names, offsets, targets = csr.names, csr.offsets, csr.targets
+    count = len(names)
 
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
+    index = [-1] * count
+    low = [0] * count
+    on_stack = bytearray(count)
+    path_pos = [-1] * count
+    scc_stack: List[int] = []
+    path: List[int] = []
+    components: List[List[str]] = []
+    back_edge_cycles: List[List[str]] = []
+    next_index = 0
 
-        for n in graph.neighbors(node):
-            dfs(n)
+    for root in range(count):
+        if index[root] != -1:
+            continue
 
-        path.pop()
-        rec_stack.remove(node)
+        index[root] = low[root] = next_index
+        next_index += 1
+        scc_stack.append(root)
+        on_stack[root] = 1
+        path_pos[root] = 0
+        path.append(root)
+        # Work stack entries: [node, position of next edge to visit]
+        work = [[root, offsets[root]]]
 
-    for n in graph.nodes():
-        if n not in visited:
-            dfs(n)
+        while work:
+            frame = work[-1]
+            node, pos = frame
+            end = offsets[node + 1]
+            descended = False
+            while pos < end:
+                n = targets[pos]
+                pos += 1
+                if collect_cycles and path_pos[n] != -1:
+                    back_edge_cycles.append([names[i] for i in path[path_pos[n]:]])
+                if index[n] == -1:
+                    frame[1] = pos
+                    index[n] = low[n] = next_index
+                    next_index += 1
+                    scc_stack.append(n)
+                    on_stack[n] = 1
+                    path_pos[n] = len(path)
+                    path.append(n)
+                    work.append([n, offsets[n]])
+                    descended = True
+                    break
+                if on_stack[n] and index[n] < low[node]:
+                    low[node] = index[n]
+            if descended:
+                continue
+
+            work.pop()
+            path.pop()
+            path_pos[node] = -1
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = scc_stack.pop()
+                    on_stack[member] = 0
+                    component.append(names[member])
+                    if member == node:
+                        break
+                components.append(sorted(component))
+
+    return components, back_edge_cycles
+
+
+def find_strongly_connected_components(graph: AnyGraph) -> List[List[str]]:
+    """Return every strongly connected component as a sorted member list."""
+    components, _ = _scan_components(graph, collect_cycles=False)
+    return sorted(components)
+
+
+def find_cyclic_components(graph: AnyGraph) -> List[List[str]]:
+    """Return SCCs that contain a cycle (2+ members, or a self-import)."""
+    return _cyclic(graph, find_strongly_connected_components(graph))
 
-    # Deduplicate normalized cycles
+
+def _cyclic(graph: AnyGraph, components: List[List[str]]) -> List[List[str]]:
+    return [c for c in components if len(c) > 1 or graph.has_edge(c[0], c[0])]
+
+
+def find_cycles(graph: AnyGraph) -> List[List[str]]:
+    """Detect cycles in dependency graph.
+
+    Cycles are the back edges found while computing SCCs, rotated to
+    start at their smallest member and closed with that member again.
+    """
+    _, back_edge_cycles = _scan_components(graph)
+    return _normalize_cycles(back_edge_cycles)
+
+
+def _normalize_cycles(back_edge_cycles: List[List[str]]) -> List[List[str]]:
+    # Normalize and deduplicate cycles
     seen = set()
     uniq = []
-    for cy in cycles:
-        tup = tuple(cy[:-1])
+    for cycle_nodes in back_edge_cycles:
+        min_idx = min(range(len(cycle_nodes)), key=lambda i: cycle_nodes[i])
+        normalized = cycle_nodes[min_idx:] + cycle_nodes[:min_idx]
+        tup = tuple(normalized)
         if tup not in seen:
-            uniq.append(cy)
+            uniq.append(normalized + [normalized[0]])
             seen.add(tup)
 
     return uniq
 
 
-def find_dead_modules(graph: DependencyGraph, entrypoints: Optional[List[str]] = None) -> List[str]:
+def find_dead_modules(graph: AnyGraph, entrypoints: Optional[List[str]] = None) -> List[str]:
     """Modules with no incoming edges."""
     if entrypoints is None:
         entrypoints = []
 
     entry = set(entrypoints)
 
-    indegree = {n: 0 for n in graph.nodes()}
+    return [n for n in graph.nodes() if graph.in_degree(n) == 0 and n not in entry]
 
-    for n in graph.nodes():
-        for neigh in graph.neighbors(n):
-            indegree[neigh] = indegree.get(neigh, 0) + 1
 
-    dead = [n for n, deg in indegree.items() if deg == 0 and n not in entry]
+def compute_module_metrics(
+    graph: AnyGraph,
+    path_map: Optional[Dict[str, Path]] = None,
+    *,
+    line_counts: Optional[Dict[str, int]] = None,
+) -> Dict[str, Dict]:
+    """Compute in/out degree & file line counts.
+
+    Line counts are taken from line_counts (module -> lines, as the
+    ingest stage records them). path_map (module -> file) is still
+    accepted for older callers; those files are opened and counted.
+    """
+    if path_map and line_counts is None:
+        line_counts = _count_lines(path_map)
+    return dict(iter_module_metrics(graph, line_counts))
 
-    return sorted(dead)
 
+def _count_lines(path_map: Dict[str, Path]) -> Dict[str, int]:
+    counts = {}
+    for n, p in path_map.items():
+        if isinstance(p, Path) and p.exists():
+            try:
+                with p.open("r", encoding="utf-8") as f:
+                    counts[n] = sum(1 for _ in f)
+            except Exception:
+                pass
+    return counts
 
-def compute_module_metrics(
-    graph: DependencyGraph,
-    path_map: Optional[Dict[str, Path]] = None
-) -> Dict[str, Dict]:
-    """Compute in/out degree & file line counts."""
-    metrics = {}
 
-    indegree = {n: 0 for n in graph.nodes()}
-    for n in graph.nodes():
-        for neigh in graph.neighbors(n):
-            indegree[neigh] = indegree.get(neigh, 0) + 1
+def iter_module_metrics(
+    graph: AnyGraph,
+    line_counts: Optional[Dict[str, int]] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (module, metrics) pairs one module at a time.
 
+    Line counts come from the ingest stage (ModuleInfo.lines, keyed by
+    module name); files are never reopened here.
+    """
+    line_counts = line_counts or {}
     for n in graph.nodes():
         m = {
-            "in_degree": indegree.get(n, 0),
-            "out_degree": len(graph.neighbors(n)),
+            "in_degree": graph.in_degree(n),
+            "out_degree": graph.out_degree(n),
         }
+        if n in line_counts:
+            m["lines"] = line_counts[n]
+        yield n, m
+
+
+def aggregate_packages(
+    graph: AnyGraph,
+    module_names: Optional[Dict[str, str]] = None,
+    max_depth: Optional[int] = None,
+) -> Dict[str, Dict]:
+    """
+    Collapse modules into packages at every depth for drill-down viewing.
+
+    Each node is named by its dotted module name (module_names maps file
+    path nodes to it). At depth d a module is shown as its first d name
+    parts, and edges between different depth-d groups are weighted by how
+    many module-level edges they stand for. A file path node missing from
+    module_names is never split on "."; it becomes a leaf under
+    UNMAPPED_PACKAGE.
+
+    Returns one entry per expandable package; "" is the top level:
+        {pkg: {"depth": d, "modules": n,
+               "children": {child: modules under it},
+               "edges": [[a, b, weight], ...]}}
+    where edges are the depth d+1 edges touching pkg's children, i.e.
+    what a viewer needs to draw when it expands pkg. An edge endpoint
+    outside pkg is given at depth d+1 and maps to whichever of its
+    prefixes is currently shown.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    module_names = module_names or {}
+    parts = [_package_parts(n, module_names) for n in csr.names]
+    if max_depth is None:
+        max_depth = max((len(p) for p in parts), default=0)
+
+    # Modules under every prefix, counting the prefix's own module too
+    counts: Dict[str, int] = {}
+    for p in set(parts):
+        for d in range(len(p) + 1):
+            prefix = ".".join(p[:d])
+            counts[prefix] = counts.get(prefix, 0) + 1
+
+    packages: Dict[str, Dict] = {}
+    for p in set(parts):
+        for d in range(min(len(p), max_depth)):
+            parent = ".".join(p[:d])
+            entry = packages.setdefault(parent, {"depth": d, "modules": counts[parent], "children": {}, "edges": {}})
+            child = ".".join(p[:d + 1])
+            entry["children"][child] = counts[child]
+
+    offsets, targets = csr.offsets, csr.targets
+    for u in range(len(parts)):
+        pu = parts[u]
+        for k in range(offsets[u], offsets[u + 1]):
+            pv = parts[targets[k]]
+            if pu == pv:
+                continue
+            for d in range(1, min(max(len(pu), len(pv)), max_depth) + 1):
+                a, b = pu[:d], pv[:d]
+                if a == b:
+                    continue
+                # The edge is new at depth d for each endpoint that first
+                # appears there; it belongs to that endpoint's parent.
+                edge = (".".join(a), ".".join(b))
+                owners = {".".join(x[:d - 1]) for x in (a, b) if len(x) == d}
+                for owner in owners:
+                    edges = packages[owner]["edges"]
+                    edges[edge] = edges.get(edge, 0) + 1
+
+    for entry in packages.values():
+        entry["children"] = dict(sorted(entry["children"].items()))
+        entry["edges"] = [[a, b, w] for (a, b), w in sorted(entry["edges"].items())]
+    return dict(sorted(packages.items()))
+
+
+def _package_parts(node: str, module_names: Dict[str, str]) -> Tuple[str, ...]:
+    name = module_names.get(node)
+    if name is not None:
+        return tuple(name.split("."))
+    if os.sep in node or "/" in node:
+        return (UNMAPPED_PACKAGE, node)
+    return tuple(node.split("."))
 
-        if path_map and n in path_map:
-            p = path_map[n]
-            if isinstance(p, Path) and p.exists():
-                try:
-                    m["lines"] = sum(1 for _ in p.open("r", encoding="utf-8"))
-                except Exception:
-                    pass
 
-        metrics[n] = m
+def analyze_graph(graph: AnyGraph) -> Dict[str, List]:
+    """Run the cycle and dead-module analyses and return their results.
 
-    return metrics
\ No newline at end of file
+    Per-module metrics are left to iter_module_metrics() so report writers
+    can stream them.
+    """
+    # One SCC pass yields both the components and the back-edge cycles
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    components, back_edge_cycles = _scan_components(csr)
+    return {
+        "cycles": _normalize_cycles(back_edge_cycles),
+        "cyclic_components": _cyclic(csr, sorted(components)),
+        "dead_modules": find_dead_modules(graph),
+    }
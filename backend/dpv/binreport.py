@@ -0,0 +1,325 @@
+"""
+Compact binary report format (.dpvb) with a lazy, memory-mapped reader.
+
+Layout (all integers little-endian):
+
+    header   magic b"DPVB", u16 version, u16 compression, u32 section count
+    table    per section: 16-byte name, u64 offset, u64 stored size, u64 raw size
+    sections each compressed on its own, so a reader only inflates what it uses
+
+Sections:
+
+    strings     u32 count, u32 offsets[count + 1], utf-8 blob (module names, sorted)
+    graph       i32 offsets[count + 1], i32 targets[edges]   (CSR over string IDs)
+    cycles      u32 n, i32 offsets[n + 1], i32 members[...]  (lists of string IDs)
+    components  same layout as cycles
+    dead        i32 ids[...]
+    metrics     i32 in_degree[count], i32 out_degree[count], i32 lines[count] (-1 = unknown)
+    summary     UTF-8 JSON object (files_scanned, imports_found)
+    packages    UTF-8 JSON object, optional (analyzer.aggregate_packages output)
+    symbols     optional (symbols.SymbolIndex): u32 n, u32 offsets[n + 1], utf-8 blob
+                (imported names, sorted), then u32 keys, i32 module[keys] (string
+                IDs), i32 name[keys], i32 offsets[keys + 1], i32 importer[uses]
+                (string IDs), i32 lineno[uses]; keys sorted by module, then name
+"""
+
+from __future__ import annotations
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from dpv.graph import AnyGraph, CSRGraph
+
+MAGIC = b"DPVB"
+VERSION = 1
+COMPRESSION = {"none": 0, "gzip": 1, "lzma": 2}
+_HEADER = struct.Struct("<4sHHI")
+_ENTRY = struct.Struct("<16sQQQ")
+
+
+# Codecs, the graph code and the analyzer are imported on first use, so
+# reading one section (e.g. from `dpv report`) stays cheap to start.
+
+def _compress(data: bytes, method: int) -> bytes:
+    if method == 1:
+        import gzip
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if method == 2:
+        import lzma
+        return lzma.compress(data)
+    return data
+
+
+def _decompress(data, method: int) -> bytes:
+    if method == 1:
+        import gzip
+        return gzip.decompress(data)
+    if method == 2:
+        import lzma
+        return lzma.decompress(data)
+    return bytes(data)
+
+
+def _int_array(values: Iterable[int]) -> bytes:
+    arr = array("i", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _read_ints(data, start: int, count: int) -> array:
+    arr = array("i")
+    arr.frombytes(data[start:start + 4 * count])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _id_lists(lists: List[List[str]], ids: Dict[str, int]) -> bytes:
+    offsets = [0]
+    members: List[int] = []
+    for lst in lists:
+        members.extend(ids[n] for n in lst)
+        offsets.append(len(members))
+    return struct.pack("<I", len(lists)) + _int_array(offsets) + _int_array(members)
+
+
+def _encode_strings(strings: List[str]) -> bytes:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    return struct.pack("<I", len(strings)) + _int_array(offsets) + b"".join(encoded)
+
+
+def _decode_strings(data, start: int = 0) -> Tuple[List[str], int]:
+    """Strings written by _encode_strings() at start, and the offset just past them."""
+    count = struct.unpack_from("<I", data, start)[0]
+    offsets = _read_ints(data, start + 4, count + 1)
+    blob_start = start + 4 + 4 * (count + 1)
+    blob = bytes(data[blob_start:blob_start + offsets[-1]])
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)], blob_start + offsets[-1]
+
+
+def _symbols_section(symbols, ids: Dict[str, int]) -> bytes:
+    entries = list(symbols.iter_entries())
+    names = sorted({symbol for _, symbol, _ in entries})
+    name_ids = {name: i for i, name in enumerate(names)}
+    offsets = [0]
+    for _, _, uses in entries:
+        offsets.append(offsets[-1] + len(uses))
+    return b"".join([
+        _encode_strings(names),
+        struct.pack("<I", len(entries)),
+        _int_array(ids[module] for module, _, _ in entries),
+        _int_array(name_ids[symbol] for _, symbol, _ in entries),
+        _int_array(offsets),
+        _int_array(ids[f] for _, _, uses in entries for f, _ in uses),
+        _int_array(line for _, _, uses in entries for _, line in uses),
+    ])
+
+
+def encode_report(
+    graph: AnyGraph,
+    analysis: Dict[str, List],
+    line_counts: Optional[Dict[str, int]],
+    files_scanned: int,
+    imports_found: int,
+    compression: str = "gzip",
+) -> bytes:
+    """Serialize a scan report to the binary format."""
+    from dpv.analyzer import iter_module_metrics
+    from dpv.graph import CSRGraph
+
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    method = COMPRESSION[compression]
+    ids = csr.ids
+
+    in_deg, out_deg, lines = [], [], []
+    for _, m in iter_module_metrics(csr, line_counts):
+        in_deg.append(m["in_degree"])
+        out_deg.append(m["out_degree"])
+        lines.append(m.get("lines", -1))
+
+    sections = [
+        ("strings", _encode_strings(csr.names)),
+        ("graph", _int_array(csr.offsets) + _int_array(csr.targets)),
+        ("cycles", _id_lists(analysis["cycles"], ids)),
+        ("components", _id_lists(analysis["cyclic_components"], ids)),
+        ("dead", _int_array(ids[n] for n in analysis["dead_modules"])),
+        ("metrics", _int_array(in_deg) + _int_array(out_deg) + _int_array(lines)),
+        ("summary", json.dumps({"files_scanned": files_scanned, "imports_found": imports_found}).encode("utf-8")),
+    ]
+    if "packages" in analysis:
+        sections.append(("packages", json.dumps(analysis["packages"], separators=(",", ":")).encode("utf-8")))
+    if "symbols" in analysis:
+        sections.append(("symbols", _symbols_section(analysis["symbols"], ids)))
+
+    stored = [(name, _compress(raw, method), len(raw)) for name, raw in sections]
+    offset = _HEADER.size + _ENTRY.size * len(stored)
+    out = [_HEADER.pack(MAGIC, VERSION, method, len(stored))]
+    for name, data, raw_size in stored:
+        out.append(_ENTRY.pack(name.encode("ascii"), offset, len(data), raw_size))
+        offset += len(data)
+    out.extend(data for _, data, _ in stored)
+    return b"".join(out)
+
+
+def is_binary_report(path: str | Path) -> bool:
+    """True if the file starts with the binary report magic."""
+    try:
+        with Path(path).open("rb") as f:
+            return f.read(4) == MAGIC
+    except OSError:
+        return False
+
+
+class BinaryReport:
+    """Memory-mapped binary report; each section is decoded on first access."""
+
+    SECTIONS = ("graph", "cycles", "cyclic_components", "dead_modules", "metrics", "files_scanned", "imports_found")
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.compression, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a DPV binary report")
+        if version != VERSION:
+            raise ValueError(f"unsupported DPV binary report version {version}")
+        self._table: Dict[str, Tuple[int, int]] = {}
+        for i in range(count):
+            name, offset, size, _ = _ENTRY.unpack_from(self._mm, _HEADER.size + i * _ENTRY.size)
+            self._table[name.rstrip(b"\0").decode("ascii")] = (offset, size)
+        self._cache: Dict[str, Any] = {}
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self) -> "BinaryReport":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _raw(self, name: str):
+        offset, size = self._table[name]
+        view = memoryview(self._mm)[offset:offset + size]
+        return view if self.compression == 0 else _decompress(view, self.compression)
+
+    def _cached(self, key: str, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    # --- sections ---
+
+    def names(self) -> List[str]:
+        return self._cached("names", lambda: _decode_strings(self._raw("strings"))[0])
+
+    def graph(self) -> CSRGraph:
+        from dpv.graph import CSRGraph
+
+        def build():
+            names = self.names()
+            data = self._raw("graph")
+            offsets = _read_ints(data, 0, len(names) + 1)
+            targets = _read_ints(data, 4 * (len(names) + 1), offsets[-1])
+            return CSRGraph(names, offsets, targets)
+        return self._cached("graph", build)
+
+    def _id_lists(self, section: str) -> List[List[str]]:
+        names = self.names()
+        data = self._raw(section)
+        count = struct.unpack_from("<I", data, 0)[0]
+        offsets = _read_ints(data, 4, count + 1)
+        members = _read_ints(data, 4 + 4 * (count + 1), offsets[-1])
+        return [[names[m] for m in members[offsets[i]:offsets[i + 1]]] for i in range(count)]
+
+    def cycles(self) -> List[List[str]]:
+        return self._cached("cycles", lambda: self._id_lists("cycles"))
+
+    def cyclic_components(self) -> List[List[str]]:
+        return self._cached("cyclic_components", lambda: self._id_lists("components"))
+
+    def dead_modules(self) -> List[str]:
+        def build():
+            names = self.names()
+            data = self._raw("dead")
+            return [names[i] for i in _read_ints(data, 0, len(data) // 4)]
+        return self._cached("dead_modules", build)
+
+    def metrics(self) -> Dict[str, Dict]:
+        def build():
+            names = self.names()
+            count = len(names)
+            data = self._raw("metrics")
+            in_deg = _read_ints(data, 0, count)
+            out_deg = _read_ints(data, 4 * count, count)
+            lines = _read_ints(data, 8 * count, count)
+            out = {}
+            for i, name in enumerate(names):
+                m = {"in_degree": in_deg[i], "out_degree": out_deg[i]}
+                if lines[i] >= 0:
+                    m["lines"] = lines[i]
+                out[name] = m
+            return out
+        return self._cached("metrics", build)
+
+    def summary(self) -> Dict[str, int]:
+        return self._cached("summary", lambda: json.loads(bytes(self._raw("summary"))))
+
+    def packages(self) -> Dict[str, Dict]:
+        def build():
+            return json.loads(bytes(self._raw("packages"))) if "packages" in self._table else {}
+        return self._cached("packages", build)
+
+    def symbols(self) -> Dict[str, Dict[str, List[List]]]:
+        """{module: {name: [[file, lineno], ...]}}, or {} if the scan had no symbol index."""
+        def build():
+            if "symbols" not in self._table:
+                return {}
+            names = self.names()
+            data = self._raw("symbols")
+            symbol_names, pos = _decode_strings(data)
+            keys = struct.unpack_from("<I", data, pos)[0]
+            pos += 4
+            modules = _read_ints(data, pos, keys)
+            symbols = _read_ints(data, pos + 4 * keys, keys)
+            offsets = _read_ints(data, pos + 8 * keys, keys + 1)
+            pos += 4 * (3 * keys + 1)
+            importers = _read_ints(data, pos, offsets[-1])
+            lines = _read_ints(data, pos + 4 * offsets[-1], offsets[-1])
+            out: Dict[str, Dict[str, List[List]]] = {}
+            for k in range(keys):
+                uses = [[names[importers[j]], lines[j]] for j in range(offsets[k], offsets[k + 1])]
+                out.setdefault(names[modules[k]], {})[symbol_names[symbols[k]]] = uses
+            return out
+        return self._cached("symbols", build)
+
+    def has_section(self, name: str) -> bool:
+        """True if the report stores section name (packages and symbols are optional)."""
+        return name in self._table
+
+    def section(self, name: str) -> Any:
+        """Decode one report section by its JSON key."""
+        if name == "graph":
+            return self.graph().to_adjacency_dict()
+        if name in ("files_scanned", "imports_found"):
+            return self.summary()[name]
+        if name in ("cycles", "cyclic_components", "dead_modules", "metrics", "packages", "symbols"):
+            return getattr(self, name)()
+        raise KeyError(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode everything into the same dict a JSON report loads as."""
+        items = [(name, self.section(name)) for name in self.SECTIONS]
+        # Optional sections go after the metrics, in the JSON report's order
+        optional = [(name, self.section(name)) for name in ("packages", "symbols") if self.has_section(name)]
+        return dict(items[:5] + optional + items[5:])
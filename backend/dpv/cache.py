@@ -0,0 +1,208 @@
+"""
+Persistent on-disk parse cache for incremental rescans.
+
+Each scanned file is keyed by its path and validated by (mtime_ns, size).
+When the stat signature changes, the file is ingested again with the cached
+content hash, so touched-but-unchanged files are read once but not parsed.
+The cache is discarded whenever dpv.parser.PARSER_VERSION changes.
+"""
+
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dpv.ingest import ingest_files
+from dpv.prefetch import DEFAULT_BYTE_BUDGET
+from dpv.models import ImportTable, ModuleInfo
+from dpv.parser import PARSER_VERSION
+from dpv.resolver import module_name_for
+
+CACHE_DIR_NAME = ".dpv-cache"
+CACHE_FILE_NAME = "parse-cache.json"
+CACHE_FORMAT = 2
+
+
+class ParseCache:
+    """Maps file path -> (mtime_ns, size, sha1, serialized ImportRecords, line count)."""
+
+    def __init__(self, cache_dir: str | Path, source_roots: Sequence[Path] = ()):
+        self.cache_dir = Path(cache_dir)
+        # Names of decoded ModuleInfos follow the scan's source roots
+        self.source_roots = list(source_roots)
+        self.entries: Dict[str, list] = {}
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        # Decoded records of hits and ingested files share one table
+        self.table = ImportTable()
+        self.dirty = False
+
+    @property
+    def file_path(self) -> Path:
+        return self.cache_dir / CACHE_FILE_NAME
+
+    def load(self) -> "ParseCache":
+        """Load entries from disk; a missing, corrupt or outdated cache starts empty."""
+        try:
+            with self.file_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+
+        if data.get("format") == CACHE_FORMAT and data.get("parser_version") == PARSER_VERSION:
+            self.entries = data.get("entries", {})
+        else:
+            self.dirty = True
+        return self
+
+    def save(self) -> bool:
+        """
+        Atomically write the cache if anything changed.
+
+        An unwritable cache directory (read-only checkout, a path through a
+        regular file) only prints a warning; the scan goes on without it.
+
+        Returns:
+            False if the cache could not be written
+        """
+        if not self.dirty:
+            return True
+        data = {"format": CACHE_FORMAT, "parser_version": PARSER_VERSION, "entries": self.entries}
+        tmp = self.file_path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.file_path)
+        except OSError as e:
+            print(f"⚠️ Cannot write parse cache in '{self.cache_dir}', continuing without it: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+        self.dirty = False
+        return True
+
+    def lookup(self, paths: Iterable[Path], root: Path) -> Tuple[Dict[str, ModuleInfo], List[Path]]:
+        """
+        Split paths into cache hits and files that must be ingested again.
+
+        Only the stat signature is checked here; no file is read.
+
+        Returns:
+            (hits keyed by str(path), list of paths that missed)
+        """
+        hits: Dict[str, ModuleInfo] = {}
+        misses: List[Path] = []
+
+        for path in paths:
+            key = str(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                misses.append(path)
+                continue
+
+            entry = self.entries.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                hits[key] = self._decode(key, entry, root)
+                continue
+
+            self._pending[key] = (st.st_mtime_ns, st.st_size)
+            misses.append(path)
+
+        return hits, misses
+
+    def known_hashes(self, paths: Iterable[Path]) -> Dict[str, str]:
+        """Cached content hashes for paths, passed to ingest_files() for misses."""
+        out = {}
+        for path in paths:
+            entry = self.entries.get(str(path))
+            if entry and entry[2]:
+                out[str(path)] = entry[2]
+        return out
+
+    def store(self, results: Dict[str, Optional[ModuleInfo]], root: Path) -> Dict[str, ModuleInfo]:
+        """
+        Record files ingested for earlier lookup() misses.
+
+        A None result means the content hash still matched: only the stat
+        signature is refreshed and the cached ModuleInfo is returned instead.
+
+        Returns:
+            The results with every None replaced by the cached ModuleInfo
+        """
+        resolved: Dict[str, ModuleInfo] = {}
+        for key, info in results.items():
+            sig = self._pending.pop(key, None)
+            if info is None:
+                entry = self.entries[key]
+                if sig is not None:
+                    # Touched but unchanged: refresh the stat signature only
+                    entry[0], entry[1] = sig
+                    self.dirty = True
+                resolved[key] = self._decode(key, entry, root)
+                continue
+
+            resolved[key] = info
+            if sig is None:
+                continue
+            mtime_ns, size = sig
+            encoded = [[r.typ, r.module, r.names, r.lineno] for r in info.imports]
+            self.entries[key] = [mtime_ns, size, info.content_hash, encoded, info.lines]
+            self.dirty = True
+        return resolved
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Drop entries for files no longer present. Returns number removed."""
+        keep_set = set(keep)
+        stale = [k for k in self.entries if k not in keep_set]
+        for k in stale:
+            del self.entries[k]
+        if stale:
+            self.dirty = True
+        return len(stale)
+
+    def _decode(self, key: str, entry: list, root: Path) -> ModuleInfo:
+        _, size, digest, encoded, lines = entry
+        return ModuleInfo(
+            name=module_name_for(Path(key), root, self.source_roots) or key,
+            path=key,
+            imports=self.table.add_file(key, encoded),
+            lines=lines,
+            size=size,
+            content_hash=digest,
+        )
+
+
+def ingest_files_cached(
+    paths: List[Path],
+    root: Path,
+    cache_dir: str | Path,
+    jobs: Optional[int] = None,
+    file_times: Optional[Dict[str, float]] = None,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+    source_roots: Sequence[Path] = (),
+) -> Dict[str, ModuleInfo]:
+    """
+    Like ingest_files(), but only parses files that changed since the last run.
+
+    Entries for files that are no longer part of the scan are dropped.
+
+    Returns:
+        Dict mapping file path string -> ModuleInfo, in input order
+    """
+    cache = ParseCache(cache_dir, source_roots).load()
+    hits, misses = cache.lookup(paths, root)
+    ingested = ingest_files(misses, root, jobs=jobs, file_times=file_times, known_hashes=cache.known_hashes(misses),
+                            table=cache.table, read_ahead=read_ahead, read_budget=read_budget,
+                            source_roots=source_roots) if misses else {}
+    ingested = cache.store(ingested, root)
+
+    keys = [str(p) for p in paths]
+    cache.prune(keys)
+    cache.save()
+
+    return {k: hits[k] if k in hits else ingested[k] for k in keys}
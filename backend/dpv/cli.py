@@ -1,97 +1,756 @@
 """
 Command Line Interface for the DPV (Dependency Project Visualizer)
+
+Every subcommand imports the modules it needs when it runs, so that
+`dpv --help` or `dpv report` (e.g. from a pre-commit hook) do not pay for
+the parser, the process pool or the graph code. Keep module-level
+imports here to the standard library and dpv.prefetch;
+benchmarks.bench_startup checks the budget.
 """
 
+from __future__ import annotations
 import argparse
+import os
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from dpv.prefetch import DEFAULT_BYTE_BUDGET
 
-from dpv.scanner import iter_py_files
-from dpv.parser import parse_imports
-from dpv.resolver import build_module_map
-from dpv.graph import build_graph
-from dpv.analyzer import find_cycles, find_dead_modules, compute_module_metrics
-from dpv.output import write_json
+if TYPE_CHECKING:
+    from dpv.profiling import ScanProfiler
+    from dpv.symbols import SymbolIndex
 
 
-def run_scan(folder: str, json_path: Optional[str]):
+def run_scan(
+    folder: str | Sequence[str],
+    json_path: Optional[str],
+    jobs: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+    fmt: str = "json",
+    compact: bool = False,
+    binary_path: Optional[str] = None,
+    compression: str = "gzip",
+    profile: bool = False,
+    profile_json: Optional[str] = None,
+    since: Optional[str] = None,
+    delta_path: Optional[str] = None,
+    symbols: bool = False,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+    source_roots: Sequence[str] = (),
+):
     """
     Scan a folder for python files, build dependency graph,
     analyze cycles + dead modules, and optionally output JSON.
+
+    jobs controls how many worker processes parse imports
+    (None = CPU count, 1 = serial). Parsed imports are cached in
+    cache_dir (default: <folder>/.dpv-cache) unless use_cache is False.
+    The report is streamed as indented or compact JSON, or as NDJSON
+    with one record per module (fmt="ndjson"). binary_path additionally
+    writes the compact binary report. profile prints per-stage timings,
+    peak memory and the slowest files to parse (profile_json saves them).
+    since (a git revision) scans only the files changed since then on
+    top of a cached scan of that revision and prints the edge delta
+    (delta_path saves it as JSON).
+
+    folder may also be a list of source roots, which are scanned as
+    separate shards (in parallel processes) and merged into one graph.
+    symbols adds an index of imported names (who imports what from
+    which module, and where) to the report. read_ahead reads that many
+    files ahead of the parser on background threads, holding at most
+    read_budget bytes, for slow or network filesystems. source_roots
+    are folders inside the scanned folder that modules are named from
+    (e.g. src/ in a src-layout), relative to it.
     """
 
-    root = Path(folder).resolve()
+    from dpv.cache import CACHE_DIR_NAME
+    from dpv.profiling import ScanProfiler
+    from dpv.symbols import SymbolIndex, index_symbols
+
+    roots = [Path(f).resolve() for f in ([folder] if isinstance(folder, (str, Path)) else folder)]
+    profiler = ScanProfiler(enabled=profile)
+    symbol_index = SymbolIndex() if symbols else None
+
+    if len(roots) > 1:
+        if since is not None:
+            print("❌ --since works with a single folder only")
+            return
+        if source_roots:
+            print("❌ --source-root works with a single folder only; list source roots as folders instead")
+            return
+        try:
+            graph, module_map, lines, files_scanned, imports_found = _sharded_scan(
+                roots, profiler, jobs, cache_dir, use_cache, symbol_index, read_ahead, read_budget)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        _finish_scan(graph, _module_names(module_map, graph.nodes(), roots), lines, files_scanned,
+                     imports_found, profiler, json_path, fmt, compact, binary_path, compression, profile_json,
+                     symbol_index)
+        return
+
+    root = roots[0]
+    source_paths = [(root / s).resolve() for s in source_roots]
+    for path in source_paths:
+        if not path.is_dir() or root not in path.parents:
+            print(f"❌ Source root is not a folder inside {root}: {path}")
+            return
     print(f"📂 Scanning: {root}")
+    cache_path = (Path(cache_dir) if cache_dir else root / CACHE_DIR_NAME) if use_cache else None
 
-    # 1) collect python files
-    py_files = list(iter_py_files(root))
-    print(f"📄 Python files found: {len(py_files)}")
+    if since is not None:
+        from dpv.gitscan import GitError, scan_since
 
-    # 2) build module path map
-    module_map = build_module_map(root)
+        with profiler.stage("git_incremental"):
+            try:
+                scan, delta = scan_since(root, since, cache_path, jobs=jobs, source_roots=source_paths)
+            except GitError as e:
+                print(f"❌ git: {e}")
+                return
+        print(f"📄 Python files found: {scan.files_scanned}")
+        module_map = scan.module_map
+        files_scanned, imports_found, lines = scan.files_scanned, scan.imports_found, scan.line_counts
+        with profiler.stage("build_graph", files_scanned):
+            graph = scan.graph.freeze()
+            if symbol_index is not None:
+                index_symbols(scan.records, scan.resolver, symbol_index)
+        _print_delta(delta, delta_path)
+    else:
+        graph, module_map, lines, files_scanned, imports_found = _full_scan(
+            root, profiler, jobs, cache_path, symbol_index, read_ahead, read_budget, source_paths)
 
-    # 3) parse all imports
-    import_records_by_file = {}
-    for f in py_files:
-        import_records_by_file[str(f)] = parse_imports(f, root)
+    _finish_scan(graph, _module_names(module_map, graph.nodes(), roots, source_paths), lines, files_scanned,
+                 imports_found, profiler, json_path, fmt, compact, binary_path, compression, profile_json,
+                 symbol_index)
 
-    # 4) build dependency graph
-    graph = build_graph(import_records_by_file, module_map)
+
+def _finish_scan(graph, module_names, lines, files_scanned, imports_found, profiler, json_path, fmt,
+                 compact, binary_path, compression, profile_json, symbol_index=None):
+    """Stages 5-7 of run_scan: analysis, summary and reports."""
+    from dpv.analyzer import aggregate_packages, analyze_graph
+    from dpv.output import write_binary_report
 
     # 5) analysis
-    cycles = find_cycles(graph)
-    dead_modules = find_dead_modules(graph)
-    metrics = compute_module_metrics(graph, module_map)
+    with profiler.stage("analysis"):
+        analysis = analyze_graph(graph)
+        analysis["packages"] = aggregate_packages(graph, module_names)
+        if symbol_index is not None:
+            analysis["symbols"] = symbol_index
 
     # 6) summary printing
-    print(f"📦 Modules: {len(graph.nodes())}")
-    print(f"🔗 Edges: {sum(len(graph.neighbors(n)) for n in graph.nodes())}")
-    print(f"🔁 Cycles found: {len(cycles)}")
-    print(f"🪦 Dead modules: {len(dead_modules)}")
+    _print_summary(graph, analysis)
+    if symbol_index is not None:
+        print(f"🔤 Imported names indexed: {len(symbol_index)} ({symbol_index.use_count()} uses)")
 
     # 7) write JSON if requested
     if json_path:
-        output_data = {
-            "graph": graph.to_adjacency_dict(),
-            "cycles": cycles,
-            "dead_modules": dead_modules,
-            "metrics": metrics,
-            "files_scanned": len(py_files),
-            "imports_found": sum(len(v) for v in import_records_by_file.values())
-        }
-
-        write_json(json_path, output_data)
+        with profiler.stage("write_report"):
+            _write_report(json_path, graph, analysis, lines, files_scanned, imports_found, fmt, compact)
         print(f"💾 Report saved → {json_path}")
 
+    if binary_path:
+        with profiler.stage("write_binary"):
+            write_binary_report(binary_path, graph, analysis, lines, files_scanned, imports_found, compression)
+
+    if profiler.enabled:
+        profiler.finish()
+        profiler.print_table()
+        if profile_json:
+            profiler.write_json(profile_json)
+
+
+def _full_scan(root: Path, profiler: ScanProfiler, jobs: Optional[int], cache_path: Optional[Path],
+               symbol_index: Optional[SymbolIndex] = None, read_ahead: int = 0,
+               read_budget: int = DEFAULT_BYTE_BUDGET, source_roots: Sequence[Path] = ()):
+    """Stages 1-4 of run_scan: walk, module map, ingest and graph build."""
+    from dpv.cache import ingest_files_cached
+    from dpv.graph import build_graph
+    from dpv.ingest import ingest_files, line_counts
+    from dpv.resolver import build_module_map
+    from dpv.scanner import iter_py_files
+
+    # 1) collect python files
+    with profiler.stage("walk") as st:
+        py_files = list(iter_py_files(root))
+        st.count(len(py_files))
+    print(f"📄 Python files found: {len(py_files)}")
+
+    # 2) build module path map from the same walk
+    with profiler.stage("build_module_map", len(py_files)):
+        module_map = build_module_map(root, py_files, source_roots)
+
+    # 3) read every file once: imports, line count, size and hash
+    with profiler.stage("ingest") as st:
+        if cache_path is not None:
+            modules = ingest_files_cached(py_files, root, cache_path, jobs=jobs, file_times=profiler.file_times,
+                                          read_ahead=read_ahead, read_budget=read_budget, source_roots=source_roots)
+        else:
+            modules = ingest_files(py_files, root, jobs=jobs, file_times=profiler.file_times,
+                                   read_ahead=read_ahead, read_budget=read_budget, source_roots=source_roots)
+        st.count(len(py_files), sum(m.size for m in modules.values()))
+    import_records_by_file = {k: m.imports for k, m in modules.items()}
+    imports_found = sum(len(v) for v in import_records_by_file.values())
+
+    # 4) build dependency graph
+    with profiler.stage("build_graph", len(py_files)):
+        graph = build_graph(import_records_by_file, module_map, symbol_index).freeze()
+
+    return graph, module_map, line_counts(modules, module_map), len(py_files), imports_found
+
+
+def _sharded_scan(roots, profiler: ScanProfiler, jobs: Optional[int], cache_dir: Optional[str], use_cache: bool,
+                  symbol_index: Optional[SymbolIndex] = None, read_ahead: int = 0,
+                  read_budget: int = DEFAULT_BYTE_BUDGET):
+    """Scan each root as a shard, then merge the partial graphs."""
+    from dpv.shards import check_roots, merge_shards, scan_shards, shard_cache_dirs
+
+    check_roots(roots)
+    print(f"📂 Scanning {len(roots)} roots:")
+    for root in roots:
+        print(f"  {root}")
+
+    with profiler.stage("scan_shards") as st:
+        shards = scan_shards(roots, shard_cache_dirs(roots, cache_dir, use_cache), jobs=jobs,
+                             symbols=symbol_index is not None, read_ahead=read_ahead, read_budget=read_budget)
+        files_scanned = sum(s.files_scanned for s in shards)
+        st.count(files_scanned, sum(s.size for s in shards))
+    print(f"📄 Python files found: {files_scanned}")
+
+    with profiler.stage("merge_shards", files_scanned):
+        graph, module_map, lines = merge_shards(shards, symbol_index)
+        graph = graph.freeze()
+    return graph, module_map, lines, files_scanned, sum(s.imports_found for s in shards)
 
-def run_report(json_path: str):
-    """Load and pretty-print a report.json."""
-    from dpv.output import read_json
 
-    obj = read_json(json_path)
+def _print_delta(delta: dict, delta_path: Optional[str] = None, limit: int = 20):
+    files, edges = delta["files"], delta["edges"]
+    print(f"🔀 Since {delta['base'][:12]}: {len(files['added'])} added, {len(files['modified'])} modified, "
+          f"{len(files['deleted'])} deleted files")
+    print(f"🔗 Edges: +{len(edges['added'])} -{len(edges['removed'])}")
+    for sign, key in (("+", "added"), ("-", "removed")):
+        for u, v in edges[key][:limit]:
+            print(f"  {sign} {u} -> {v}")
+        if len(edges[key]) > limit:
+            print(f"  ... and {len(edges[key]) - limit} more {key}")
+    if delta_path:
+        from dpv.output import write_json
+
+        write_json(delta_path, delta)
+
+
+def _print_summary(graph, analysis: dict):
+    print(f"📦 Modules: {len(graph.nodes())}")
+    print(f"🔗 Edges: {sum(graph.out_degree(n) for n in graph.nodes())}")
+    print(f"🔁 Cycles found: {len(analysis['cycles'])} "
+          f"(in {len(analysis['cyclic_components'])} strongly connected components)")
+    print(f"🪦 Dead modules: {len(analysis['dead_modules'])}")
+
+
+def _module_names(module_map, nodes=(), roots=(), source_roots=()) -> dict:
+    """
+    File path node -> dotted module name, for aggregate_packages().
+
+    Files that lost their name in module_map to another file (a.py next to
+    a/__init__.py, or a module shadowed by an earlier root) are named like
+    any other file, relative to the root in roots that holds them.
+    """
+    from dpv.resolver import module_name_for
+
+    names = {str(path): name for name, path in module_map.items()}
+    for node in nodes:
+        if node in names or not os.path.isabs(node):
+            continue
+        path = Path(node)
+        for root in roots:
+            if root in path.parents:
+                name = module_name_for(path, root, source_roots)
+                if name:
+                    names[node] = name
+                break
+    return names
+
+
+def _scan_module_names(scan, graph) -> dict:
+    """_module_names() for an IncrementalScan."""
+    return _module_names(scan.module_map, graph.nodes(), [scan.root], scan.source_roots)
+
+
+def _write_report(json_path, graph, analysis, lines, files_scanned, imports_found, fmt="json", compact=False):
+    from dpv.output import iter_ndjson_records, report_stream, write_json_stream, write_ndjson
+
+    if fmt == "ndjson":
+        write_ndjson(json_path, iter_ndjson_records(graph, analysis, lines, files_scanned, imports_found))
+    else:
+        write_json_stream(
+            json_path,
+            report_stream(graph, analysis, lines, files_scanned, imports_found),
+            compact=compact,
+        )
+
+
+def run_watch(
+    folder: str,
+    json_path: Optional[str],
+    interval: float = 1.0,
+    backend: str = "auto",
+    jobs: Optional[int] = None,
+    fmt: str = "json",
+    compact: bool = False,
+):
+    """
+    Scan once, then keep the report up to date as .py files change.
+
+    Only changed files are re-parsed and only their edges are patched in
+    the in-memory graph. The cycle, dead-module and package analysis is
+    redone only when an edit changed the graph; the JSON report is
+    rewritten after every change.
+    """
+    from dpv.watch import IncrementalScan, make_watcher
+
+    root = Path(folder).resolve()
+    print(f"📂 Watching: {root}")
+
+    scan = IncrementalScan(root, jobs=jobs)
+    state = None
+
+    def refresh():
+        nonlocal state
+        state = _watch_analysis(scan, state)
+        _, graph, analysis = state
+        _print_summary(graph, analysis)
+        if json_path:
+            _write_report(json_path, graph, analysis, scan.line_counts,
+                          scan.files_scanned, scan.imports_found, fmt, compact)
+
+    refresh()
+    watcher = make_watcher(root, backend)
+    print(f"👀 Using {type(watcher).__name__}, press Ctrl+C to stop")
+
+    try:
+        while True:
+            changed, deleted = watcher.poll(interval)
+            if not changed and not deleted:
+                continue
+            start = time.perf_counter()
+            affected = scan.apply(changed, deleted)
+            print(f"🔄 {len(changed)} changed, {len(deleted)} deleted, "
+                  f"{len(affected)} files re-linked in {(time.perf_counter() - start) * 1000:.1f} ms")
+            refresh()
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def _watch_analysis(scan, previous=None):
+    """
+    (edges_version, frozen graph, analysis) for an IncrementalScan.
+
+    previous is returned as is while scan.edges_version is unchanged, so
+    edits that leave every import alone skip the SCC and package passes.
+    """
+    from dpv.analyzer import aggregate_packages, analyze_graph
+
+    if previous is not None and previous[0] == scan.edges_version:
+        return previous
+    graph = scan.graph.freeze()
+    analysis = analyze_graph(graph)
+    analysis["packages"] = aggregate_packages(graph, _scan_module_names(scan, graph))
+    return scan.edges_version, graph, analysis
+
+
+def run_report(json_path: str, section: Optional[str] = None):
+    """Load and pretty-print a report (JSON or binary), or one section of it."""
+    from dpv.output import read_report_section
+
+    obj = read_report_section(json_path, section)
     print(obj)
 
 
+def run_serve(source: str, host: str = "127.0.0.1", port: int = 8765, jobs: Optional[int] = None,
+              cors_origin: Optional[str] = None):
+    """
+    Load a scan once and answer graph queries over HTTP.
+
+    source is either a saved report (JSON, NDJSON or binary) or a folder,
+    which is scanned in memory first. A report that cannot be loaded exits
+    with status 1. Only cors_origin, if given, may read the API
+    from a browser page on another origin.
+    """
+    from dpv.server import GraphIndex, make_server
+
+    path = Path(source)
+    if path.is_dir():
+        from dpv.analyzer import aggregate_packages, analyze_graph, compute_module_metrics
+        from dpv.watch import IncrementalScan
+
+        print(f"📂 Scanning: {path.resolve()}")
+        scan = IncrementalScan(path, jobs=jobs)
+        graph = scan.graph.freeze()
+        analysis = analyze_graph(graph)
+        index = GraphIndex(graph, analysis["cycles"], analysis["cyclic_components"], analysis["dead_modules"],
+                           compute_module_metrics(graph, line_counts=scan.line_counts), scan.files_scanned, scan.imports_found,
+                           aggregate_packages(graph, _scan_module_names(scan, graph)))
+    else:
+        import json
+        from dpv.binreport import BinaryReport, is_binary_report
+        from dpv.output import is_ndjson_report, read_ndjson_report
+
+        try:
+            if is_binary_report(path):
+                with BinaryReport(path) as report:
+                    index = GraphIndex.from_binary(report)
+            else:
+                if is_ndjson_report(path):
+                    data = read_ndjson_report(path)
+                else:
+                    with path.open("r", encoding="utf-8") as f:
+                        data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("not a DPV report")
+                index = GraphIndex.from_report(data)
+        except (OSError, ValueError, KeyError) as e:
+            # Serving an empty graph would only hide the problem
+            print(f"❌ Cannot load report '{source}': {e}")
+            raise SystemExit(1)
+
+    _print_summary(index.graph, {"cycles": index.cycles, "cyclic_components": index.cyclic_components,
+                                 "dead_modules": index.dead})
+    server = make_server(index, host, port, cors_origin)
+    print(f"🌐 Serving on http://{host}:{server.server_address[1]}/api/summary (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped serving")
+    finally:
+        server.server_close()
+
+
+def run_impact(module: str, folder: str = ".", reverse: bool = True, limit: Optional[int] = None,
+               jobs: Optional[int] = None):
+    """
+    Print every module that transitively depends on module (reverse=True),
+    or everything module transitively depends on (reverse=False).
+
+    module may be a dotted name or a path to a file inside folder.
+    """
+    from dpv.impact import ImpactIndex
+    from dpv.watch import IncrementalScan
+
+    root = Path(folder).resolve()
+    print(f"📂 Scanning: {root}")
+    scan = IncrementalScan(root, jobs=jobs)
+    index = ImpactIndex(scan.graph, _scan_module_names(scan, scan.graph))
+
+    candidate = Path(module)
+    if candidate.suffix == ".py" and candidate.exists():
+        module = str(candidate.resolve())
+    try:
+        found = index.dependents(module) if reverse else index.dependencies(module)
+    except KeyError:
+        print(f"❌ Unknown module: {module}")
+        return
+
+    name = index.module_names.get(module, module)
+    if reverse:
+        print(f"💥 {len(found)} modules depend on {name}")
+    else:
+        print(f"🔗 {name} depends on {len(found)} modules")
+    for dep in found[:limit]:
+        print(f"  {dep}")
+    if limit is not None and len(found) > limit:
+        print(f"  ... and {len(found) - limit} more")
+
+
+def run_symbol(name: str, folder: str = ".", report: Optional[str] = None, limit: Optional[int] = None,
+               jobs: Optional[int] = None, cache_dir: Optional[str] = None, use_cache: bool = True):
+    """
+    Print where a name is imported from its module ("services.auth.login"),
+    or, for a module name, every name imported from it.
+
+    Looks the name up in a report written with --symbols, or scans folder
+    (through the parse cache in cache_dir, default <folder>/.dpv-cache,
+    unless use_cache is False).
+    """
+    if report:
+        from dpv.output import read_report_section
+
+        table = read_report_section(report, "symbols")
+        if not table:
+            print(f"❌ {report} has no symbol index (scan with --symbols)")
+            return
+        uses_of = lambda module, symbol: [tuple(u) for u in table.get(module, {}).get(symbol, ())]
+        symbols_of = lambda module: sorted(table.get(module, {}))
+    else:
+        from dpv.cache import CACHE_DIR_NAME
+        from dpv.profiling import ScanProfiler
+        from dpv.symbols import SymbolIndex
+
+        root = Path(folder).resolve()
+        print(f"📂 Scanning: {root}")
+        index = SymbolIndex()
+        cache_path = (Path(cache_dir) if cache_dir else root / CACHE_DIR_NAME) if use_cache else None
+        _full_scan(root, ScanProfiler(), jobs, cache_path, index)
+        uses_of, symbols_of = index.lookup, index.symbols
+
+    module, _, symbol = name.rpartition(".")
+    uses = uses_of(module, symbol) if module else []
+    if uses:
+        print(f"🔎 {name}: imported {len(uses)} times")
+        for path, lineno in uses[:limit]:
+            print(f"  {path}:{lineno}")
+        if limit is not None and len(uses) > limit:
+            print(f"  ... and {len(uses) - limit} more")
+        return
+
+    names = symbols_of(name)
+    if not names:
+        print(f"❌ No imports of {name} found")
+        return
+    print(f"📦 {len(names)} names imported from {name}")
+    for symbol in names[:limit]:
+        print(f"  {symbol} ({len(uses_of(name, symbol))})")
+    if limit is not None and len(names) > limit:
+        print(f"  ... and {len(names) - limit} more")
+
+
+def run_diff(old_path: str, new_path: str, output: Optional[str] = None, limit: int = 10):
+    """
+    Compare two reports (JSON, NDJSON or binary) and print what changed.
+
+    With output, every change is also written there as NDJSON records.
+    """
+    from dpv.diff import iter_report_delta
+
+    summary = {}
+    new_cycles: list = []
+    new_dead: list = []
+
+    def records():
+        for record in iter_report_delta(old_path, new_path):
+            if record["type"] == "summary":
+                summary.update(record)
+            elif record["change"] == "added":
+                if record["type"] == "cycle" and len(new_cycles) < limit:
+                    new_cycles.append(record["modules"])
+                elif record["type"] == "dead_module" and len(new_dead) < limit:
+                    new_dead.append(record["name"])
+            yield record
+
+    input_error = None
+    opened = False
+
+    def checked():
+        # Report read errors stop the diff here, so any OSError that reaches
+        # the writer below is about the output file
+        nonlocal input_error
+        try:
+            yield from records()
+        except (OSError, ValueError) as e:
+            input_error = e
+
+    try:
+        if output:
+            import json
+
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            with open(output, "w", encoding="utf-8") as f:
+                opened = True
+                for record in checked():
+                    f.write(json.dumps(record, separators=(",", ":")))
+                    f.write("\n")
+        else:
+            for _ in checked():
+                pass
+    except OSError as e:
+        print(f"❌ Error writing NDJSON to '{output}': {e}")
+        failed = True
+    else:
+        failed = input_error is not None
+        if failed:
+            print(f"❌ Cannot compare reports: {input_error}")
+    if failed:
+        if opened:
+            # Do not leave a partial change list behind
+            try:
+                os.remove(output)
+            except OSError:
+                pass
+        return
+    if output:
+        print(f"✔ NDJSON written to {output}")
+
+    print(f"\n📊 {old_path} → {new_path}")
+    for label, key in (("Modules", "modules"), ("Edges", "edges"), ("Cycles", "cycles"),
+                       ("Dead modules", "dead_modules")):
+        print(f"  {label + ':':<14} +{summary[key + '_added']} -{summary[key + '_removed']}")
+    if new_cycles:
+        print("\n🔁 New cycles:")
+        for cycle in new_cycles:
+            print("  " + " -> ".join(cycle))
+    if new_dead:
+        print("\n⚠️ Newly dead modules:")
+        for name in new_dead:
+            print(f"  {name}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="DPV - Dependency Project Visualizer")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     # scan command
     scan = sub.add_parser("scan", help="Scan a folder and generate dependency report")
-    scan.add_argument("folder", help="Folder to scan")
+    scan.add_argument("folders", nargs="*", metavar="folder",
+                      help="Folder to scan; several folders are scanned as separate source roots")
+    scan.add_argument("--roots-file", help="Manifest listing source roots to scan, one per line")
     scan.add_argument("--json", help="Output JSON file")
+    scan.add_argument("--jobs", "-j", type=int, default=None,
+                      help="Worker processes for parsing (default: CPU count, 1 = serial)")
+    scan.add_argument("--cache-dir", help="Parse cache directory (default: <folder>/.dpv-cache)")
+    scan.add_argument("--no-cache", action="store_true", help="Disable the persistent parse cache")
+    scan.add_argument("--format", choices=["json", "ndjson"], default="json",
+                      help="Report format (ndjson = one record per module)")
+    scan.add_argument("--compact", action="store_true", help="Write JSON without indentation")
+    scan.add_argument("--binary", help="Also write a compact binary report (.dpvb) to this path")
+    scan.add_argument("--compression", choices=["none", "gzip", "lzma"], default="gzip",
+                      help="Compression for the binary report (default: gzip)")
+    scan.add_argument("--profile", action="store_true",
+                      help="Print per-stage wall/CPU time, throughput, peak memory and slowest files")
+    scan.add_argument("--profile-json", help="Also write the profile as a JSON trace (implies --profile)")
+    scan.add_argument("--since", metavar="REV",
+                      help="Only re-parse files changed since this git revision, on top of a cached scan of it")
+    scan.add_argument("--delta", help="With --since, write the file and edge delta as JSON to this path")
+    scan.add_argument("--read-ahead", type=int, default=0, metavar="N",
+                      help="Read up to N files ahead of the parser on background threads (for slow/NFS filesystems)")
+    scan.add_argument("--read-budget", type=int, default=DEFAULT_BYTE_BUDGET >> 20, metavar="MIB",
+                      help="Memory for read-ahead file contents per process, in MiB (default: 64)")
+    scan.add_argument("--symbols", action="store_true",
+                      help="Index imported names (module, name -> importing files and lines) in the report")
+    scan.add_argument("--source-root", action="append", default=[], metavar="DIR", dest="source_roots",
+                      help="Folder inside the scanned folder to name modules from, e.g. src (repeatable)")
+
+    # watch command
+    watch = sub.add_parser("watch", help="Rescan incrementally whenever .py files change")
+    watch.add_argument("folder", help="Folder to watch")
+    watch.add_argument("--json", help="Output JSON file, rewritten after every change")
+    watch.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds (default: 1.0)")
+    watch.add_argument("--backend", choices=["auto", "poll", "inotify"], default="auto",
+                       help="Change detection backend (default: inotify if available, else poll)")
+    watch.add_argument("--jobs", "-j", type=int, default=None,
+                       help="Worker processes for the initial parse (default: CPU count)")
+    watch.add_argument("--format", choices=["json", "ndjson"], default="json",
+                       help="Report format (ndjson = one record per module)")
+    watch.add_argument("--compact", action="store_true", help="Write JSON without indentation")
 
     # report command
     rep = sub.add_parser("report", help="Pretty print a JSON report")
-    rep.add_argument("json_path", help="Path to report.json")
+    rep.add_argument("json_path", help="Path to report.json or a binary .dpvb report")
+    rep.add_argument("--section", choices=["graph", "cycles", "cyclic_components", "dead_modules",
+                                           "metrics", "packages", "symbols", "files_scanned", "imports_found"],
+                     help="Print only this section (binary reports decode nothing else)")
+
+    # serve command
+    serve = sub.add_parser("serve", help="Serve a scan over a local HTTP query API")
+    serve.add_argument("source", help="Folder to scan, or a JSON, NDJSON or binary report to load")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    serve.add_argument("--jobs", "-j", type=int, default=None,
+                       help="Worker processes when scanning a folder (default: CPU count)")
+    serve.add_argument("--cors-origin", metavar="ORIGIN",
+                       help="Allow browser pages from this origin (e.g. http://localhost:5173) to query the API")
+
+    # impact command
+    impact = sub.add_parser("impact", help="List modules transitively affected by changing a module")
+    impact.add_argument("module", help="Dotted module name or path to a .py file")
+    impact.add_argument("--root", default=".", help="Project folder to scan (default: current directory)")
+    impact.add_argument("--dependencies", action="store_true",
+                        help="List what the module transitively imports instead of its dependents")
+    impact.add_argument("--limit", type=int, default=None, help="Print at most this many modules")
+    impact.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes for parsing (default: CPU count)")
+
+    # symbol command
+    symbol = sub.add_parser("symbol", help="Show where a name is imported, e.g. services.auth.login")
+    symbol.add_argument("name", help="module.name to look up, or a module to list the names imported from it")
+    symbol.add_argument("--root", default=".", help="Project folder to scan (default: current directory)")
+    symbol.add_argument("--report", help="Look the name up in a report written with --symbols instead")
+    symbol.add_argument("--limit", type=int, default=None, help="Print at most this many entries")
+    symbol.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes for parsing (default: CPU count)")
+    symbol.add_argument("--cache-dir", help="Parse cache directory (default: <root>/.dpv-cache)")
+    symbol.add_argument("--no-cache", action="store_true", help="Disable the persistent parse cache")
+
+    # diff command
+    diff = sub.add_parser("diff", help="Show what changed between two reports")
+    diff.add_argument("old", help="Earlier report (JSON, NDJSON or binary)")
+    diff.add_argument("new", help="Later report (JSON, NDJSON or binary)")
+    diff.add_argument("--output", "-o", help="Write every change as NDJSON records to this path")
+    diff.add_argument("--limit", type=int, default=10,
+                      help="New cycles and dead modules to list in the summary (default: 10)")
 
     args = parser.parse_args()
 
     if args.cmd == "scan":
-        run_scan(args.folder, args.json)
+        folders = list(args.folders)
+        if args.roots_file:
+            from dpv.shards import read_manifest
+
+            try:
+                folders += read_manifest(args.roots_file)
+            except OSError as e:
+                print(f"❌ Cannot read roots file: {e}")
+                return
+        if not folders:
+            scan.error("needs a folder or --roots-file")
+        run_scan(
+            folders if len(folders) > 1 else folders[0],
+            args.json,
+            jobs=args.jobs,
+            cache_dir=args.cache_dir,
+            use_cache=not args.no_cache,
+            fmt=args.format,
+            compact=args.compact,
+            binary_path=args.binary,
+            compression=args.compression,
+            profile=args.profile or bool(args.profile_json),
+            profile_json=args.profile_json,
+            since=args.since,
+            delta_path=args.delta,
+            symbols=args.symbols,
+            read_ahead=args.read_ahead,
+            read_budget=args.read_budget << 20,
+            source_roots=args.source_roots,
+        )
+
+    elif args.cmd == "watch":
+        run_watch(
+            args.folder,
+            args.json,
+            interval=args.interval,
+            backend=args.backend,
+            jobs=args.jobs,
+            fmt=args.format,
+            compact=args.compact,
+        )
 
     elif args.cmd == "report":
-        run_report(args.json_path)
+        run_report(args.json_path, section=args.section)
+
+    elif args.cmd == "impact":
+        run_impact(args.module, args.root, reverse=not args.dependencies, limit=args.limit, jobs=args.jobs)
+
+    elif args.cmd == "serve":
+        run_serve(args.source, host=args.host, port=args.port, jobs=args.jobs, cors_origin=args.cors_origin)
+
+    elif args.cmd == "symbol":
+        run_symbol(args.name, args.root, report=args.report, limit=args.limit, jobs=args.jobs,
+                   cache_dir=args.cache_dir, use_cache=not args.no_cache)
+
+    elif args.cmd == "diff":
+        run_diff(args.old, args.new, output=args.output, limit=args.limit)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,334 @@
+"""
+Streaming comparison of two scan reports for `dpv diff`.
+
+Both reports are read section by section: JSON reports through a small
+pull parser that decodes one graph entry, cycle or module name at a time,
+NDJSON reports record by record, and binary reports through BinaryReport.
+Reports list modules, their imports and dead modules in sorted order, so
+module, edge and dead-module changes come from a sorted merge of the two
+streams and memory does not grow with the number of edges. Only cycles,
+which are not sorted, are held as sets.
+
+The delta is a stream of NDJSON-style records:
+
+    {"type": "module" | "edge" | "cycle" | "dead_module", "change": "added" | "removed", ...}
+
+followed by one {"type": "summary", ...} record with the counts.
+"""
+
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+_WS = " \t\n\r"
+
+
+class ReportOrderError(ValueError):
+    """A report section that should be sorted is not."""
+
+
+class _JsonReader:
+    """Pull parser over a JSON file: containers are walked, leaves decoded whole."""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decode = json.JSONDecoder().raw_decode
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf, pos, n = self.buf, self.pos, len(self.buf)
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _advance(self, closer: str, what: str) -> bool:
+        """Consume ',' (returns False) or closer (returns True)."""
+        c = self.peek()
+        self.pos += 1
+        if c == closer:
+            return True
+        if c != ",":
+            raise ValueError(f"malformed JSON {what} in report")
+        return False
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield each key; the caller consumes its value before the next one."""
+        if self.peek() != "{":
+            raise ValueError("expected a JSON object in report")
+        self.pos += 1
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if self.peek() != ":":
+                raise ValueError("malformed JSON object in report")
+            self.pos += 1
+            yield key
+            if self._advance("}", "object"):
+                return
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per item; the caller consumes the item each time."""
+        if self.peek() != "[":
+            raise ValueError("expected a JSON array in report")
+        self.pos += 1
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self._advance("]", "array"):
+                return
+
+    def skip(self):
+        """Pass over a value; a container is walked one entry at a time."""
+        c = self.peek()
+        if c == "{":
+            for _ in self.iter_object():
+                self.value()
+        elif c == "[":
+            for _ in self.iter_array():
+                self.value()
+        else:
+            self.value()
+
+
+# ------------------------------------------------------------
+# REPORT SOURCES
+# ------------------------------------------------------------
+
+class JsonReportSource:
+    """Sections of a JSON report, each read by a fresh pass over the file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def _section(self, key: str, read: Callable[[_JsonReader], Iterator]) -> Iterator:
+        with self.path.open("r", encoding="utf-8") as f:
+            reader = _JsonReader(f)
+            for k in reader.iter_object():
+                if k == key:
+                    yield from read(reader)
+                    return
+                reader.skip()
+
+    @staticmethod
+    def _pairs(reader: _JsonReader) -> Iterator[Tuple[str, Any]]:
+        for key in reader.iter_object():
+            yield key, reader.value()
+
+    @staticmethod
+    def _items(reader: _JsonReader) -> Iterator[Any]:
+        for _ in reader.iter_array():
+            yield reader.value()
+
+    def graph(self) -> Iterator[Tuple[str, List[str]]]:
+        return self._section("graph", self._pairs)
+
+    def cycles(self) -> Iterator[List[str]]:
+        return self._section("cycles", self._items)
+
+    def dead_modules(self) -> Iterator[str]:
+        return self._section("dead_modules", self._items)
+
+    def close(self):
+        pass
+
+
+class NdjsonReportSource:
+    """Sections of an NDJSON report (see output.iter_ndjson_records)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def _records(self, typ: str) -> Iterator[Dict[str, Any]]:
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("type") == typ:
+                        yield record
+
+    def graph(self) -> Iterator[Tuple[str, List[str]]]:
+        return ((r["name"], r["imports"]) for r in self._records("module"))
+
+    def cycles(self) -> Iterator[List[str]]:
+        return (r["modules"] for r in self._records("cycle"))
+
+    def dead_modules(self) -> Iterator[str]:
+        return (r["name"] for r in self._records("module") if r.get("dead"))
+
+    def close(self):
+        pass
+
+
+class BinaryReportSource:
+    """Sections of a binary report, decoded lazily from the memory map."""
+
+    def __init__(self, path: str | Path):
+        from dpv.binreport import BinaryReport
+
+        self.report = BinaryReport(path)
+
+    def graph(self) -> Iterator[Tuple[str, List[str]]]:
+        csr = self.report.graph()
+        names, offsets, targets = csr.names, csr.offsets, csr.targets
+        for i, name in enumerate(names):
+            yield name, [names[t] for t in targets[offsets[i]:offsets[i + 1]]]
+
+    def cycles(self) -> Iterator[List[str]]:
+        return iter(self.report.cycles())
+
+    def dead_modules(self) -> Iterator[str]:
+        return iter(self.report.dead_modules())
+
+    def close(self):
+        self.report.close()
+
+
+def open_report(path: str | Path):
+    """Pick the reader for a JSON, NDJSON or binary report."""
+    from dpv.binreport import is_binary_report
+    from dpv.output import is_ndjson_report
+
+    if is_binary_report(path):
+        return BinaryReportSource(path)
+    if is_ndjson_report(path):
+        return NdjsonReportSource(path)
+    return JsonReportSource(path)
+
+
+# ------------------------------------------------------------
+# SORTED MERGES
+# ------------------------------------------------------------
+
+def _ordered(items: Iterator, label: str, key: Callable = lambda x: x) -> Iterator:
+    prev = None
+    for item in items:
+        k = key(item)
+        if prev is not None and k <= prev:
+            raise ReportOrderError(f"{label} is not sorted ({k!r} after {prev!r})")
+        prev = k
+        yield item
+
+
+def _merge(old: Iterator, new: Iterator, key: Callable = lambda x: x) -> Iterator[Tuple[Any, Any]]:
+    """Align two strictly increasing streams; yields (old item or None, new item or None)."""
+    o = next(old, None)
+    n = next(new, None)
+    while o is not None or n is not None:
+        if n is None or (o is not None and key(o) < key(n)):
+            yield o, None
+            o = next(old, None)
+        elif o is None or key(n) < key(o):
+            yield None, n
+            n = next(new, None)
+        else:
+            yield o, n
+            o = next(old, None)
+            n = next(new, None)
+
+
+def iter_graph_changes(old, new) -> Iterator[Dict[str, Any]]:
+    """Module and edge changes from a merge of the two sorted graph sections."""
+    first = lambda entry: entry[0]
+    pairs = _merge(_ordered(old.graph(), "old graph", first), _ordered(new.graph(), "new graph", first), first)
+    for o, n in pairs:
+        if n is None:
+            yield {"type": "module", "change": "removed", "name": o[0]}
+            for dep in o[1]:
+                yield {"type": "edge", "change": "removed", "from": o[0], "to": dep}
+        elif o is None:
+            yield {"type": "module", "change": "added", "name": n[0]}
+            for dep in n[1]:
+                yield {"type": "edge", "change": "added", "from": n[0], "to": dep}
+        elif o[1] != n[1]:
+            name = o[0]
+            deps = _merge(_ordered(iter(o[1]), f"old imports of {name}"), _ordered(iter(n[1]), f"new imports of {name}"))
+            for od, nd in deps:
+                if nd is None:
+                    yield {"type": "edge", "change": "removed", "from": name, "to": od}
+                elif od is None:
+                    yield {"type": "edge", "change": "added", "from": name, "to": nd}
+
+
+def iter_dead_changes(old, new) -> Iterator[Dict[str, Any]]:
+    for o, n in _merge(_ordered(old.dead_modules(), "old dead_modules"), _ordered(new.dead_modules(), "new dead_modules")):
+        if n is None:
+            yield {"type": "dead_module", "change": "removed", "name": o}
+        elif o is None:
+            yield {"type": "dead_module", "change": "added", "name": n}
+
+
+def iter_cycle_changes(old, new) -> Iterator[Dict[str, Any]]:
+    old_cycles = {tuple(c) for c in old.cycles()}
+    new_cycles = set()
+    for cycle in new.cycles():
+        key = tuple(cycle)
+        new_cycles.add(key)
+        if key not in old_cycles:
+            yield {"type": "cycle", "change": "added", "modules": cycle}
+    for key in sorted(old_cycles - new_cycles):
+        yield {"type": "cycle", "change": "removed", "modules": list(key)}
+
+
+def iter_report_delta(old_path: str | Path, new_path: str | Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the changes between two reports, ending with a summary record.
+
+    Raises:
+        ReportOrderError: if a section that dpv writes sorted is not
+    """
+    old, new = open_report(old_path), open_report(new_path)
+    counts: Dict[str, int] = {}
+    try:
+        for changes in (iter_graph_changes, iter_cycle_changes, iter_dead_changes):
+            for record in changes(old, new):
+                key = f"{record['type']}s_{record['change']}"
+                counts[key] = counts.get(key, 0) + 1
+                yield record
+    finally:
+        old.close()
+        new.close()
+
+    summary = {"type": "summary", "old": str(old_path), "new": str(new_path)}
+    for typ in ("module", "edge", "cycle", "dead_module"):
+        for change in ("added", "removed"):
+            summary[f"{typ}s_{change}"] = counts.get(f"{typ}s_{change}", 0)
+    yield summary
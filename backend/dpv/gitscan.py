@@ -0,0 +1,277 @@
+"""
+Git-aware incremental scans for `dpv scan --since <rev>`.
+
+The base revision is scanned once and kept as a snapshot in the cache
+directory, keyed by commit; only the MAX_BASE_SNAPSHOTS most recently
+used snapshots are kept. Files that git reports as unchanged since
+that commit are read from the working tree (through the parse cache);
+only changed files are read from git objects. The working tree is then
+produced by patching the base scan with IncrementalScan.apply(), and the
+two edge sets are compared to give the delta.
+
+Only the local `git` binary is used; nothing touches the network.
+"""
+
+from __future__ import annotations
+import json
+import os
+import subprocess
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from dpv.cache import ingest_files_cached
+from dpv.ingest import ingest_bytes, ingest_files
+from dpv.models import ImportTable, ModuleInfo
+from dpv.parser import PARSER_VERSION
+from dpv.resolver import module_name_for
+from dpv.scanner import is_scanned, iter_py_files
+from dpv.watch import IncrementalScan
+
+BASE_FORMAT = 1
+MAX_BASE_SNAPSHOTS = 4
+
+
+class GitError(RuntimeError):
+    """git is missing, the folder is not in a repository, or a command failed."""
+
+
+def _git(cwd: Path, *args: str, stdin: Optional[bytes] = None) -> bytes:
+    try:
+        proc = subprocess.run(["git", *args], cwd=cwd, input=stdin, capture_output=True)
+    except FileNotFoundError:
+        raise GitError("git executable not found")
+    if proc.returncode != 0:
+        message = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(message or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def resolve_commit(root: Path, rev: str) -> str:
+    """Full commit hash for rev."""
+    try:
+        return _git(root, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}").decode().strip()
+    except GitError as e:
+        # --verify --quiet fails silently for unknown revisions
+        if str(e) == "git rev-parse failed":
+            raise GitError(f"unknown revision: {rev}")
+        raise
+
+
+def _walk_key(rel: str) -> tuple:
+    # iter_py_files() yields a directory's files before its subdirectories
+    parts = PurePosixPath(rel).parts
+    return tuple((1, d) for d in parts[:-1]) + ((0, parts[-1]),)
+
+
+def base_files(root: Path, commit: str) -> List[str]:
+    """.py files under root at commit, relative to root, in walk order."""
+    out = _git(root, "ls-tree", "-r", "-z", commit)
+    rels = []
+    for entry in out.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, path = entry.partition(b"\t")
+        mode, typ, _ = meta.split(b" ")
+        if typ == b"blob" and mode in (b"100644", b"100755"):
+            rel = path.decode("utf-8", errors="surrogateescape")
+            if is_scanned(rel):
+                rels.append(rel)
+    return sorted(rels, key=_walk_key)
+
+
+def changed_files(root: Path, commit: str) -> Set[str]:
+    """Tracked paths under root whose working-tree content differs from commit."""
+    out = _git(root, "diff", "--name-only", "-z", "--no-renames", "--relative", commit, "--")
+    return {p.decode("utf-8", errors="surrogateescape") for p in out.split(b"\0") if p}
+
+
+def read_blobs(root: Path, commit: str, rels: Iterable[str]) -> Dict[str, bytes]:
+    """File contents at commit, read with one `git cat-file --batch`."""
+    rels = list(rels)
+    if not rels:
+        return {}
+    stdin = "".join(f"{commit}:./{rel}\n" for rel in rels).encode("utf-8", errors="surrogateescape")
+    out = _git(root, "cat-file", "--batch", stdin=stdin)
+    blobs = {}
+    pos = 0
+    for rel in rels:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split(b" ")
+        pos = end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        blobs[rel] = out[pos:pos + size]
+        pos += size + 1
+    return blobs
+
+
+# ------------------------------------------------------------
+# BASE SNAPSHOT
+# ------------------------------------------------------------
+
+def _snapshot_path(cache_dir: Path, commit: str) -> Path:
+    return cache_dir / f"base-{commit}.json"
+
+
+def _load_snapshot(path: Path, root: Path, source_roots: Sequence[Path] = ()) -> Optional[Dict[str, ModuleInfo]]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (data.get("format") != BASE_FORMAT or data.get("parser_version") != PARSER_VERSION
+            or data.get("root") != str(root)):
+        return None
+
+    table = ImportTable()
+    modules = {}
+    for rel, (records, lines, size, digest) in data["files"].items():
+        key = str(root / rel)
+        modules[key] = ModuleInfo(
+            name=module_name_for(Path(key), root, source_roots) or key,
+            path=key,
+            imports=table.add_file(key, records),
+            lines=lines,
+            size=size,
+            content_hash=digest,
+        )
+    return modules
+
+
+def _save_snapshot(path: Path, root: Path, modules: Dict[str, ModuleInfo], keep: int = MAX_BASE_SNAPSHOTS):
+    """Write a base snapshot, then delete all but the keep newest ones."""
+    files = {
+        os.path.relpath(key, root): [
+            [[r.typ, r.module, r.names, r.lineno] for r in info.imports],
+            info.lines, info.size, info.content_hash,
+        ]
+        for key, info in modules.items()
+    }
+    data = {"format": BASE_FORMAT, "parser_version": PARSER_VERSION, "root": str(root), "files": files}
+    tmp = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️ Cannot write base snapshot in '{path.parent}', continuing without it: {e}")
+        return
+    _prune_snapshots(path.parent, keep)
+
+
+def _prune_snapshots(cache_dir: Path, keep: int):
+    snapshots = []
+    for snapshot in cache_dir.glob("base-*.json"):
+        try:
+            snapshots.append((snapshot.stat().st_mtime_ns, snapshot))
+        except OSError:
+            continue
+    snapshots.sort(reverse=True)
+    for _, snapshot in snapshots[keep:]:
+        try:
+            snapshot.unlink()
+        except OSError:
+            pass
+
+
+def load_base(
+    root: Path,
+    commit: str,
+    changed: Set[str],
+    cache_dir: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    source_roots: Sequence[Path] = (),
+) -> Dict[str, ModuleInfo]:
+    """
+    ModuleInfo for every scanned file at commit, keyed by absolute path.
+
+    Uses the cached snapshot when there is one; otherwise unchanged files
+    are ingested from the working tree and changed ones from git objects,
+    and the snapshot is saved for the next run (if cache_dir is given).
+    """
+    if cache_dir is not None:
+        path = _snapshot_path(cache_dir, commit)
+        cached = _load_snapshot(path, root, source_roots)
+        if cached is not None:
+            try:
+                # Mark it recently used, so pruning keeps it
+                os.utime(path)
+            except OSError:
+                pass
+            return cached
+
+    rels = base_files(root, commit)
+    from_tree = [root / rel for rel in rels if rel not in changed]
+    if cache_dir is not None:
+        tree_modules = ingest_files_cached(from_tree, root, cache_dir, jobs=jobs, source_roots=source_roots)
+    else:
+        tree_modules = ingest_files(from_tree, root, jobs=jobs, source_roots=source_roots)
+    blobs = read_blobs(root, commit, (rel for rel in rels if rel in changed))
+
+    modules = {}
+    for rel in rels:
+        key = str(root / rel)
+        if key in tree_modules:
+            modules[key] = tree_modules[key]
+        elif rel in blobs:
+            modules[key] = ingest_bytes(blobs[rel], root / rel, root, source_roots)
+
+    if cache_dir is not None:
+        _save_snapshot(_snapshot_path(cache_dir, commit), root, modules)
+    return modules
+
+
+# ------------------------------------------------------------
+# INCREMENTAL SCAN
+# ------------------------------------------------------------
+
+def _edges(scan: IncrementalScan) -> Set[Tuple[str, str]]:
+    return {(u, v) for u, targets in scan.graph.adj.items() for v in targets}
+
+
+def scan_since(
+    root: str | Path,
+    rev: str,
+    cache_dir: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    source_roots: Sequence[Path] = (),
+) -> Tuple[IncrementalScan, Dict]:
+    """
+    Scan the working tree by patching a scan of rev with the changed files.
+
+    Returns:
+        (the working-tree scan, delta) where delta lists added, modified
+        and deleted files and added and removed edges, all sorted
+    """
+    root = Path(root).resolve()
+    commit = resolve_commit(root, rev)
+    changed = changed_files(root, commit)
+
+    scan = IncrementalScan(root, modules=load_base(root, commit, changed, cache_dir, jobs, source_roots),
+                           source_roots=source_roots)
+    base_edges = _edges(scan)
+
+    base_keys = set(scan.modules)
+    head_keys = {str(p) for p in iter_py_files(root)}
+    added = head_keys - base_keys
+    deleted = base_keys - head_keys
+    modified = {str(root / rel) for rel in changed} & base_keys & head_keys
+
+    scan.apply(changed=[Path(k) for k in sorted(added | modified)], deleted=[Path(k) for k in sorted(deleted)])
+    head_edges = _edges(scan)
+
+    delta = {
+        "base": commit,
+        "files": {
+            "added": sorted(added),
+            "modified": sorted(modified),
+            "deleted": sorted(deleted),
+        },
+        "edges": {
+            "added": [list(e) for e in sorted(head_edges - base_edges)],
+            "removed": [list(e) for e in sorted(base_edges - head_edges)],
+        },
+    }
+    return scan, delta
@@ -1,27 +1,36 @@
 """Dependency graph representation and construction."""
 
+from array import array
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Union
 
 from dpv.models import ImportRecord
+if TYPE_CHECKING:
+    from dpv.symbols import SymbolIndex
 # resolver import is OPTIONAL — Step 5 must not depend on resolver
 try:
-    from dpv.resolver import resolve_import
+    from dpv.resolver import ModuleResolver
 except ImportError:
-    resolve_import = None
+    ModuleResolver = None
 
 
 class DependencyGraph:
-    """Directed graph representing module dependencies."""
+    """Directed graph representing module dependencies.
+
+    Forward (adj) and reverse (radj) adjacency are kept in step as edges
+    are added, so in/out degrees and importers are O(1) lookups.
+    """
 
     def __init__(self):
         self.adj: Dict[str, Set[str]] = {}
+        self.radj: Dict[str, Set[str]] = {}
         self.meta: Dict[str, Dict] = {}
 
     def add_node(self, name: str, meta: dict = None):
         """Add a node to the graph."""
         if name not in self.adj:
             self.adj[name] = set()
+            self.radj[name] = set()
         if meta is not None:
             self.meta[name] = meta.copy()
 
@@ -30,20 +39,152 @@ class DependencyGraph:
         self.add_node(a)
         self.add_node(b)
         self.adj[a].add(b)
+        self.radj[b].add(a)
+
+    def remove_edge(self, a: str, b: str):
+        """Remove directed edge a -> b if present."""
+        if a in self.adj:
+            self.adj[a].discard(b)
+        if b in self.radj:
+            self.radj[b].discard(a)
+
+    def remove_node(self, name: str):
+        """Remove a node together with all of its incoming and outgoing edges."""
+        for b in self.adj.pop(name, ()):
+            self.radj[b].discard(name)
+        for a in self.radj.pop(name, ()):
+            self.adj[a].discard(name)
+        self.meta.pop(name, None)
 
     def neighbors(self, node: str) -> List[str]:
         return sorted(self.adj.get(node, set()))
 
+    def predecessors(self, node: str) -> List[str]:
+        """Modules that import node, sorted."""
+        return sorted(self.radj.get(node, set()))
+
+    def in_degree(self, node: str) -> int:
+        return len(self.radj.get(node, ()))
+
+    def out_degree(self, node: str) -> int:
+        return len(self.adj.get(node, ()))
+
     def nodes(self) -> List[str]:
         return sorted(self.adj.keys())
 
+    def has_edge(self, a: str, b: str) -> bool:
+        return b in self.adj.get(a, ())
+
     def to_adjacency_dict(self) -> Dict[str, List[str]]:
         return {n: self.neighbors(n) for n in self.nodes()}
 
+    def freeze(self) -> "CSRGraph":
+        """Return a compact, read-only CSR copy of this graph."""
+        return CSRGraph.from_graph(self)
+
+
+class CSRGraph:
+    """Read-only dependency graph in compressed-sparse-row form.
+
+    Module names are interned to integer IDs in sorted order, and edges are
+    stored as two flat int arrays: ``offsets[i]:offsets[i + 1]`` is the
+    slice of ``targets`` holding node i's neighbors, already sorted. The
+    reverse edges are stored the same way in ``in_offsets``/``sources``.
+    It offers the same read API as DependencyGraph, without re-sorting.
+    """
+
+    def __init__(self, names: List[str], offsets: array, targets: array, meta: Optional[Dict[str, Dict]] = None):
+        self.names = names
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.meta: Dict[str, Dict] = meta or {}
+        self.in_offsets, self.sources = self._reverse(len(names), offsets, targets)
+
+    @staticmethod
+    def _reverse(count: int, offsets: array, targets: array):
+        """Counting-sort the edges by target; sources come out sorted."""
+        in_offsets = array("i", bytes(4 * (count + 1)))
+        for t in targets:
+            in_offsets[t + 1] += 1
+        for i in range(count):
+            in_offsets[i + 1] += in_offsets[i]
+        fill = array("i", in_offsets[:count])
+        sources = array("i", bytes(4 * len(targets)))
+        for src in range(count):
+            for pos in range(offsets[src], offsets[src + 1]):
+                t = targets[pos]
+                sources[fill[t]] = src
+                fill[t] += 1
+        return in_offsets, sources
+
+    @classmethod
+    def from_graph(cls, graph: DependencyGraph) -> "CSRGraph":
+        names = sorted(graph.adj)
+        ids = {name: i for i, name in enumerate(names)}
+        offsets = array("i", [0])
+        targets = array("i")
+        for name in names:
+            targets.extend(sorted(ids[n] for n in graph.adj[name]))
+            offsets.append(len(targets))
+        return cls(names, offsets, targets, dict(graph.meta))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def neighbor_ids(self, i: int) -> array:
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def predecessor_ids(self, i: int) -> array:
+        return self.sources[self.in_offsets[i]:self.in_offsets[i + 1]]
+
+    def out_degree(self, node: str) -> int:
+        i = self.ids.get(node)
+        return 0 if i is None else self.offsets[i + 1] - self.offsets[i]
+
+    def in_degree(self, node: str) -> int:
+        i = self.ids.get(node)
+        return 0 if i is None else self.in_offsets[i + 1] - self.in_offsets[i]
+
+    def predecessors(self, node: str) -> List[str]:
+        """Modules that import node, sorted."""
+        i = self.ids.get(node)
+        if i is None:
+            return []
+        names = self.names
+        return [names[s] for s in self.sources[self.in_offsets[i]:self.in_offsets[i + 1]]]
+
+    def has_edge(self, a: str, b: str) -> bool:
+        i, j = self.ids.get(a), self.ids.get(b)
+        if i is None or j is None:
+            return False
+        return j in self.neighbor_ids(i)
+
+    def neighbors(self, node: str) -> List[str]:
+        i = self.ids.get(node)
+        if i is None:
+            return []
+        names = self.names
+        return [names[t] for t in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def nodes(self) -> List[str]:
+        return list(self.names)
+
+    def to_adjacency_dict(self) -> Dict[str, List[str]]:
+        return {n: self.neighbors(n) for n in self.names}
+
+
+# Either graph form; analyzers and writers only use the shared read API.
+AnyGraph = Union[DependencyGraph, CSRGraph]
+
 
 def build_graph(
-    import_records_by_file: Dict[str, List[ImportRecord]],
-    module_map: Optional[Dict[str, Path]] = None
+    import_records_by_file: Dict[str, Sequence[ImportRecord]],
+    module_map: Optional[Dict[str, Path]] = None,
+    symbols: Optional["SymbolIndex"] = None,
 ) -> DependencyGraph:
     """
     Build a dependency graph from parsed import records.
@@ -51,10 +192,14 @@ def build_graph(
     If module_map is None, we treat record.module as a raw dependency STR.
     This is enough for Step 5 testing and for simple projects.
 
-    If module_map is provided and resolve_import is available,
+    If module_map is provided and the resolver is available,
     we attempt to resolve module names to real dotted module identifiers.
+
+    If symbols is given, the names of every `from x import ...` record
+    are added to it against the module the edge points at.
     """
     graph = DependencyGraph()
+    resolver = ModuleResolver(module_map) if module_map and ModuleResolver else None
 
     for source_key, records in import_records_by_file.items():
         graph.add_node(source_key)
@@ -66,13 +211,22 @@ def build_graph(
             if not raw_mod:
                 continue
 
-            if module_map and resolve_import:
-                from_path = Path(record.file)
-                resolved = resolve_import(raw_mod, from_path, module_map)
-                if resolved:
-                    graph.add_edge(source_key, resolved)
+            if resolver:
+                members = resolver.namespace_members(record)
+                if members is not None:
+                    # `from <namespace package> import mod` depends on the submodules
+                    for target in members:
+                        graph.add_edge(source_key, target)
+                    continue
+                resolved = resolver.resolve(raw_mod, record.file)
+                if not resolved:
+                    continue
             else:
                 # Step 5: no resolver, use raw module names
-                graph.add_edge(source_key, raw_mod)
+                resolved = raw_mod
+            graph.add_edge(source_key, resolved)
+
+            if symbols is not None and record.typ == "from" and record.names:
+                symbols.add(source_key, resolved, record.names, record.lineno)
 
     return graph
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""
+Single-read ingest stage: one ModuleInfo per file.
+
+Each file is read exactly once. The same bytes give the content hash, byte
+size, line count and, once decoded, the import records, so nothing
+downstream has to reopen the file. A large file with a cached hash is
+hashed from a memory map first and only copied if it changed.
+
+With read_ahead, files are read and hashed on a few threads ahead of the
+parser (see dpv.prefetch), which keeps the CPU busy on slow filesystems.
+"""
+
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dpv.models import ImportTable, ModuleInfo
+from dpv.parser import _extract_records
+from dpv.prefetch import DEFAULT_BYTE_BUDGET, prefetch
+from dpv.resolver import module_name_for
+
+LARGE_FILE_BYTES = 1 << 20
+
+
+def _count_lines(text: str) -> int:
+    """Line count as seen when iterating the file in text mode."""
+    if not text:
+        return 0
+    breaks = text.count("\n") + text.count("\r") - text.count("\r\n")
+    return breaks if text[-1] in "\r\n" else breaks + 1
+
+
+def ingest_file(
+    path: Path,
+    root: Path,
+    known_hash: Optional[str] = None,
+    source_roots: Sequence[Path] = (),
+) -> Optional[ModuleInfo]:
+    """
+    Read a file once and build its ModuleInfo.
+
+    Args:
+        path: The .py file
+        root: Project root, used for the dotted module name
+        known_hash: Content hash from a previous scan; if the file still
+            matches it, parsing is skipped and None is returned
+        source_roots: Folders under root that modules are named from
+
+    Returns:
+        ModuleInfo, or None when known_hash matched
+    """
+    file_str = str(path)
+    name = module_name_for(path, root, source_roots) or file_str
+
+    read = _read_file(file_str, known_hash)
+    if read is None:
+        return ModuleInfo(name=name, path=file_str, imports=[], lines=0)
+    data, size, digest = read
+    if data is None:
+        return None
+    return _build_info(data, name, file_str, size, digest)
+
+
+def _read_file(file_str: str, known_hash: Optional[str] = None) -> Optional[Tuple[Optional[bytes], int, str]]:
+    """
+    Contents, size and sha1 of a file, or None if it cannot be read.
+
+    Contents are None when the file still matches known_hash. Only then can
+    a memory map save anything (an unchanged large file is hashed in place
+    and never copied), so files without a known hash are simply read.
+    """
+    try:
+        with open(file_str, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if known_hash is not None and size >= LARGE_FILE_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest = hashlib.sha1(mm).hexdigest()
+                    return (None if digest == known_hash else mm[:]), size, digest
+            data = f.read()
+    except OSError:
+        return None
+    digest = hashlib.sha1(data).hexdigest()
+    return (None if digest == known_hash else data), size, digest
+
+
+def _iter_ingest(
+    items: List[Tuple[str, Optional[str]]],
+    root: Path,
+    timed: bool = False,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+    source_roots: Sequence[Path] = (),
+) -> Iterator[Tuple[str, Optional[ModuleInfo], float]]:
+    """
+    (path, ModuleInfo or None if unchanged, seconds) for each (path, known hash) item.
+
+    seconds covers reading and parsing the file in both modes; with
+    read_ahead the read is timed on the prefetch thread that did it.
+    """
+    if read_ahead <= 0:
+        for key, known_hash in items:
+            start = perf_counter() if timed else 0.0
+            info = ingest_file(Path(key), root, known_hash, source_roots)
+            yield key, info, perf_counter() - start if timed else 0.0
+        return
+
+    known = dict(items)
+
+    def read_file(key: str):
+        start = perf_counter() if timed else 0.0
+        read = _read_file(key, known[key])
+        return read, perf_counter() - start if timed else 0.0
+
+    size_of = lambda timed_read: timed_read[0][1] if timed_read[0] and timed_read[0][0] is not None else 0
+    for key, (read, read_time) in prefetch(known, read_file, size_of, depth=read_ahead, byte_budget=read_budget):
+        start = perf_counter() if timed else 0.0
+        path = Path(key)
+        name = module_name_for(path, root, source_roots) or key
+        if read is None:
+            info = ModuleInfo(name=name, path=key, imports=[], lines=0)
+        elif read[0] is None:
+            info = None
+        else:
+            info = _build_info(read[0], name, key, read[1], read[2])
+        yield key, info, read_time + perf_counter() - start if timed else 0.0
+
+
+def ingest_bytes(data: bytes, path: Path, root: Path, source_roots: Sequence[Path] = ()) -> ModuleInfo:
+    """Build the ModuleInfo for file contents obtained elsewhere (e.g. a git blob)."""
+    file_str = str(path)
+    name = module_name_for(path, root, source_roots) or file_str
+    return _build_info(data, name, file_str, len(data), hashlib.sha1(data).hexdigest())
+
+
+def _build_info(data: bytes, name: str, file_str: str, size: int, digest: str) -> ModuleInfo:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Same as parse_imports(): undecodable files have no imports
+        return ModuleInfo(name=name, path=file_str, imports=[], size=size, content_hash=digest,
+                          lines=_count_lines(data.decode("utf-8", errors="replace")))
+
+    # Match read_text()'s universal-newline translation
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return ModuleInfo(
+        name=name,
+        path=file_str,
+        imports=_extract_records(text, file_str),
+        lines=_count_lines(text),
+        size=size,
+        content_hash=digest,
+    )
+
+
+# ------------------------------------------------------------
+# PARALLEL INGEST
+# ------------------------------------------------------------
+
+# Compact ModuleInfo sent back from worker processes:
+# (records as (typ, module, names, lineno), lines, size, hash), or None if unchanged
+CompactInfo = Optional[Tuple[List[Tuple[str, str, Tuple[str, ...], int]], int, int, str]]
+
+
+def _compact(info: Optional[ModuleInfo]) -> CompactInfo:
+    if info is None:
+        return None
+    records = [(r.typ, r.module, r.names, r.lineno) for r in info.imports]
+    return records, info.lines, info.size, info.content_hash
+
+
+def _expand(
+    file_str: str,
+    root: Path,
+    compact: CompactInfo,
+    table: ImportTable,
+    source_roots: Sequence[Path] = (),
+) -> Optional[ModuleInfo]:
+    if compact is None:
+        return None
+    records, lines, size, digest = compact
+    return ModuleInfo(
+        name=module_name_for(Path(file_str), root, source_roots) or file_str,
+        path=file_str,
+        imports=table.add_file(file_str, records),
+        lines=lines,
+        size=size,
+        content_hash=digest,
+    )
+
+
+def _ingest_batch(
+    batch: List[Tuple[str, Optional[str]]],
+    root: str,
+    timed: bool = False,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+    source_roots: Sequence[Path] = (),
+) -> List[Tuple[str, CompactInfo, float]]:
+    """Worker entry point: ingest a batch of (path, known hash) pairs."""
+    return [(p, _compact(info), elapsed)
+            for p, info, elapsed in _iter_ingest(batch, Path(root), timed, read_ahead, read_budget, source_roots)]
+
+
+def _chunk(items: List, size: int) -> Iterator[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def ingest_files(
+    paths: Iterable[Path],
+    root: Path,
+    jobs: Optional[int] = None,
+    chunk_size: int = 64,
+    file_times: Optional[Dict[str, float]] = None,
+    known_hashes: Optional[Dict[str, str]] = None,
+    table: Optional[ImportTable] = None,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+    source_roots: Sequence[Path] = (),
+) -> Dict[str, Optional[ModuleInfo]]:
+    """
+    Ingest many files, optionally fanning the work out over a process pool.
+
+    Results are keyed by str(path) in input order and are identical to
+    calling ingest_file() serially for each file, except that each
+    ModuleInfo.imports is an ImportRows view into one shared ImportTable.
+
+    Args:
+        paths: Files to ingest
+        root: Root directory of the project
+        jobs: Worker processes (None = CPU count, <= 1 = serial)
+        chunk_size: Number of files handed to a worker per batch
+        file_times: If given, filled with seconds spent on each file
+        known_hashes: Previous content hashes; files that still match map to None
+        table: ImportTable to store records in (a new one by default)
+        read_ahead: Files each process reads ahead of its parser on
+            background threads (0 = read each file just before parsing it)
+        read_budget: Bytes of read-ahead contents each process may hold
+        source_roots: Folders under root that ModuleInfo.name is taken from
+
+    Returns:
+        Dict mapping file path string -> ModuleInfo (or None if unchanged)
+    """
+    root = Path(root)
+    known_hashes = known_hashes or {}
+    items = [(str(p), known_hashes.get(str(p))) for p in paths]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, max(1, -(-len(items) // chunk_size)))
+    timed = file_times is not None
+    if table is None:
+        table = ImportTable()
+
+    results: Dict[str, Optional[ModuleInfo]] = {}
+    if jobs <= 1:
+        for key, info, elapsed in _iter_ingest(items, root, timed, read_ahead, read_budget, source_roots):
+            if timed:
+                file_times[key] = elapsed
+            if info is not None:
+                info.imports = table.add_records(key, info.imports)
+            results[key] = info
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        batches = pool.map(_ingest_batch, _chunk(items, chunk_size), repeat(str(root)), repeat(timed),
+                           repeat(read_ahead), repeat(read_budget), repeat(tuple(source_roots)))
+        for batch in batches:
+            for key, compact, elapsed in batch:
+                if timed:
+                    file_times[key] = elapsed
+                results[key] = _expand(key, root, compact, table, source_roots)
+    return results
+
+
+def line_counts(modules: Dict[str, ModuleInfo], module_map: Dict[str, Path]) -> Dict[str, int]:
+    """Map dotted module name -> line count, for compute_module_metrics()."""
+    counts = {}
+    for name, path in module_map.items():
+        info = modules.get(str(path))
+        if info is not None:
+            counts[name] = info.lines
+    return counts
@@ -1,25 +1,30 @@
 """Data models for dependency analysis."""
 
+from array import array
 from dataclasses import dataclass
-from typing import List, Literal
+from typing import Dict, Iterable, Iterator, List, Literal, Sequence, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportRecord:
     """Represents a single import statement in a Python module.
     
     Attributes:
         typ: Type of import - "import", "from", or "dynamic"
         module: The module being imported from
-        names: List of names being imported
+        names: Tuple of names being imported (lists are converted)
         lineno: Line number where the import occurs
         file: Path to the file containing the import
     """
     typ: Literal["import", "from", "dynamic"]
     module: str
-    names: List[str]
+    names: Tuple[str, ...]
     lineno: int
     file: str
+
+    def __post_init__(self):
+        if type(self.names) is not tuple:
+            self.names = tuple(self.names)
     
     def __repr__(self) -> str:
         """Return a helpful string representation."""
@@ -37,20 +42,24 @@ class ModuleInfo:
     Attributes:
         name: Module name
         path: File path to the module
-        imports: List of import records found in the module
+        imports: Import records found in the module (a list or ImportRows view)
         lines: Total number of lines in the module
+        size: File size in bytes
+        content_hash: SHA-1 hex digest of the file contents
     """
     name: str
     path: str
-    imports: List[ImportRecord]
+    imports: Sequence[ImportRecord]
     lines: int
+    size: int = 0
+    content_hash: str = ""
     
     def __repr__(self) -> str:
         """Return a helpful string representation."""
         imports_count = len(self.imports)
         return (
             f"ModuleInfo(name={self.name!r}, path={self.path!r}, "
-            f"imports=[{imports_count} items], lines={self.lines})"
+            f"imports=[{imports_count} items], lines={self.lines}, size={self.size})"
         )
 
 
@@ -65,3 +74,118 @@ def record_to_tuple(rec: ImportRecord) -> tuple:
     """
     return (rec.typ, rec.module, tuple(rec.names), rec.lineno, rec.file)
 
+
+class ImportTable:
+    """Columnar storage for the import records of many files.
+
+    File paths, module names and name tuples are interned once per table
+    and each record is five small integers in flat arrays, instead of an
+    object with its own references. Records of one file are stored
+    contiguously; add_file() returns an ImportRows view over them that
+    behaves like a list of ImportRecord.
+    """
+
+    TYPES = ("import", "from", "dynamic")
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._tuples: List[Tuple[str, ...]] = []
+        self._tuple_ids: Dict[Tuple[str, ...], int] = {}
+        self._type_ids = {t: i for i, t in enumerate(self.TYPES)}
+        self.typs = bytearray()
+        self.modules = array("i")
+        self.names = array("i")
+        self.linenos = array("i")
+        self.files = array("i")
+
+    def _intern(self, s: str) -> int:
+        i = self._string_ids.get(s)
+        if i is None:
+            i = self._string_ids[s] = len(self._strings)
+            self._strings.append(s)
+        return i
+
+    def _intern_names(self, names: Sequence[str]) -> int:
+        key = tuple(self._strings[self._intern(n)] for n in names)
+        i = self._tuple_ids.get(key)
+        if i is None:
+            i = self._tuple_ids[key] = len(self._tuples)
+            self._tuples.append(key)
+        return i
+
+    def __len__(self) -> int:
+        return len(self.typs)
+
+    def add_file(self, file: str, rows: Iterable[Tuple[str, str, Sequence[str], int]]) -> "ImportRows":
+        """Append one file's (typ, module, names, lineno) rows and return a view of them."""
+        start = len(self.typs)
+        file_id = self._intern(file)
+        for typ, module, names, lineno in rows:
+            self.typs.append(self._type_ids[typ])
+            self.modules.append(self._intern(module))
+            self.names.append(self._intern_names(names))
+            self.linenos.append(lineno)
+            self.files.append(file_id)
+        return ImportRows(self, start, len(self.typs))
+
+    def add_records(self, file: str, records: Iterable[ImportRecord]) -> "ImportRows":
+        return self.add_file(file, ((r.typ, r.module, r.names, r.lineno) for r in records))
+
+    def module(self, i: int) -> str:
+        return self._strings[self.modules[i]]
+
+    def file(self, i: int) -> str:
+        return self._strings[self.files[i]]
+
+    def record(self, i: int) -> ImportRecord:
+        return ImportRecord(
+            typ=self.TYPES[self.typs[i]],
+            module=self._strings[self.modules[i]],
+            names=self._tuples[self.names[i]],
+            lineno=self.linenos[i],
+            file=self._strings[self.files[i]],
+        )
+
+    def __iter__(self) -> Iterator[ImportRecord]:
+        return (self.record(i) for i in range(len(self.typs)))
+
+
+class ImportRows(Sequence):
+    """A file's records inside an ImportTable, read as ImportRecord objects."""
+
+    __slots__ = ("table", "start", "stop")
+
+    def __init__(self, table: ImportTable, start: int, stop: int):
+        self.table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.table.record(j) for j in range(self.start, self.stop)[i]]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("import row index out of range")
+        return self.table.record(self.start + i)
+
+    def __iter__(self) -> Iterator[ImportRecord]:
+        record = self.table.record
+        return (record(i) for i in range(self.start, self.stop))
+
+    def modules(self) -> Iterator[str]:
+        """Module strings only, without building ImportRecord objects."""
+        strings, modules = self.table._strings, self.table.modules
+        return (strings[modules[i]] for i in range(self.start, self.stop))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ImportRows, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ImportRows({list(self)!r})"
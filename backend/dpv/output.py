@@ -5,27 +5,25 @@ Handles ASCII trees, DOT exports, and JSON writing/reading.
 
 from __future__ import annotations
 import json
+from json.encoder import encode_basestring_ascii as _encode_str
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
-from dpv.graph import DependencyGraph
+if TYPE_CHECKING:
+    from dpv.graph import AnyGraph
 
 
 # ------------------------------------------------------------
 # ASCII TREE PRINTER
 # ------------------------------------------------------------
 
-def print_ascii_tree(graph: DependencyGraph, roots: Optional[List[str]] = None, depth_limit: int = 5):
+def print_ascii_tree(graph: AnyGraph, roots: Optional[List[str]] = None, depth_limit: int = 5):
     """Print a readable ASCII dependency tree."""
     
     # Auto-detect roots (nodes with indegree 0)
     if roots is None:
-        indegree = {node: 0 for node in graph.nodes()}
-        for node in graph.nodes():
-            for neighbor in graph.neighbors(node):
-                indegree[neighbor] = indegree.get(neighbor, 0) + 1
-        roots = [node for node, degree in indegree.items() if degree == 0]
-        roots = sorted(roots) if roots else graph.nodes()[:1]
+        roots = [node for node in graph.nodes() if graph.in_degree(node) == 0]
+        roots = roots if roots else graph.nodes()[:1]
 
     visited_in_path = set()
     visited_printed = set()
@@ -64,7 +62,7 @@ def print_ascii_tree(graph: DependencyGraph, roots: Optional[List[str]] = None,
 # DOT EXPORT
 # ------------------------------------------------------------
 
-def export_dot(graph: DependencyGraph, file_path: str):
+def export_dot(graph: AnyGraph, file_path: str):
     """Export graph to DOT format for GraphViz."""
     lines = ["digraph {"]
 
@@ -113,7 +111,7 @@ def read_json(path: str | Path) -> Any:
 # DPV REPORT (used by CLI)
 # ------------------------------------------------------------
 
-def write_json_report(graph: DependencyGraph, cycles: List[List[str]], dead: List[str], file_path: str):
+def write_json_report(graph: AnyGraph, cycles: List[List[str]], dead: List[str], file_path: str):
     """Write full JSON analysis report used by DPV frontend."""
     
     report = {
@@ -122,4 +120,303 @@ def write_json_report(graph: DependencyGraph, cycles: List[List[str]], dead: Lis
         "dead_modules": dead
     }
 
-    write_json(file_path, report)
\ No newline at end of file
+    write_json(file_path, report)
+
+
+# ------------------------------------------------------------
+# STREAMING JSON / NDJSON REPORTS
+# ------------------------------------------------------------
+
+class JsonObjectStream:
+    """A JSON object whose (key, value) pairs are produced lazily."""
+
+    def __init__(self, pairs: Iterable[Tuple[str, Any]]):
+        self.pairs = pairs
+
+
+class JsonArrayStream:
+    """A JSON array whose items are produced lazily."""
+
+    def __init__(self, items: Iterable[Any]):
+        self.items = items
+
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _encode_scalar(value: Any) -> str:
+    if type(value) is str:
+        return _encode_str(value)
+    if type(value) is int:
+        return int.__repr__(value)
+    return _encode(value)
+
+
+def _encode_key(key: Any) -> str:
+    # json.dump turns None/bool/number keys into their JSON text
+    return _encode_str(key if isinstance(key, str) else _encode(key))
+
+
+def _encode_indented(value: Any, pad: str, out: List[str]):
+    """Append value as json.dump(indent=2) would write it at indentation pad.
+
+    Scalars go through the C string encoder or one shared compact encoder;
+    only the newlines and indentation are added here, which is much cheaper
+    than json.dumps(indent=2)'s pure-Python encoder.
+    """
+    if isinstance(value, dict) and value:
+        inner = pad + "  "
+        sep = "{\n"
+        for k, v in value.items():
+            out.append(sep + inner + _encode_key(k) + ": ")
+            if isinstance(v, (dict, list, tuple)):
+                _encode_indented(v, inner, out)
+            else:
+                out.append(_encode_scalar(v))
+            sep = ",\n"
+        out.append("\n" + pad + "}")
+    elif isinstance(value, (list, tuple)) and value:
+        inner = pad + "  "
+        if all(type(v) is str for v in value):
+            # Edge lists, cycles and module lists: one join, no recursion
+            out.append("[\n" + inner + (",\n" + inner).join(map(_encode_str, value)) + "\n" + pad + "]")
+            return
+        sep = "[\n"
+        for v in value:
+            out.append(sep + inner)
+            _encode_indented(v, inner, out)
+            sep = ",\n"
+        out.append("\n" + pad + "]")
+    else:
+        out.append(_encode_scalar(value))
+
+
+def _write_stream_value(f: TextIO, value: Any, level: int, compact: bool):
+    """Write value at nesting level, expanding stream wrappers as we go.
+
+    Output matches json.dump(indent=2) (or compact separators) byte for
+    byte; only one entry of a streamed container is held at a time.
+    """
+    if isinstance(value, JsonObjectStream):
+        colon = ":" if compact else ": "
+        entries = ((_encode_key(k) + colon, v) for k, v in value.pairs)
+        open_, close = "{", "}"
+    elif isinstance(value, JsonArrayStream):
+        entries = (("", v) for v in value.items)
+        open_, close = "[", "]"
+    elif compact:
+        f.write(_encode(value))
+        return
+    else:
+        out: List[str] = []
+        _encode_indented(value, "  " * level, out)
+        f.write("".join(out))
+        return
+
+    pad = "  " * (level + 1)
+    inner = "" if compact else "\n" + pad
+    sep = inner
+    f.write(open_)
+    for prefix, v in entries:
+        if isinstance(v, (JsonObjectStream, JsonArrayStream)):
+            f.write(sep + prefix)
+            _write_stream_value(f, v, level + 1, compact)
+        elif compact:
+            f.write(sep + prefix + _encode(v))
+        else:
+            # Leaf entries are encoded inline, one write each
+            out = [sep + prefix]
+            _encode_indented(v, pad, out)
+            f.write("".join(out))
+        sep = "," + inner
+    if sep is not inner and not compact:
+        f.write("\n" + "  " * level)
+    f.write(close)
+
+
+def write_json_stream(path: str | Path, data: Any, compact: bool = False) -> None:
+    """Write JSON that may contain JsonObjectStream/JsonArrayStream parts.
+
+    Peak memory is bounded by the largest single entry rather than the
+    whole document. compact=True drops indentation and spaces.
+    """
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with path.open("w", encoding="utf-8") as f:
+            _write_stream_value(f, data, 0, compact)
+
+        print(f"✔ JSON written to {path}")
+
+    except Exception as e:
+        print(f"❌ Error writing JSON to '{path}': {e}")
+
+
+def report_stream(
+    graph: AnyGraph,
+    analysis: Dict[str, List],
+    line_counts: Optional[Dict[str, int]],
+    files_scanned: int,
+    imports_found: int,
+) -> JsonObjectStream:
+    """Scan report with the graph and metrics sections produced lazily.
+
+    A "packages" section is written after the metrics when the analysis
+    carries one (see analyzer.aggregate_packages), followed by "symbols"
+    when it carries a symbols.SymbolIndex.
+    """
+    from dpv.analyzer import iter_module_metrics
+
+    sections = [
+        ("graph", JsonObjectStream((n, graph.neighbors(n)) for n in graph.nodes())),
+        ("cycles", JsonArrayStream(analysis["cycles"])),
+        ("cyclic_components", JsonArrayStream(analysis["cyclic_components"])),
+        ("dead_modules", JsonArrayStream(analysis["dead_modules"])),
+        ("metrics", JsonObjectStream(iter_module_metrics(graph, line_counts))),
+    ]
+    if "packages" in analysis:
+        sections.append(("packages", JsonObjectStream(iter(analysis["packages"].items()))))
+    if "symbols" in analysis:
+        sections.append(("symbols", JsonObjectStream(analysis["symbols"].iter_report())))
+    sections += [("files_scanned", files_scanned), ("imports_found", imports_found)]
+    return JsonObjectStream(iter(sections))
+
+
+def iter_ndjson_records(
+    graph: AnyGraph,
+    analysis: Dict[str, List],
+    line_counts: Optional[Dict[str, int]],
+    files_scanned: int,
+    imports_found: int,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one report record per module, cycle, component, package and symbol, then a summary."""
+    from dpv.analyzer import iter_module_metrics
+
+    dead = set(analysis["dead_modules"])
+    for name, metrics in iter_module_metrics(graph, line_counts):
+        record = {"type": "module", "name": name, "imports": graph.neighbors(name), "dead": name in dead}
+        record.update(metrics)
+        yield record
+    for cycle in analysis["cycles"]:
+        yield {"type": "cycle", "modules": cycle}
+    for component in analysis["cyclic_components"]:
+        yield {"type": "component", "modules": component}
+    for name, package in analysis.get("packages", {}).items():
+        yield {"type": "package", "name": name, **package}
+    if "symbols" in analysis:
+        for module, symbol, uses in analysis["symbols"].iter_entries():
+            yield {"type": "symbol", "module": module, "name": symbol, "importers": [list(u) for u in uses]}
+    yield {"type": "summary", "files_scanned": files_scanned, "imports_found": imports_found}
+
+
+def write_ndjson(path: str | Path, records: Iterable[Any]) -> None:
+    """Write one compact JSON document per line."""
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with path.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")))
+                f.write("\n")
+
+        print(f"✔ NDJSON written to {path}")
+
+    except Exception as e:
+        print(f"❌ Error writing NDJSON to '{path}': {e}")
+
+
+def is_ndjson_report(path: str | Path) -> bool:
+    """True if the file looks like a report written by write_ndjson()."""
+    try:
+        with Path(path).open("r", encoding="utf-8") as f:
+            head = f.read(64).lstrip()
+    except (OSError, UnicodeDecodeError):
+        return False
+    # iter_ndjson_records() writes "type" as the first key of every record
+    return head.startswith('{"type"')
+
+
+def read_ndjson_report(path: str | Path) -> Dict[str, Any]:
+    """Rebuild the sections of a JSON report from NDJSON report records."""
+    report: Dict[str, Any] = {"graph": {}, "cycles": [], "cyclic_components": [], "dead_modules": [], "metrics": {}}
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            typ = record.pop("type", None)
+            if typ == "module":
+                name = record.pop("name")
+                report["graph"][name] = record.pop("imports")
+                if record.pop("dead", False):
+                    report["dead_modules"].append(name)
+                report["metrics"][name] = record
+            elif typ == "cycle":
+                report["cycles"].append(record["modules"])
+            elif typ == "component":
+                report["cyclic_components"].append(record["modules"])
+            elif typ == "package":
+                report.setdefault("packages", {})[record.pop("name")] = record
+            elif typ == "symbol":
+                report.setdefault("symbols", {}).setdefault(record["module"], {})[record["name"]] = record["importers"]
+            elif typ == "summary":
+                report.update(record)
+    return report
+
+
+# ------------------------------------------------------------
+# BINARY REPORTS
+# ------------------------------------------------------------
+
+def write_binary_report(
+    path: str | Path,
+    graph: AnyGraph,
+    analysis: Dict[str, List],
+    line_counts: Optional[Dict[str, int]],
+    files_scanned: int,
+    imports_found: int,
+    compression: str = "gzip",
+) -> None:
+    """Write the compact binary (.dpvb) form of a scan report."""
+    from dpv.binreport import encode_report
+
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(encode_report(graph, analysis, line_counts, files_scanned, imports_found, compression))
+
+        print(f"✔ Binary report written to {path}")
+
+    except Exception as e:
+        print(f"❌ Error writing binary report to '{path}': {e}")
+
+
+def read_report_section(path: str | Path, section: Optional[str] = None) -> Any:
+    """Read a JSON, NDJSON or binary report, or just one section of it.
+
+    Binary reports are memory-mapped and only the requested section is
+    decoded; JSON reports have to be loaded whole, and NDJSON reports are
+    read record by record into the same sections.
+    """
+    from dpv.binreport import BinaryReport, is_binary_report
+
+    if is_ndjson_report(path):
+        try:
+            obj = read_ndjson_report(path)
+        except Exception as e:
+            print(f"❌ Error reading NDJSON report '{path}': {e}")
+            return {}
+        return obj.get(section) if section else obj
+
+    if not is_binary_report(path):
+        obj = read_json(path)
+        return obj.get(section) if section else obj
+
+    try:
+        with BinaryReport(path) as report:
+            return report.section(section) if section else report.to_dict()
+    except Exception as e:
+        print(f"❌ Error reading binary report '{path}': {e}")
+        return {}
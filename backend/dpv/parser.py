@@ -7,15 +7,20 @@ This matches the shape expected by build_graph(...).
 
 from __future__ import annotations
 import ast
+from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from dpv.models import ImportRecord
 
+# Bump whenever the records produced by parse_imports() change shape or content.
+# Persistent parse caches are invalidated when this changes.
+PARSER_VERSION = "1"
+
 
 def _make_import_record(typ: str, module: str, names: List[str], lineno: int, file_path: str) -> ImportRecord:
     # Ensure types align with models.ImportRecord
-    return ImportRecord(typ=typ, module=module or "", names=names or [], lineno=lineno or 0, file=file_path)
+    return ImportRecord(typ=typ, module=module or "", names=tuple(names) if names else (), lineno=lineno or 0, file=file_path)
 
 
 def _extract_constant_string(node: ast.AST) -> Optional[str]:
@@ -44,6 +49,46 @@ def parse_imports(path: Path, root: Path) -> List[ImportRecord]:
     except Exception:
         return []
 
+    return _extract_records(source, str(path))
+
+
+# Nodes that can hold statements. Import statements never appear below
+# expressions, so the fast walk only descends through these.
+_STATEMENT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_statements(tree: ast.AST) -> Iterator[ast.AST]:
+    """
+    Breadth-first walk over statement-level nodes only.
+
+    Only subtrees that cannot contain statements are pruned, so the
+    surviving nodes come out in the same relative order as ast.walk().
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_CONTAINERS):
+                todo.append(child)
+        yield node
+
+
+def _extract_records(source: str, file_str: str, fast: bool = True) -> List[ImportRecord]:
+    """
+    Extract ImportRecords from source text.
+
+    With fast=True, files that cannot contain imports are not parsed at all,
+    and the walk skips expression subtrees unless the source mentions
+    __import__ or import_module. Non-ASCII sources always take the full
+    walk, since identifiers are NFKC-normalized by the parser. Output is
+    identical to the full ast.walk() either way.
+    """
+    dynamic = True
+    if fast and source.isascii():
+        if "import" not in source:
+            return []
+        dynamic = "__import__" in source or "import_module" in source
+
     try:
         tree = ast.parse(source)
     except SyntaxError:
@@ -51,10 +96,10 @@ def parse_imports(path: Path, root: Path) -> List[ImportRecord]:
         return []
 
     records: List[ImportRecord] = []
-    file_str = str(path)
 
     # Walk AST and capture import statements and some dynamic import patterns
-    for node in ast.walk(tree):
+    nodes = ast.walk(tree) if dynamic or not fast else _iter_statements(tree)
+    for node in nodes:
 
         # Handle: import a, b as c
         if isinstance(node, ast.Import):
@@ -137,4 +182,4 @@ def parse_imports(path: Path, root: Path) -> List[ImportRecord]:
                         )
                         records.append(rec)
 
-    return records
\ No newline at end of file
+    return records
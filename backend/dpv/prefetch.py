@@ -0,0 +1,72 @@
+"""
+Read-ahead for slow (e.g. network) filesystems.
+
+prefetch() reads items on a small thread pool while the caller works on
+earlier ones, and hands results back in input order. File reads and
+hashing release the GIL, so on NFS the parse of one file overlaps the
+reads of the next few instead of waiting for each in turn.
+
+Two limits keep it bounded: depth (reads queued or in flight) and
+byte_budget (bytes read but not yet taken by the caller). A read that
+is already running is only counted once it finishes, so the budget can
+be exceeded by at most the files in flight; a single file larger than
+the budget is still read, just on its own.
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+DEFAULT_BYTE_BUDGET = 64 << 20
+
+
+def prefetch(
+    keys: Iterable[K],
+    read: Callable[[K], T],
+    size: Callable[[T], int],
+    depth: int = 16,
+    byte_budget: int = DEFAULT_BYTE_BUDGET,
+    threads: Optional[int] = None,
+) -> Iterator[Tuple[K, T]]:
+    """
+    Yield (key, read(key)) for every key, in order, reading ahead.
+
+    Args:
+        keys: Items to read
+        read: Reads one item; exceptions propagate when its result is reached
+        size: Bytes held by a result, for the budget
+        depth: Maximum reads queued or running ahead of the caller
+        byte_budget: Maximum bytes of finished reads waiting for the caller
+        threads: Reader threads (default: depth)
+    """
+    # Imported here: concurrent.futures is slow to import, and the CLI
+    # imports this module for DEFAULT_BYTE_BUDGET
+    from concurrent.futures import ThreadPoolExecutor
+
+    depth = max(1, depth)
+    keys = iter(keys)
+    with ThreadPoolExecutor(max_workers=threads or depth, thread_name_prefix="dpv-read") as pool:
+        pending = deque()
+
+        def fill():
+            while len(pending) < depth:
+                waiting = sum(size(f.result()) for _, f in pending if f.done() and f.exception() is None)
+                if pending and waiting >= byte_budget:
+                    return
+                key = next(keys, _END)
+                if key is _END:
+                    return
+                pending.append((key, pool.submit(read, key)))
+
+        fill()
+        while pending:
+            key, future = pending.popleft()
+            result = future.result()
+            fill()
+            yield key, result
+
+
+_END = object()
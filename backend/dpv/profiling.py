@@ -0,0 +1,127 @@
+"""
+Stage profiling for `dpv scan --profile`.
+
+ScanProfiler.stage() wraps one scan stage and records wall time, CPU time
+and throughput. Peak memory comes from tracemalloc, which only runs while
+profiling; CPU time and memory cover this process, not parse workers. A
+disabled profiler hands out one shared no-op context, so the hooks in
+run_scan cost a method call per stage.
+"""
+
+from __future__ import annotations
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class _NullStage:
+    """Context returned by a disabled profiler."""
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, files: int = 0, nbytes: int = 0):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler: "ScanProfiler", name: str, files: int, nbytes: int):
+        self.profiler = profiler
+        self.name = name
+        self.files = files
+        self.nbytes = nbytes
+
+    def count(self, files: int = 0, nbytes: int = 0):
+        """Set the files/bytes processed once they are known inside the stage."""
+        self.files = files
+        self.nbytes = nbytes
+
+    def __enter__(self) -> "_Stage":
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.stages.append({
+            "stage": self.name,
+            "wall_s": time.perf_counter() - self.wall,
+            "cpu_s": time.process_time() - self.cpu,
+            "files": self.files,
+            "bytes": self.nbytes,
+        })
+        return False
+
+
+class ScanProfiler:
+    """Collects per-stage timings, per-file parse times and peak memory."""
+
+    def __init__(self, enabled: bool = False, top_files: int = 10):
+        self.enabled = enabled
+        self.top_files = top_files
+        self.stages: List[Dict] = []
+        # Filled by ingest_files(file_times=...) while profiling
+        self.file_times: Optional[Dict[str, float]] = {} if enabled else None
+        self.peak_memory = 0
+        if enabled:
+            tracemalloc.start()
+
+    def stage(self, name: str, files: int = 0, nbytes: int = 0):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, files, nbytes)
+
+    def finish(self):
+        """Stop memory tracing; call once the scan is done."""
+        if self.enabled and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def slowest_files(self) -> List[tuple]:
+        if not self.file_times:
+            return []
+        return sorted(self.file_times.items(), key=lambda kv: kv[1], reverse=True)[:self.top_files]
+
+    def print_table(self):
+        print()
+        print(f"{'stage':<20} {'wall ms':>10} {'cpu ms':>10} {'files/s':>12} {'MB/s':>10}")
+        print("-" * 66)
+        for s in self.stages:
+            files_rate = f"{s['files'] / s['wall_s']:,.0f}" if s["files"] and s["wall_s"] else "-"
+            bytes_rate = f"{s['bytes'] / s['wall_s'] / 2**20:,.1f}" if s["bytes"] and s["wall_s"] else "-"
+            print(f"{s['stage']:<20} {s['wall_s'] * 1000:>10.1f} {s['cpu_s'] * 1000:>10.1f} "
+                  f"{files_rate:>12} {bytes_rate:>10}")
+        total = sum(s["wall_s"] for s in self.stages)
+        print("-" * 66)
+        print(f"{'total':<20} {total * 1000:>10.1f}")
+        print(f"Peak traced memory (this process): {self.peak_memory / 2**20:.1f} MiB")
+
+        slowest = self.slowest_files()
+        if slowest:
+            print("\nSlowest files to read and parse:")
+            for path, seconds in slowest:
+                print(f"  {seconds * 1000:8.2f} ms  {path}")
+
+    def to_dict(self) -> Dict:
+        return {
+            "stages": self.stages,
+            "peak_memory_bytes": self.peak_memory,
+            "slowest_files": [{"file": p, "parse_s": t} for p, t in self.slowest_files()],
+        }
+
+    def write_json(self, path: str | Path):
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        except OSError as e:
+            print(f"❌ Error writing profile trace to '{path}': {e}")
+            return
+        print(f"✔ Profile trace written to {path}")
@@ -1,12 +1,17 @@
 """Module resolution utilities for resolving import statements."""
 
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Set
 
+from dpv.models import ImportRecord
 from dpv.scanner import iter_py_files
 
 
-def build_module_map(root: Path) -> Dict[str, Path]:
+def build_module_map(
+    root: Path,
+    py_files: Optional[Iterable[Path]] = None,
+    source_roots: Optional[Sequence[Path]] = None,
+) -> Dict[str, Path]:
     """Build a mapping of module names to file paths.
     
     Scans recursively for .py files and computes dotted module names
@@ -14,6 +19,10 @@ def build_module_map(root: Path) -> Dict[str, Path]:
     
     Args:
         root: Root directory to scan
+        py_files: Files already found under root (e.g. by iter_py_files);
+            when given, the directory tree is not walked again
+        source_roots: Folders under root that are import roots of their
+            own (e.g. src/ in a src-layout); see module_name_for()
         
     Returns:
         Dictionary mapping module_name -> file_path
@@ -21,72 +30,120 @@ def build_module_map(root: Path) -> Dict[str, Path]:
     root_path = Path(root).resolve()
     module_map = {}
     
-    for py_file in iter_py_files(root_path):
-        try:
-            rel_path = py_file.relative_to(root_path)
-        except ValueError:
-            continue
-        
-        # Convert path to module name
-        parts = list(rel_path.parts)
-        
-        # Remove .py extension from filename
-        if parts[-1].endswith('.py'):
-            parts[-1] = parts[-1][:-3]
-        
-        # If __init__.py, module name is the directory
-        if parts[-1] == '__init__':
-            parts.pop()
-        
-        # Build dotted module name
-        if parts:
-            module_name = '.'.join(parts)
+    if py_files is None:
+        py_files = iter_py_files(root_path)
+    
+    for py_file in py_files:
+        module_name = module_name_for(py_file, root_path, source_roots)
+        if module_name:
             module_map[module_name] = py_file
     
     return module_map
 
 
-def resolve_import(module_name: str, from_path: Path, module_map: Dict[str, Path]) -> Optional[str]:
-    """Resolve an import statement to an absolute module name.
+def module_name_for(py_file: Path, root_path: Path, source_roots: Optional[Sequence[Path]] = None) -> Optional[str]:
+    """Return the dotted module name of a file under root_path, or None.
     
-    Handles both absolute and relative imports:
-    - Absolute imports: lookup module_name directly in module_map
-    - Relative imports: resolve based on leading dots and from_path's package
+    With source_roots, a file inside one of them is named relative to the
+    deepest one that contains it (src/pkg/mod.py -> pkg.mod).
+    """
+    if source_roots:
+        for source_root in sorted(source_roots, key=lambda r: len(r.parts), reverse=True):
+            if source_root in py_file.parents:
+                root_path = source_root
+                break
+    try:
+        rel_path = py_file.relative_to(root_path)
+    except ValueError:
+        return None
     
-    Args:
-        module_name: The import name (may have leading dots for relative imports)
-        from_path: Path to the file containing the import
-        module_map: Mapping of module names to file paths
-        
-    Returns:
-        Resolved dotted module name or None if not found
+    # Convert path to module name
+    parts = list(rel_path.parts)
+    
+    # Remove .py extension from filename
+    if parts[-1].endswith('.py'):
+        parts[-1] = parts[-1][:-3]
+    
+    # If __init__.py, module name is the directory
+    if parts[-1] == '__init__':
+        parts.pop()
+    
+    # Build dotted module name
+    return '.'.join(parts) if parts else None
+
+
+class ModuleTrie:
+    """Dotted module names indexed by prefix, for longest-prefix lookups.
+    
+    A trie over name parts, flattened: every node is stored under its
+    dotted path with the number of modules at or below it, so stepping to
+    a node is one hash of a prefix (done in C) rather than a Python loop
+    over nested dicts. A node that is not a module itself is a namespace
+    package (a folder without __init__.py, possibly spread over several
+    source roots).
     """
-    # Handle absolute imports
-    if not module_name.startswith('.'):
-        return module_name if module_name in module_map else None
     
-    # Handle relative imports
-    # Count leading dots
-    dots = 0
-    for char in module_name:
-        if char == '.':
-            dots += 1
-        else:
-            break
-    
-    # Find which module from_path belongs to
-    from_path = Path(from_path).resolve()
-    current_module = None
-    for mod_name, mod_path in module_map.items():
-        if Path(mod_path).resolve() == from_path:
-            current_module = mod_name
-            break
+    def __init__(self, names: Iterable[str] = ()):
+        self.modules: Set[str] = set()
+        self.nodes: Dict[str, int] = {}
+        for name in names:
+            self.add(name)
     
-    if current_module is None:
-        return None
+    def _prefixes(self, name: str) -> List[str]:
+        return [name[:i] for i, c in enumerate(name) if c == '.'] + [name]
+    
+    def add(self, name: str):
+        if name in self.modules:
+            return
+        self.modules.add(name)
+        nodes = self.nodes
+        for prefix in self._prefixes(name):
+            nodes[prefix] = nodes.get(prefix, 0) + 1
+    
+    def remove(self, name: str):
+        """Forget name, dropping nodes left without modules at or below them."""
+        if name not in self.modules:
+            return
+        self.modules.discard(name)
+        nodes = self.nodes
+        for prefix in self._prefixes(name):
+            nodes[prefix] -= 1
+            if not nodes[prefix]:
+                del nodes[prefix]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.modules
+    
+    def longest_prefix(self, name: str) -> Optional[str]:
+        """The longest module that is name or a dotted prefix of it, in O(depth) probes."""
+        return _longest_prefix(name, self.modules)
+    
+    def is_namespace(self, name: str) -> bool:
+        """True if name is a package folder with submodules but no module of its own."""
+        return name in self.nodes and name not in self.modules
+    
+    def submodules(self, package: str, names: Iterable[str]) -> List[str]:
+        """The package.name modules that exist, for names imported from package."""
+        modules = self.modules
+        return [m for m in (f"{package}.{name}" for name in names) if m in modules]
+
+
+def _longest_prefix(name: str, modules) -> Optional[str]:
+    """The longest of modules (any container of names) that is name or a dotted prefix of it."""
+    while name not in modules:
+        name, dot, _ = name.rpartition('.')
+        if not dot:
+            return None
+    return name
+
+
+def _relative_target(module_name: str, current_module: str) -> Optional[str]:
+    """The absolute name a relative import in current_module points at, or None."""
+    # Count leading dots
+    dots = len(module_name) - len(module_name.lstrip('.'))
     
     # Get the base module name (without leading dots)
-    base_name = module_name[dots:].lstrip('.')
+    base_name = module_name[dots:]
     
     # Split current module into parts and go up 'dots' levels
     parts = current_module.split('.')
@@ -94,13 +151,170 @@ def resolve_import(module_name: str, from_path: Path, module_map: Dict[str, Path
         return None
     
     # Go up the package hierarchy: remove last 'dots' parts
-    parent_parts = parts[:-dots] if dots > 0 else parts
+    parent_parts = parts[:-dots]
     
     # Build the resolved module name
     if base_name:
-        resolved = '.'.join(parent_parts + [base_name]) if parent_parts else base_name
-    else:
-        resolved = '.'.join(parent_parts) if parent_parts else None
+        return '.'.join(parent_parts + [base_name]) if parent_parts else base_name
+    return '.'.join(parent_parts) if parent_parts else None
+
+
+_UNSEEN = object()
+
+
+class ModuleResolver:
+    """Resolves imports against a module map in O(depth) time.
+    
+    An import resolves to the longest existing module that is its target
+    or a dotted prefix of it (`import pkg.sub.attr` -> pkg.sub when attr
+    is not a module), found in a ModuleTrie. Precomputes a reverse index
+    (file path -> dotted module) once, and memoizes results per scan:
+    absolute imports by name, relative ones per (package, import string),
+    so every file in a package shares the same lookups.
+    """
+    
+    def __init__(self, module_map: Dict[str, Path]):
+        self.module_map = module_map
+        self.trie = ModuleTrie(module_map)
+        self.path_index: Dict[str, str] = {}
+        for mod_name, mod_path in module_map.items():
+            # Index both the path as given and its resolved form; keep the
+            # first module seen for a path, as the old linear scan did.
+            self.path_index.setdefault(str(mod_path), mod_name)
+            self.path_index.setdefault(str(Path(mod_path).resolve()), mod_name)
+        self._file_memo: Dict[str, Optional[str]] = {}
+        self._absolute_memo: Dict[str, Optional[str]] = {}
+        self._relative_memo: Dict[tuple, Optional[str]] = {}
+    
+    def module_for_path(self, from_path: str | Path) -> Optional[str]:
+        """Return the dotted module name for a file path, or None."""
+        key = str(from_path)
+        if key in self._file_memo:
+            return self._file_memo[key]
+        module = self.path_index.get(key)
+        if module is None:
+            module = self.path_index.get(str(Path(from_path).resolve()))
+        self._file_memo[key] = module
+        return module
+    
+    def resolve(self, module_name: str, from_path: str | Path) -> Optional[str]:
+        """Resolve an import; same semantics as resolve_import()."""
+        # Handle absolute imports
+        if not module_name.startswith('.'):
+            resolved = self._absolute_memo.get(module_name, _UNSEEN)
+            if resolved is _UNSEEN:
+                resolved = self._absolute_memo[module_name] = self.trie.longest_prefix(module_name)
+            return resolved
+        
+        current_module = self.module_for_path(from_path)
+        if current_module is None:
+            return None
+        
+        package = current_module.rpartition('.')[0]
+        key = (package, module_name)
+        try:
+            return self._relative_memo[key]
+        except KeyError:
+            pass
+        
+        resolved = _relative_target(module_name, current_module)
+        if resolved is not None:
+            resolved = self.trie.longest_prefix(resolved)
+        self._relative_memo[key] = resolved
+        return resolved
+    
+    def namespace_members(self, record: ImportRecord, from_path: Optional[str | Path] = None) -> Optional[List[str]]:
+        """For `from <namespace package> import a, b`: the submodules a and b
+        that exist. None if record is not an import from a namespace package.
+        """
+        if record.typ != "from" or not record.names:
+            return None
+        target = self.target_name(record.module, record.file if from_path is None else from_path)
+        if target is None or not self.trie.is_namespace(target):
+            return None
+        return self.trie.submodules(target, record.names)
     
-    return resolved if resolved and resolved in module_map else None
+    def resolve_record(self, record: ImportRecord, from_path: Optional[str | Path] = None) -> List[str]:
+        """Modules an import record depends on: its resolved module, or the
+        imported submodules of a namespace package (`from ns import mod`).
+        """
+        members = self.namespace_members(record, from_path)
+        if members is not None:
+            return members
+        resolved = self.resolve(record.module, record.file if from_path is None else from_path)
+        return [resolved] if resolved else []
+    
+    def target_name(self, module_name: str, from_path: str | Path) -> Optional[str]:
+        """Return the module an import would resolve to if it existed."""
+        if not module_name.startswith('.'):
+            return module_name
+        current_module = self.module_for_path(from_path)
+        if current_module is None:
+            return None
+        return _relative_target(module_name, current_module)
+    
+    def add_module(self, name: str, path: Path):
+        """Register a new module (e.g. a file created while watching)."""
+        self.module_map[name] = path
+        self.trie.add(name)
+        self.path_index.setdefault(str(path), name)
+        self.path_index.setdefault(str(Path(path).resolve()), name)
+        self._file_memo.clear()
+        self._absolute_memo.clear()
+        self._relative_memo.clear()
+    
+    def remove_module(self, name: str):
+        """Forget a module whose file was deleted."""
+        path = self.module_map.pop(name, None)
+        if path is not None:
+            self.trie.remove(name)
+            for key in (str(path), str(Path(path).resolve())):
+                if self.path_index.get(key) == name:
+                    del self.path_index[key]
+        self._file_memo.clear()
+        self._absolute_memo.clear()
+        self._relative_memo.clear()
 
+
+def resolve_import(module_name: str, from_path: Path, module_map: Dict[str, Path]) -> Optional[str]:
+    """Resolve an import statement to an absolute module name.
+    
+    Handles both absolute and relative imports:
+    - Absolute imports: the longest module in module_map that is
+      module_name or a dotted prefix of it
+    - Relative imports: the same, for the name built from the leading
+      dots and from_path's package
+    
+    This probes module_map directly (a relative import also scans it for
+    from_path's module). For resolving many imports against the same
+    module_map, build a ModuleResolver once instead.
+    
+    Args:
+        module_name: The import name (may have leading dots for relative imports)
+        from_path: Path to the file containing the import
+        module_map: Mapping of module names to file paths
+        
+    Returns:
+        Resolved dotted module name or None if not found
+    """
+    if module_name.startswith('.'):
+        current_module = _module_for_path(from_path, module_map)
+        if current_module is None:
+            return None
+        module_name = _relative_target(module_name, current_module)
+        if module_name is None:
+            return None
+    return _longest_prefix(module_name, module_map)
+
+
+def _module_for_path(from_path: Path, module_map: Dict[str, Path]) -> Optional[str]:
+    """The first module in module_map whose file is from_path, or None."""
+    key = str(from_path)
+    for mod_name, mod_path in module_map.items():
+        if str(mod_path) == key:
+            return mod_name
+    from_path = Path(from_path).resolve()
+    for mod_name, mod_path in module_map.items():
+        if Path(mod_path).resolve() == from_path:
+            return mod_name
+    return None
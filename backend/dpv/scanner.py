@@ -1,14 +1,21 @@
 """File scanning utilities for finding and reading Python files."""
 
-from pathlib import Path
+import os
+from pathlib import Path, PurePath
 from typing import Iterator
 
 
+SKIP_DIRS = {'venv', '.venv', '.git', '__pycache__', 'node_modules'}
+
+
 def iter_py_files(root: str | Path) -> Iterator[Path]:
     """Recursively yield .py files under root directory.
     
-    Skips paths containing segments: 'venv', '.venv', '.git', '__pycache__'
-    and hidden top-level directories starting with '.'.
+    Uses a single os.scandir walk that prunes excluded directories before
+    descending into them: 'venv', '.venv', '.git', '__pycache__',
+    'node_modules' at any depth, and hidden top-level entries starting
+    with '.'. Symlinked directories are not followed. Entries are visited
+    in sorted order so results are deterministic.
     
     Args:
         root: Root directory path (str or Path)
@@ -17,26 +24,56 @@ def iter_py_files(root: str | Path) -> Iterator[Path]:
         Path objects for each .py file found
     """
     root_path = Path(root)
-    skip_segments = {'venv', '.venv', '.git', '__pycache__'}
-    
-    for py_file in root_path.rglob("*.py"):
-        # Check if any path segment should be skipped
-        parts = py_file.parts
-        if any(part in skip_segments for part in parts):
+    stack = [(str(root_path), True)]
+
+    while stack:
+        dir_path, top_level = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
             continue
-        
-        # Check if top-level directory is hidden (starts with '.')
-        if len(parts) > 0:
-            # Get the relative path from root to check top-level dir
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if name in SKIP_DIRS or (top_level and name.startswith('.')):
+                continue
             try:
-                rel_path = py_file.relative_to(root_path)
-                if rel_path.parts and rel_path.parts[0].startswith('.'):
-                    continue
-            except ValueError:
-                # If path is not relative to root, skip
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif name.endswith('.py') and entry.is_file():
+                    yield Path(entry.path)
+            except OSError:
                 continue
-        
-        yield py_file
+
+        # Reverse so the stack pops subdirectories in sorted order
+        stack.extend((d, False) for d in reversed(subdirs))
+
+
+def is_pruned_dir(rel: str | PurePath) -> bool:
+    """True if iter_py_files() never descends into the directory at rel.
+    
+    Args:
+        rel: Directory path relative to the scan root
+    """
+    parts = PurePath(rel).parts
+    return bool(parts) and (parts[0].startswith('.') or any(part in SKIP_DIRS for part in parts))
+
+
+def is_scanned(rel: str | PurePath) -> bool:
+    """True if iter_py_files() would yield the file at rel.
+    
+    Same selection rules as the walk, for a path that was not found by
+    walking (a git tree entry, a file created while watching).
+    
+    Args:
+        rel: File path relative to the scan root
+    """
+    parts = PurePath(rel).parts
+    if not parts or not parts[-1].endswith('.py') or parts[0].startswith('.'):
+        return False
+    return not any(part in SKIP_DIRS for part in parts[:-1])
 
 
 def read_file(path: Path) -> str:
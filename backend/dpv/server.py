@@ -0,0 +1,327 @@
+"""
+Local HTTP query API for `dpv serve`.
+
+A scan (or a saved JSON, NDJSON or binary report) is loaded once into a GraphIndex:
+a CSRGraph plus per-node cycle and component lookups and a lowercased name
+list for search. The stdlib threading HTTP server answers small JSON
+queries from it, so the frontend fetches only what it displays.
+
+Endpoints (all GET, names are passed as ?name=...):
+
+    /api/summary                      counts for the whole scan
+    /api/nodes                        all module names
+    /api/node?name=N                  degrees, lines, dead flag, cycle counts
+    /api/dependencies?name=N          modules N imports
+    /api/dependents?name=N            modules importing N
+    /api/cycles[?name=N]              cycles (containing N)
+    /api/search?q=TEXT                names containing TEXT, case-insensitive
+    /api/package[?name=P]             package P's children and their edges
+                                      (top level without a name)
+
+List endpoints take offset and limit (default 100, at most 1000) and return
+{"items", "total", "offset", "limit", "next_offset"}. Responses carry a
+strong ETag; a matching If-None-Match gets 304 Not Modified. No CORS
+header is sent unless an allowed origin is given (--cors-origin).
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dpv.analyzer import aggregate_packages
+from dpv.graph import CSRGraph, DependencyGraph
+from dpv.resolver import module_name_for
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class QueryError(Exception):
+    """A request that cannot be answered; carries the HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def recover_module_names(graph: CSRGraph) -> Dict[str, str]:
+    """
+    File path node -> dotted module name, for a report without them.
+
+    Reports name files by path and import targets by module name. A file
+    whose path ends in a target's path form (core/logger.py for core.logger)
+    gives away its scan root, and every file under such a root is named
+    relative to it; nested candidates are dropped in favour of the
+    outermost. Returns {} when no file matches any target.
+    """
+    files = [n for n in graph.names if os.path.isabs(n)]
+    targets = {n for n in graph.names if not os.path.isabs(n)}
+    roots = set()
+    for node in files:
+        path = Path(node)
+        for root in path.parents:
+            if module_name_for(path, root) in targets:
+                roots.add(root)
+    roots = {r for r in roots if not any(p in roots for p in r.parents)}
+
+    names = {}
+    for node in files:
+        path = Path(node)
+        root = next((p for p in path.parents if p in roots), None)
+        name = module_name_for(path, root) if root is not None else None
+        if name:
+            names[node] = name
+    return names
+
+
+class GraphIndex:
+    """Read-only, indexed view of one scan for answering API queries."""
+
+    def __init__(
+        self,
+        graph: CSRGraph,
+        cycles: List[List[str]],
+        cyclic_components: List[List[str]],
+        dead_modules: List[str],
+        metrics: Optional[Dict[str, Dict]] = None,
+        files_scanned: int = 0,
+        imports_found: int = 0,
+        packages: Optional[Dict[str, Dict]] = None,
+    ):
+        self.graph = graph
+        self.cycles = cycles
+        self.cyclic_components = cyclic_components
+        self.dead = set(dead_modules)
+        self.metrics = metrics or {}
+        self.files_scanned = files_scanned
+        self.imports_found = imports_found
+        # Reports written before the packages section existed get one from
+        # the graph, if their files' module names can be recovered
+        if packages is None:
+            names = recover_module_names(graph)
+            packages = aggregate_packages(graph, names) if names else {}
+        self.packages = packages
+
+        ids = graph.ids
+        self.cycles_of: Dict[int, List[int]] = {}
+        for ci, cycle in enumerate(cycles):
+            for member in dict.fromkeys(cycle):
+                self.cycles_of.setdefault(ids[member], []).append(ci)
+        self.component_of: Dict[int, int] = {}
+        for ci, component in enumerate(cyclic_components):
+            for member in component:
+                self.component_of[ids[member]] = ci
+        self._lower = [name.lower() for name in graph.names]
+
+    @classmethod
+    def from_report(cls, data: Dict[str, Any]) -> "GraphIndex":
+        """Build from a loaded JSON report dict."""
+        g = DependencyGraph()
+        for node, deps in data.get("graph", {}).items():
+            g.add_node(node)
+            for dep in deps:
+                g.add_edge(node, dep)
+        return cls(
+            g.freeze(),
+            data.get("cycles", []),
+            data.get("cyclic_components", []),
+            data.get("dead_modules", []),
+            data.get("metrics", {}),
+            data.get("files_scanned", 0),
+            data.get("imports_found", 0),
+            data.get("packages"),
+        )
+
+    @classmethod
+    def from_binary(cls, report) -> "GraphIndex":
+        """Build from a dpv.binreport.BinaryReport without going through JSON."""
+        summary = report.summary()
+        return cls(
+            report.graph(),
+            report.cycles(),
+            report.cyclic_components(),
+            report.dead_modules(),
+            report.metrics(),
+            summary.get("files_scanned", 0),
+            summary.get("imports_found", 0),
+            report.packages() if report.has_section("packages") else None,
+        )
+
+    # --- queries ---
+
+    def _id(self, name: Optional[str]) -> int:
+        if not name:
+            raise QueryError(400, "missing required parameter: name")
+        i = self.graph.ids.get(name)
+        if i is None:
+            raise QueryError(404, f"unknown module: {name}")
+        return i
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "modules": len(self.graph),
+            "edges": self.graph.edge_count(),
+            "cycles": len(self.cycles),
+            "cyclic_components": len(self.cyclic_components),
+            "dead_modules": len(self.dead),
+            "files_scanned": self.files_scanned,
+            "imports_found": self.imports_found,
+        }
+
+    def node(self, name: Optional[str]) -> Dict[str, Any]:
+        i = self._id(name)
+        g = self.graph
+        out = {
+            "name": name,
+            "in_degree": g.in_degree(name),
+            "out_degree": g.out_degree(name),
+            "dead": name in self.dead,
+            "cycles": len(self.cycles_of.get(i, ())),
+            "component": self.component_of.get(i),
+        }
+        if "lines" in self.metrics.get(name, {}):
+            out["lines"] = self.metrics[name]["lines"]
+        return out
+
+    def dependencies(self, name: Optional[str]) -> List[str]:
+        return self.graph.neighbors(self.graph.names[self._id(name)])
+
+    def dependents(self, name: Optional[str]) -> List[str]:
+        return self.graph.predecessors(self.graph.names[self._id(name)])
+
+    def cycles_for(self, name: Optional[str]) -> Sequence[List[str]]:
+        if name is None:
+            return self.cycles
+        return [self.cycles[ci] for ci in self.cycles_of.get(self._id(name), ())]
+
+    def package(self, name: Optional[str]) -> Dict[str, Any]:
+        if not self.packages:
+            raise QueryError(404, "no package data: the report has no packages section and its module names "
+                                  "cannot be recovered")
+        entry = self.packages.get(name or "")
+        if entry is None:
+            raise QueryError(404, f"unknown or unexpandable package: {name}")
+        return {"name": name or "", **entry}
+
+    def search(self, query: Optional[str]) -> List[str]:
+        if not query:
+            raise QueryError(400, "missing required parameter: q")
+        q = query.lower()
+        names = self.graph.names
+        return [names[i] for i, lower in enumerate(self._lower) if q in lower]
+
+
+def _int_param(params: Dict[str, List[str]], key: str, default: int) -> int:
+    raw = params.get(key, [None])[0]
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise QueryError(400, f"{key} must be an integer")
+    if value < 0:
+        raise QueryError(400, f"{key} must not be negative")
+    return value
+
+
+def paginate(items: Sequence, params: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Slice items by the offset/limit query parameters."""
+    offset = _int_param(params, "offset", 0)
+    limit = min(_int_param(params, "limit", DEFAULT_LIMIT), MAX_LIMIT)
+    end = offset + limit
+    return {
+        "items": list(items[offset:end]),
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": end if end < len(items) else None,
+    }
+
+
+class QueryAPI:
+    """Routes request targets to GraphIndex queries and caches encoded responses."""
+
+    def __init__(self, index: GraphIndex, cache_size: int = 4096):
+        self.index = index
+        self.respond = lru_cache(maxsize=cache_size)(self._respond)
+
+    def _route(self, path: str, params: Dict[str, List[str]]) -> Any:
+        index = self.index
+
+        def param(key: str) -> Optional[str]:
+            return params.get(key, [None])[0]
+
+        if path == "/api/summary":
+            return index.summary()
+        if path == "/api/nodes":
+            return paginate(index.graph.names, params)
+        if path == "/api/node":
+            return index.node(param("name"))
+        if path == "/api/dependencies":
+            return paginate(index.dependencies(param("name")), params)
+        if path == "/api/dependents":
+            return paginate(index.dependents(param("name")), params)
+        if path == "/api/cycles":
+            return paginate(index.cycles_for(param("name")), params)
+        if path == "/api/package":
+            return index.package(param("name"))
+        if path == "/api/search":
+            return paginate(index.search(param("q")), params)
+        raise QueryError(404, f"no such endpoint: {path}")
+
+    def _respond(self, target: str) -> Tuple[int, bytes, str]:
+        """Answer one request target; returns (status, body, etag)."""
+        url = urlsplit(target)
+        try:
+            status, payload = 200, self._route(url.path.rstrip("/") or "/", parse_qs(url.query))
+        except QueryError as e:
+            status, payload = e.status, {"error": str(e)}
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return status, body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "dpv"
+    api: QueryAPI  # set by make_server()
+    cors_origin: Optional[str] = None
+
+    def do_GET(self):
+        status, body, etag = self.api.respond(self.path)
+        if status == 200 and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if self.cors_origin:
+            self.send_header("Access-Control-Allow-Origin", self.cors_origin)
+            self.send_header("Access-Control-Expose-Headers", "ETag")
+            self.send_header("Vary", "Origin")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(index: GraphIndex, host: str = "127.0.0.1", port: int = 8765,
+                cors_origin: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    Create (but do not start) an HTTP server answering queries on index.
+
+    No CORS header is sent unless cors_origin is given, so other web pages
+    open in the browser cannot read the graph from the local API.
+    """
+    handler = type("DPVHandler", (_Handler,), {"api": QueryAPI(index), "cors_origin": cors_origin})
+    return ThreadingHTTPServer((host, port), handler)
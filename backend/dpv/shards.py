@@ -0,0 +1,220 @@
+"""
+Sharded scanning of several source roots (e.g. a monorepo) for `dpv scan`.
+
+Each root is scanned as an independent shard, in its own worker process
+when there are several: walk, module map, ingest and resolution against
+the shard's own modules. A shard hands back only its partial graph, the
+imports it could not resolve locally, its module map and line counts;
+import records never leave the worker, so peak memory per shard is
+bounded by the size of that root.
+
+merge_shards() combines the module maps (the first root to define a
+module name wins, as on sys.path) and resolves every shard's leftover
+imports against the combined map. Edges point at dotted names, and any
+name a shard defines is also in the combined map, so an import of an
+existing module resolves the same way after the merge; everything else
+(prefix matches, namespace packages split across roots) is left to it.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dpv.cache import CACHE_DIR_NAME, ingest_files_cached
+from dpv.graph import DependencyGraph
+from dpv.ingest import ingest_files, line_counts
+from dpv.prefetch import DEFAULT_BYTE_BUDGET
+from dpv.resolver import ModuleResolver, ModuleTrie, build_module_map
+from dpv.scanner import iter_py_files
+from dpv.symbols import SymbolIndex
+
+
+@dataclass
+class ShardResult:
+    """Partial scan of one root."""
+    root: str
+    module_map: Dict[str, str]       # dotted name -> file path
+    edges: Dict[str, List[str]]      # file path -> imports resolved within the root
+    # file path -> (module name, names of a `from` import) left for the merge
+    unresolved: Dict[str, List[Tuple[str, Tuple[str, ...]]]]
+    lines: Dict[str, int]            # dotted name -> line count
+    files_scanned: int
+    imports_found: int
+    size: int
+    # (file path, target module name, names, lineno) of `from` imports, if requested
+    symbol_rows: List[Tuple[str, str, Tuple[str, ...], int]] = field(default_factory=list)
+
+
+def read_manifest(path: str | Path) -> List[Path]:
+    """
+    Roots listed in a manifest file, one per line.
+
+    Blank lines and lines starting with '#' are ignored; relative paths
+    are taken relative to the manifest's folder.
+    """
+    path = Path(path)
+    roots = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            roots.append((path.parent / line).resolve())
+    return roots
+
+
+def check_roots(roots: Sequence[Path]):
+    """Raise ValueError if a root is missing, listed twice or inside another root."""
+    for root in roots:
+        if not root.is_dir():
+            raise ValueError(f"not a folder: {root}")
+    ordered = sorted(roots)
+    for a, b in zip(ordered, ordered[1:]):
+        if a == b or a in b.parents:
+            raise ValueError(f"overlapping roots: {a} and {b}")
+
+
+def shard_cache_dirs(roots: Sequence[Path], cache_dir: Optional[str | Path], use_cache: bool) -> List[Optional[Path]]:
+    """One parse cache per root: <root>/.dpv-cache, or a subfolder of cache_dir keyed by root."""
+    if not use_cache:
+        return [None] * len(roots)
+    if cache_dir is None:
+        return [root / CACHE_DIR_NAME for root in roots]
+    return [Path(cache_dir) / hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:16] for root in roots]
+
+
+def scan_shard(
+    root: str | Path,
+    cache_dir: Optional[Path] = None,
+    jobs: Optional[int] = 1,
+    symbols: bool = False,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+) -> ShardResult:
+    """Walk, ingest and resolve one root against its own modules.
+
+    read_ahead and read_budget are passed on to ingest_files().
+    """
+    root = Path(root).resolve()
+    py_files = list(iter_py_files(root))
+    module_map = build_module_map(root, py_files)
+    if cache_dir is not None:
+        modules = ingest_files_cached(py_files, root, cache_dir, jobs=jobs,
+                                      read_ahead=read_ahead, read_budget=read_budget)
+    else:
+        modules = ingest_files(py_files, root, jobs=jobs, read_ahead=read_ahead, read_budget=read_budget)
+
+    resolver = ModuleResolver(module_map)
+    edges: Dict[str, List[str]] = {}
+    unresolved: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+    symbol_rows = []
+    imports_found = 0
+    for key, info in modules.items():
+        local, pending = {}, {}
+        for record in info.imports:
+            imports_found += 1
+            if not record.module:
+                continue
+            target = resolver.target_name(record.module, key)
+            if not target:
+                continue
+            names = record.names if record.typ == "from" else ()
+            if target in module_map:
+                local[target] = None
+            else:
+                # A prefix match or namespace package may be different once
+                # the other roots' modules are known
+                pending[target, names] = None
+            if symbols and names:
+                symbol_rows.append((key, target, names, record.lineno))
+        edges[key] = list(local)
+        if pending:
+            unresolved[key] = list(pending)
+
+    return ShardResult(
+        root=str(root),
+        module_map={name: str(path) for name, path in module_map.items()},
+        edges=edges,
+        unresolved=unresolved,
+        lines=line_counts(modules, module_map),
+        files_scanned=len(py_files),
+        imports_found=imports_found,
+        size=sum(m.size for m in modules.values()),
+        symbol_rows=symbol_rows,
+    )
+
+
+def scan_shards(
+    roots: Sequence[Path],
+    cache_dirs: Sequence[Optional[Path]],
+    jobs: Optional[int] = None,
+    symbols: bool = False,
+    read_ahead: int = 0,
+    read_budget: int = DEFAULT_BYTE_BUDGET,
+) -> List[ShardResult]:
+    """
+    Scan every root, one worker process per shard (jobs = max processes).
+
+    Each shard parses serially inside its worker; with a single root or
+    jobs=1, shards run in this process and parse with jobs workers.
+    read_ahead and read_budget apply to every shard's process.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    workers = min(jobs, len(roots))
+    if workers <= 1:
+        return [scan_shard(root, cache, jobs, symbols, read_ahead, read_budget)
+                for root, cache in zip(roots, cache_dirs)]
+    n = len(roots)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(scan_shard, roots, cache_dirs, [1] * n, [symbols] * n,
+                             [read_ahead] * n, [read_budget] * n))
+
+
+def merge_shards(
+    shards: Sequence[ShardResult],
+    symbols: Optional[SymbolIndex] = None,
+) -> Tuple[DependencyGraph, Dict[str, Path], Dict[str, int]]:
+    """
+    Combine shards into one graph, resolving cross-root imports.
+
+    If symbols is given, the shards' symbol rows whose module resolved
+    are added to it.
+
+    Returns:
+        (graph, combined module map, line counts by module name)
+    """
+    module_map: Dict[str, Path] = {}
+    lines: Dict[str, int] = {}
+    for shard in shards:
+        for name, path in shard.module_map.items():
+            if name not in module_map:
+                module_map[name] = Path(path)
+                if name in shard.lines:
+                    lines[name] = shard.lines[name]
+
+    trie = ModuleTrie(module_map)
+    graph = DependencyGraph()
+    for shard in shards:
+        for source, targets in shard.edges.items():
+            graph.add_node(source)
+            for target in targets:
+                graph.add_edge(source, target)
+        for source, pending in shard.unresolved.items():
+            for target, names in pending:
+                if names and trie.is_namespace(target):
+                    for member in trie.submodules(target, names):
+                        graph.add_edge(source, member)
+                else:
+                    resolved = trie.longest_prefix(target)
+                    if resolved:
+                        graph.add_edge(source, resolved)
+        if symbols is not None:
+            for source, target, names, lineno in shard.symbol_rows:
+                if not trie.is_namespace(target):
+                    resolved = trie.longest_prefix(target)
+                    if resolved:
+                        symbols.add(source, resolved, names, lineno)
+    return graph, module_map, lines
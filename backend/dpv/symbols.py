@@ -0,0 +1,157 @@
+"""
+Symbol-level import index: who imports `name` from `module`, and where.
+
+build_graph() fills a SymbolIndex in the same pass that adds the edges,
+from the names of every resolved `from module import name` record.
+Module, symbol and importer strings are interned once; uses are appended
+to a flat int array and, on the first query, grouped by (module, symbol)
+into a CSR layout, so a lookup is one dict probe plus a slice.
+
+Importers are graph nodes (file paths) and modules are resolved dotted
+names, as in the graph itself.
+"""
+
+from __future__ import annotations
+from array import array
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dpv.models import ImportRecord
+from dpv.resolver import ModuleResolver
+
+
+class SymbolIndex:
+    """(module, symbol) -> [(importing file, line number), ...]."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # module id << 32 | symbol id -> key number, in insertion order
+        self._keys: Dict[int, int] = {}
+        self._key_symbols = array("i")
+        self._by_module: Dict[int, List[int]] = {}
+        # (key, importer id, lineno) triples added since the last grouping
+        self._pending = array("i")
+        # CSR: uses of key k are pairs offsets[k]..offsets[k + 1] of (importer id, lineno)
+        self._offsets = array("i", [0])
+        self._uses = array("i")
+
+    def _intern(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def add(self, importer: str, module: str, names: Iterable[str], lineno: int):
+        """Record that importer imports names from module at lineno."""
+        m = self._intern(module)
+        f = self._intern(importer)
+        for name in names:
+            symbol = self._intern(name)
+            key = m << 32 | symbol
+            k = self._keys.get(key)
+            if k is None:
+                k = self._keys[key] = len(self._key_symbols)
+                self._key_symbols.append(symbol)
+                self._by_module.setdefault(m, []).append(k)
+            self._pending.extend((k, f, lineno))
+
+    def _group(self):
+        """Fold pending uses into the CSR arrays, each key's uses sorted by (file, line)."""
+        if not self._pending:
+            return
+        rows = self._pending
+        old_offsets, old_uses = self._offsets, self._uses
+        for k in range(len(old_offsets) - 1):
+            for j in range(old_offsets[k], old_offsets[k + 1]):
+                rows.extend((k, old_uses[2 * j], old_uses[2 * j + 1]))
+
+        n = len(self._key_symbols)
+        offsets = [0] * (n + 1)
+        for i in range(0, len(rows), 3):
+            offsets[rows[i] + 1] += 1
+        for k in range(n):
+            offsets[k + 1] += offsets[k]
+        uses = array("i", [0]) * (2 * offsets[n])
+        fill = offsets[:-1]
+        for i in range(0, len(rows), 3):
+            k = rows[i]
+            p = 2 * fill[k]
+            fill[k] += 1
+            uses[p] = rows[i + 1]
+            uses[p + 1] = rows[i + 2]
+
+        strings = self.strings
+        for k in range(n):
+            a, b = 2 * offsets[k], 2 * offsets[k + 1]
+            if b - a > 2:
+                pairs = sorted(zip(uses[a:b:2], uses[a + 1:b:2]), key=lambda p: (strings[p[0]], p[1]))
+                uses[a:b] = array("i", chain.from_iterable(pairs))
+
+        self._offsets = array("i", offsets)
+        self._uses = uses
+        self._pending = array("i")
+
+    def lookup(self, module: str, symbol: str) -> List[Tuple[str, int]]:
+        """Files importing symbol from module, with line numbers."""
+        m, sym = self._ids.get(module), self._ids.get(symbol)
+        k = None if m is None or sym is None else self._keys.get(m << 32 | sym)
+        if k is None:
+            return []
+        self._group()
+        uses, strings = self._uses, self.strings
+        return [(strings[uses[j]], uses[j + 1]) for j in range(2 * self._offsets[k], 2 * self._offsets[k + 1], 2)]
+
+    def find(self, dotted: str) -> List[Tuple[str, int]]:
+        """lookup() for a dotted name such as "services.auth.login"."""
+        module, _, symbol = dotted.rpartition(".")
+        return self.lookup(module, symbol)
+
+    def symbols(self, module: str) -> List[str]:
+        """Names imported from module, sorted."""
+        keys = self._by_module.get(self._ids.get(module, -1), ())
+        return sorted(self.strings[self._key_symbols[k]] for k in keys)
+
+    def modules(self) -> List[str]:
+        """Modules that have at least one name imported from them, sorted."""
+        return sorted(self.strings[m] for m in self._by_module)
+
+    def __len__(self) -> int:
+        return len(self._key_symbols)
+
+    def use_count(self) -> int:
+        return len(self._uses) // 2 + len(self._pending) // 3
+
+    def iter_entries(self) -> Iterator[Tuple[str, str, List[Tuple[str, int]]]]:
+        """(module, symbol, uses) for every key, sorted by module then symbol."""
+        for module in self.modules():
+            for symbol in self.symbols(module):
+                yield module, symbol, self.lookup(module, symbol)
+
+    def iter_report(self) -> Iterator[Tuple[str, Dict[str, List[List]]]]:
+        """(module, {symbol: [[file, line], ...]}) pairs for the report's "symbols" section."""
+        for module in self.modules():
+            yield module, {s: [list(use) for use in self.lookup(module, s)] for s in self.symbols(module)}
+
+    def to_dict(self) -> Dict[str, Dict[str, List[List]]]:
+        return dict(self.iter_report())
+
+
+def index_symbols(
+    import_records_by_file: Dict[str, Sequence[ImportRecord]],
+    resolver: ModuleResolver,
+    index: Optional[SymbolIndex] = None,
+) -> SymbolIndex:
+    """Build a SymbolIndex from records outside build_graph() (e.g. an IncrementalScan)."""
+    index = index if index is not None else SymbolIndex()
+    for source_key, records in import_records_by_file.items():
+        for record in records:
+            if record.typ == "from" and record.names and record.module:
+                # Names imported from a namespace package are submodules, not symbols
+                if resolver.namespace_members(record) is not None:
+                    continue
+                resolved = resolver.resolve(record.module, record.file)
+                if resolved:
+                    index.add(source_key, resolved, record.names, record.lineno)
+    return index
@@ -0,0 +1,336 @@
+"""
+Incremental rescans for `dpv watch`.
+
+IncrementalScan holds one full scan in memory (ModuleInfo per file, module
+map and a mutable DependencyGraph) and patches it for a set of changed, added or
+deleted files: only those files are re-parsed, and only their outgoing
+edges (plus imports whose resolution changes because a module appeared
+or disappeared) are touched.
+
+Changes are detected by polling mtimes, or through Linux inotify via
+ctypes when it is available.
+"""
+
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from dpv.graph import DependencyGraph, build_graph
+from dpv.ingest import ingest_file, ingest_files, line_counts
+from dpv.models import ImportRecord, ModuleInfo
+from dpv.resolver import ModuleResolver, build_module_map, module_name_for
+from dpv.scanner import SKIP_DIRS, is_pruned_dir, is_scanned, iter_py_files
+
+
+class IncrementalScan:
+    """An in-memory scan that can be patched file by file."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        jobs: Optional[int] = None,
+        modules: Optional[Dict[str, ModuleInfo]] = None,
+        source_roots: Sequence[Path] = (),
+    ):
+        """
+        Scan root, or start from already ingested modules (keyed by file
+        path, in walk order) without touching the filesystem.
+        """
+        self.root = Path(root).resolve()
+        self.source_roots = list(source_roots)
+        if modules is None:
+            py_files = list(iter_py_files(self.root))
+            modules = ingest_files(py_files, self.root, jobs=jobs, source_roots=self.source_roots)
+        else:
+            py_files = [Path(k) for k in modules]
+        self.module_map = build_module_map(self.root, py_files, self.source_roots)
+        self.modules: Dict[str, ModuleInfo] = modules
+        self.records: Dict[str, List[ImportRecord]] = {k: m.imports for k, m in self.modules.items()}
+        self.resolver = ModuleResolver(self.module_map)
+        self.graph: DependencyGraph = build_graph(self.records, self.module_map)
+        # Bumped whenever apply() adds or removes a node or edge, so callers
+        # can keep analysis results while edits leave the graph unchanged
+        self.edges_version = 0
+        # target module name -> files whose imports would resolve to it
+        self._importers: Dict[str, Set[str]] = {}
+        self._targets: Dict[str, Set[str]] = {}
+        for key in self.records:
+            self._index_targets(key)
+
+    @property
+    def files_scanned(self) -> int:
+        return len(self.records)
+
+    @property
+    def imports_found(self) -> int:
+        return sum(len(v) for v in self.records.values())
+
+    @property
+    def line_counts(self) -> Dict[str, int]:
+        return line_counts(self.modules, self.module_map)
+
+    def apply(self, changed: Iterable[Path] = (), deleted: Iterable[Path] = ()) -> Set[str]:
+        """
+        Patch the scan for changed/added and deleted files. Deleted paths
+        may also be directories.
+
+        Returns:
+            The set of source files whose edges were recomputed
+        """
+        changed_keys = {str(p) for p in changed}
+        deleted_keys = set()
+        for p in deleted:
+            key = str(p)
+            if key in self.records:
+                deleted_keys.add(key)
+            else:
+                # A deleted directory: drop every file that was under it
+                prefix = key + os.sep
+                deleted_keys.update(k for k in self.records if k.startswith(prefix))
+        deleted_keys -= changed_keys
+        affected: Set[str] = set()
+
+        # Module map changes can make other files' imports resolve differently
+        changed_names = set()
+        for key in deleted_keys:
+            name = module_name_for(Path(key), self.root, self.source_roots)
+            if name and self.module_map.get(name) == Path(key):
+                self.resolver.remove_module(name)
+                changed_names.add(name)
+        for key in changed_keys:
+            if key in self.records:
+                continue
+            name = module_name_for(Path(key), self.root, self.source_roots)
+            if name:
+                self.resolver.add_module(name, Path(key))
+                changed_names.add(name)
+        if changed_names:
+            affected |= self._importers_of(changed_names)
+
+        for key in deleted_keys:
+            self.modules.pop(key, None)
+            if self.records.pop(key, None) is not None:
+                self._unindex_targets(key)
+                self._drop_edges(key)
+                self.graph.remove_node(key)
+                self.edges_version += 1
+        for key in changed_keys:
+            info = ingest_file(Path(key), self.root, source_roots=self.source_roots)
+            self.modules[key] = info
+            self.records[key] = info.imports
+            self._unindex_targets(key)
+            self._index_targets(key)
+
+        affected = (affected | changed_keys) - deleted_keys
+        for key in affected:
+            if key in self.records:
+                self._rebuild_edges(key)
+        return affected
+
+    def _index_targets(self, key: str):
+        targets = set()
+        for rec in self.records[key]:
+            if rec.module:
+                target = self.resolver.target_name(rec.module, key)
+                if target:
+                    targets.add(target)
+                    self._importers.setdefault(target, set()).add(key)
+        self._targets[key] = targets
+
+    def _importers_of(self, names: Set[str]) -> Set[str]:
+        """
+        Files whose imports may resolve differently once names were added
+        or removed: imports of a name or anything below it (longest-prefix
+        matches), and of its packages (`from <namespace package> import`).
+        """
+        packages = {name[:i] for name in names for i, c in enumerate(name) if c == '.'}
+        found: Set[str] = set()
+        for target, importers in self._importers.items():
+            if target in packages or any(
+                target[:i] in names for i, c in enumerate(target + '.') if c == '.'
+            ):
+                found |= importers
+        return found
+
+    def _unindex_targets(self, key: str):
+        for target in self._targets.pop(key, ()):
+            importers = self._importers.get(target)
+            if importers:
+                importers.discard(key)
+                if not importers:
+                    del self._importers[target]
+
+    def _drop_edges(self, key: str):
+        """Remove key's outgoing edges and any target left without importers."""
+        for target in list(self.graph.adj.get(key, ())):
+            self.graph.remove_edge(key, target)
+            self._drop_if_orphan(target)
+
+    def _drop_if_orphan(self, node: str):
+        # Non-file nodes only exist as import targets, as in a full scan
+        if node not in self.records and self.graph.in_degree(node) == 0 and self.graph.out_degree(node) == 0:
+            self.graph.remove_node(node)
+            self.edges_version += 1
+
+    def _rebuild_edges(self, key: str):
+        old = set(self.graph.adj.get(key, ()))
+        new = set()
+        for rec in self.records[key]:
+            if rec.module:
+                new.update(self.resolver.resolve_record(rec))
+
+        if old != new or key not in self.graph.adj:
+            self.edges_version += 1
+        self.graph.add_node(key)
+        for target in old - new:
+            self.graph.remove_edge(key, target)
+            self._drop_if_orphan(target)
+        for target in new - old:
+            self.graph.add_edge(key, target)
+
+
+# ------------------------------------------------------------
+# CHANGE DETECTION
+# ------------------------------------------------------------
+
+class PollWatcher:
+    """Detects .py changes by comparing (mtime_ns, size) between polls."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.state = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        state = {}
+        for path in iter_py_files(self.root):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[str(path)] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def poll(self, timeout: float) -> Tuple[List[Path], List[Path]]:
+        time.sleep(timeout)
+        new_state = self._snapshot()
+        changed = [Path(k) for k, sig in new_state.items() if self.state.get(k) != sig]
+        deleted = [Path(k) for k in self.state if k not in new_state]
+        self.state = new_state
+        return changed, deleted
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify backend (via ctypes), watching every scanned directory."""
+
+    _EVENT = struct.Struct("iIII")
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.dirs: Dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, top: Path) -> List[Path]:
+        """Watch top and every directory below it that a scan would enter.
+
+        Returns:
+            The .py files a scan would find there
+        """
+        if is_pruned_dir(top.relative_to(self.root)):
+            return []
+        found = []
+        for dirpath, dirnames, filenames in os.walk(top):
+            # Same pruning rules as iter_py_files(), relative to the watched root
+            at_root = Path(dirpath) == self.root
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in SKIP_DIRS and not (at_root and d.startswith('.'))
+            ]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd >= 0:
+                self.dirs[wd] = Path(dirpath)
+            found.extend(Path(dirpath, f) for f in filenames
+                         if is_scanned(os.path.relpath(os.path.join(dirpath, f), self.root)))
+        return found
+
+    def poll(self, timeout: float) -> Tuple[List[Path], List[Path]]:
+        changed: Set[Path] = set()
+        deleted: Set[Path] = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        # Let an editor's burst of events (write, rename, chmod) settle
+        while ready:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, pos)
+                pos += self._EVENT.size
+                name = os.fsdecode(data[pos:pos + length].rstrip(b"\0"))
+                pos += length
+                parent = self.dirs.get(wd)
+                if parent is None:
+                    continue
+                if mask & self.IN_DELETE_SELF:
+                    self.dirs.pop(wd, None)
+                    continue
+                path = parent / name
+                if mask & self.IN_ISDIR:
+                    if name in SKIP_DIRS or (parent == self.root and name.startswith('.')):
+                        continue
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        changed.update(self._add_tree(path))
+                    elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                        # IncrementalScan.apply() expands deleted directories
+                        deleted.add(path)
+                    continue
+                if not name.endswith(".py") or (parent == self.root and name.startswith('.')):
+                    continue
+                if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    deleted.add(path)
+                    changed.discard(path)
+                else:
+                    changed.add(path)
+                    deleted.discard(path)
+            ready, _, _ = select.select([self.fd], [], [], 0.05)
+        changed = {p for p in changed if p.exists()}
+        return sorted(changed), sorted(deleted)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(root: Path, backend: str = "auto"):
+    """Return a watcher for backend "poll", "inotify" or "auto"."""
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            if backend == "inotify":
+                raise
+    return PollWatcher(root)